@@ -3,7 +3,6 @@ from litestar.di import Provide
 
 from src.app.config import app as config
 from src.app.config import constants, get_settings
-from src.app.domain.accounts import signals as account_signals
 from src.app.domain.accounts.dependencies import provide_user
 from src.app.domain.accounts.guards import auth
 from src.app.lib.dependencies import create_collection_dependencies
@@ -31,9 +30,6 @@ def create_app() -> Litestar:
         on_app_init=[
             auth.on_app_init,
         ],
-        listeners=[
-            account_signals.user_created_event_handler,
-        ],
     )
 
     return app
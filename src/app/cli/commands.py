@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import click
+from litestar.cli._utils import LitestarGroup
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from litestar import Litestar
 
 
 @click.group(
@@ -89,7 +95,7 @@ def create_user(
     from rich import get_console
 
     from src.app.config.app import alchemy
-    from src.app.domain.accounts.dependencies import provide_users_service
+    from src.app.domain.accounts.dependencies import users_service_for
     from src.app.domain.accounts.schemas import UserCreate
 
     console = get_console()
@@ -106,8 +112,10 @@ def create_user(
             password=password,
             is_superuser=superuser,
         )
-        async with alchemy.get_session() as db_session:
-            users_service = await anext(provide_users_service(db_session))
+        async with (
+            alchemy.get_session() as db_session,
+            users_service_for(db_session, "minimal") as users_service,
+        ):
             user = await users_service.create(data=obj_in.to_dict(), auto_commit=True)
             console.print(f"User created: {user.email}")
 
@@ -175,43 +183,526 @@ def promote_to_superuser(email: str) -> None:
     name="create-roles",
     help="Create pre-configured application roles and assign to users.",
 )
-def create_default_roles() -> None:
-    """Create the default Roles for the system
+@click.option(
+    "--dry-run",
+    help="Only count the users missing the default role",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--batch-size",
+    help="Number of users scanned per statement",
+    type=click.IntRange(min=1),
+    default=10000,
+    show_default=True,
+)
+def create_default_roles(dry_run: bool, batch_size: int) -> None:
+    """Create the default Roles for the system and assign the default role.
 
     Args:
-        email (str): The email address of the user to promote.
+        dry_run (bool): Only count the users missing the default role.
+        batch_size (int): Number of users scanned per statement.
     """
     import anyio
     from advanced_alchemy.utils.text import slugify
     from rich import get_console
+    from sqlalchemy import select
 
+    from src.app.config import constants
     from src.app.config.app import alchemy
-    from src.app.db.models import UserRole
-    from src.app.domain.accounts.dependencies import (
-        provide_roles_service,
-        provide_users_service,
-    )
+    from src.app.db.models import Role
+    from src.app.domain.accounts.dependencies import provide_user_roles_service
 
     console = get_console()
 
     async def _create_default_roles() -> None:
-        await load_database_fixtures()
+        if not dry_run:
+            await load_database_fixtures()
         async with alchemy.get_session() as db_session:
-            users_service = await anext(provide_users_service(db_session))
-            roles_service = await anext(provide_roles_service(db_session))
-            default_role = await roles_service.get_one_or_none(
-                slug=slugify(users_service.default_role)
+            user_roles_service = await anext(provide_user_roles_service(db_session))
+            role_id = await db_session.scalar(
+                select(Role.id).where(Role.slug == slugify(constants.DEFAULT_USER_ROLE))
+            )
+            if role_id is None:
+                console.print("The default role does not exist")
+                return
+            missing = await user_roles_service.count_missing_role(role_id)
+            console.print(f"{missing} active users miss the default role")
+            if dry_run or not missing:
+                return
+            assigned = await user_roles_service.assign_role_to_all(
+                role_id,
+                batch_size=batch_size,
+                on_progress=lambda count: console.print(
+                    f"Assigned the default role to {count} users"
+                ),
+            )
+            # the inserted rows: users may gain the role or sign up meanwhile
+            console.print(
+                f"Assigned the default role to {assigned} users, "
+                f"{missing} were missing it when counted"
             )
-            if default_role:
-                all_active_users = await users_service.list(is_active=True)
-                for user in all_active_users:
-                    if any(r.role_id == default_role.id for r in user.roles):
-                        console.print("User %s already has default role", user.email)
-                    else:
-                        user.roles.append(UserRole(role_id=default_role.id))
-                        console.print("Assigned %s default role", user.email)
-                        await users_service.repository.update(user)
-            await db_session.commit()
 
     console.rule("Creating default roles.")
     anyio.run(_create_default_roles)
+
+
+@user_management_app.command(
+    name="import", help="Import users from a CSV or NDJSON file"
+)
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "import_format",
+    help="File format, guessed from the file extension by default",
+    type=click.Choice(["csv", "ndjson"]),
+    required=False,
+    show_default=False,
+)
+@click.option(
+    "--batch-size",
+    help="Number of users hashed in parallel and inserted per transaction",
+    type=click.IntRange(min=1),
+    default=500,
+    show_default=True,
+)
+def import_users(path: str, import_format: str | None, batch_size: int) -> None:
+    """Import users in bulk."""
+    from pathlib import Path
+
+    import anyio
+    from rich import get_console
+
+    from src.app.domain.accounts.importer import import_users as _import_users
+    from src.app.lib import crypt
+
+    console = get_console()
+    file_path = Path(path)
+    import_format = import_format or (
+        "csv" if file_path.suffix.lower() == ".csv" else "ndjson"
+    )
+
+    async def _read_chunks() -> AsyncIterator[bytes]:
+        async with await anyio.open_file(file_path, "rb") as file:
+            while chunk := await file.read(64 * 1024):
+                yield chunk
+
+    async def _import() -> None:
+        try:
+            report = await _import_users(
+                _read_chunks(),
+                import_format,  # type: ignore[arg-type]
+                batch_size=batch_size,
+            )
+        finally:
+            crypt.bulk_hashing_pool.shutdown()
+        for error in report.errors:
+            console.print(f"line {error.line} ({error.email or '-'}): {error.error}")
+        console.print(
+            f"Imported {report.imported} of {report.total} users "
+            f"({report.failed} failed) in {report.duration}s, "
+            f"{report.rows_per_second} rows/s"
+        )
+
+    console.rule(f"Import users from {file_path}.")
+    anyio.run(_import)
+
+
+@user_management_app.command(
+    name="calibrate-hashing",
+    help="Benchmark argon2 on this host and select password hashing parameters.",
+)
+@click.option(
+    "--target-ms",
+    help="Target median hashing time in milliseconds",
+    type=click.FLOAT,
+    default=50,
+    show_default=True,
+)
+@click.option(
+    "--max-memory",
+    help="Upper argon2 memory cost in KiB",
+    type=click.INT,
+    default=65536,
+    show_default=True,
+)
+@click.option(
+    "--min-memory",
+    help="Lower argon2 memory cost in KiB",
+    type=click.INT,
+    default=8192,
+    show_default=True,
+)
+@click.option(
+    "--samples",
+    help="Number of hashes measured per candidate",
+    type=click.INT,
+    default=5,
+    show_default=True,
+)
+@click.option(
+    "--env-file",
+    help="Write the selected parameters to this dotenv file",
+    type=click.Path(dir_okay=False),
+    required=False,
+    show_default=False,
+)
+def calibrate_hashing(
+    target_ms: float,
+    max_memory: int,
+    min_memory: int,
+    samples: int,
+    env_file: str | None,
+) -> None:
+    """Calibrate argon2 cost parameters for a target login latency."""
+    from pathlib import Path
+
+    from rich import get_console
+
+    from src.app.config import get_settings
+    from src.app.lib.crypt import calibrate_argon2
+
+    console = get_console()
+    console.rule("Calibrate password hashing.")
+    params = calibrate_argon2(
+        target_ms=target_ms,
+        max_memory_cost=max_memory,
+        min_memory_cost=min_memory,
+        parallelism=get_settings().security.ARGON2_PARALLELISM,
+        samples=samples,
+    )
+    console.print(
+        f"time_cost={params.time_cost} memory_cost={params.memory_cost}KiB "
+        f"parallelism={params.parallelism} p50={params.p50_ms}ms"
+    )
+    values = params.to_env()
+    if env_file is None:
+        for key, value in values.items():
+            console.print(f"{key}={value}")
+        return
+
+    path = Path(env_file)
+    lines = path.read_text().splitlines() if path.is_file() else []
+    for index, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if key in values:
+            lines[index] = f"{key}={values.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in values.items())
+    path.write_text("\n".join(lines) + "\n")
+    console.print(f"Parameters written to {path}")
+
+
+@user_management_app.command(
+    name="benchmark-sqlite",
+    help="Compare the write throughput of the SQLite profiles on a scratch database.",
+)
+@click.option(
+    "--concurrency",
+    help="Number of concurrent writers",
+    type=click.INT,
+    default=32,
+    show_default=True,
+)
+@click.option(
+    "--transactions",
+    help="Number of transactions per profile",
+    type=click.INT,
+    default=2000,
+    show_default=True,
+)
+@click.option(
+    "--accounts",
+    help="Number of signups, each followed by a login, per profile",
+    type=click.INT,
+    default=200,
+    show_default=True,
+)
+def benchmark_sqlite(concurrency: int, transactions: int, accounts: int) -> None:
+    """Run concurrent signup shaped transactions with every SQLite profile.
+
+    The signup and login flow then runs through the user service, with the
+    session routing and the password hashing of the application.
+    """
+    import tempfile
+    from pathlib import Path
+    from uuid import uuid4
+
+    import anyio
+    from advanced_alchemy.base import UUIDAuditBase
+    from advanced_alchemy.exceptions import RepositoryError
+    from rich import get_console
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from src.app.config.db import DatabaseSettings
+    from src.app.domain.accounts.dependencies import users_service_for
+    from src.app.lib.exceptions import ServiceUnavailableError
+    from src.app.lib.read_replica import (
+        READ_UNTIL_WRITE,
+        REPLICA_ENGINE,
+        RoutingSession,
+    )
+    from src.app.lib.sqlite import benchmark_transactions, benchmark_writes
+
+    console = get_console()
+    console.rule("Benchmark SQLite writes.")
+    password = "Benchm4rk!"  # noqa: S105
+
+    async def _benchmark(directory: str) -> None:
+        for profile in ("default", "performance"):
+            settings = DatabaseSettings(
+                URL=f"sqlite+aiosqlite:///{Path(directory) / f'{profile}.sqlite3'}",
+                SQLITE_PROFILE=profile,
+                ECHO=False,
+                ECHO_POOL=False,
+            )
+            writer, reader = settings.get_engine(), settings.get_read_engine()
+            # the sessions of the application, see `src.app.config.app`
+            session_maker = (
+                async_sessionmaker(bind=writer, expire_on_commit=False)
+                if reader is None
+                else async_sessionmaker(
+                    bind=writer,
+                    expire_on_commit=False,
+                    sync_session_class=RoutingSession,
+                    info={
+                        REPLICA_ENGINE: reader.sync_engine,
+                        READ_UNTIL_WRITE: True,
+                    },
+                )
+            )
+
+            async def _signup_and_login(_: int) -> None:
+                email = f"{uuid4().hex}@example.com"
+                async with (
+                    session_maker() as db_session,
+                    users_service_for(db_session, "profile") as users_service,
+                ):
+                    await users_service.create({"email": email, "password": password})
+                    await db_session.commit()
+                async with (
+                    session_maker() as db_session,
+                    users_service_for(db_session, "auth") as users_service,
+                ):
+                    await users_service.authenticate(email, password)
+                    await db_session.commit()
+
+            try:
+                result = await benchmark_writes(
+                    writer, reader, concurrency=concurrency, transactions=transactions
+                )
+                async with writer.begin() as conn:
+                    await conn.run_sync(UUIDAuditBase.registry.metadata.create_all)
+                flows = await benchmark_transactions(
+                    _signup_and_login,
+                    concurrency=concurrency,
+                    transactions=accounts,
+                    # database errors are wrapped by the repositories, logins
+                    # may be rejected by the password hashing pool
+                    failures=(
+                        OperationalError,
+                        PoolTimeoutError,
+                        RepositoryError,
+                        ServiceUnavailableError,
+                    ),
+                )
+            finally:
+                await writer.dispose()
+                if reader is not None:
+                    await reader.dispose()
+            console.print(
+                f"{profile}: committed={result.transactions} failed={result.failed} "
+                f"seconds={result.seconds} tx/s={result.per_second}"
+            )
+            console.print(
+                f"{profile} signup+login: committed={flows.transactions} "
+                f"failed={flows.failed} seconds={flows.seconds} "
+                f"flows/s={flows.per_second}"
+            )
+
+    with tempfile.TemporaryDirectory() as directory:
+        anyio.run(_benchmark, directory)
+
+
+@click.group(
+    cls=LitestarGroup,
+    name="openapi",
+    invoke_without_command=False,
+    help="Manage the OpenAPI schema.",
+)
+def openapi_app() -> None:
+    """Manage the OpenAPI schema."""
+
+
+@openapi_app.command(
+    name="build",
+    help="Render the OpenAPI schema and its compressed variants ahead of serving.",
+)
+@click.option(
+    "--output",
+    help="Output directory, OPENAPI_BUILD_DIR by default",
+    type=click.Path(file_okay=False),
+    required=False,
+    show_default=False,
+)
+def build_openapi(app: Litestar, output: str | None) -> None:
+    """Render the OpenAPI schema served on `/schema`."""
+    from pathlib import Path
+
+    from rich import get_console
+
+    from src.app.config import get_settings
+    from src.app.lib.prebuilt_schema import build_schema
+
+    console = get_console()
+    directory = Path(output or get_settings().app.OPENAPI_BUILD_DIR)
+    manifest = build_schema(app, directory)
+    for name, entry in manifest["files"].items():
+        sizes = " ".join(
+            f"{encoding}={size}" for encoding, size in entry["encodings"].items()
+        )
+        console.print(f"{directory / name}: identity={entry['size']} {sizes}")
+    console.print(f"Route fingerprint {manifest['fingerprint']}")
+
+
+@user_management_app.command(
+    name="benchmark-compression",
+    help="Compare the size and compression time of ListUsers pages per encoding.",
+)
+@click.option(
+    "--page-size",
+    help="Users per page, repeatable",
+    type=click.INT,
+    multiple=True,
+    default=(10, 100, 500),
+    show_default=True,
+)
+@click.option(
+    "--rounds",
+    help="Compressions per encoding and level",
+    type=click.INT,
+    default=50,
+    show_default=True,
+)
+def benchmark_compression(page_size: tuple[int, ...], rounds: int) -> None:
+    """Compress synthetic ListUsers pages with every installed encoding."""
+    from datetime import UTC, datetime
+    from uuid import uuid4
+
+    from litestar.serialization import encode_json
+    from rich import get_console
+    from rich.table import Table
+
+    from src.app.domain.accounts.schemas import User, UserRole
+    from src.app.lib import compression
+    from src.app.lib.pagination import Pagination
+
+    console = get_console()
+    console.rule("Benchmark ListUsers compression.")
+    table = Table("users", "encoding", "level", "bytes", "compressed", "ratio", "µs")
+    role = UserRole(
+        role_id=uuid4(),
+        role_slug="application-access",
+        role_name="Application Access",
+        assigned_at=datetime.now(UTC),
+    )
+    for size in page_size:
+        users = [
+            User(
+                id=uuid4(),
+                email=f"user{index}@example.com",
+                name=f"User {index}",
+                is_active=True,
+                is_verified=index % 2 == 0,
+                roles=[role],
+            )
+            for index in range(size)
+        ]
+        body = encode_json(
+            Pagination(items=users, limit=size, offset=0, total=size * 10)
+        )
+        results = compression.benchmark_compression(
+            body,
+            {"gzip": [1, 6, 9], "br": [1, 4, 11], "zstd": [1, 3, 9]},
+            rounds=rounds,
+        )
+        for result in results:
+            table.add_row(
+                str(size),
+                result.encoding,
+                str(result.level),
+                str(result.size),
+                str(result.compressed_size),
+                str(result.ratio),
+                str(result.microseconds),
+            )
+    console.print(table)
+    if missing := {"br", "zstd"} - compression.AVAILABLE_ENCODINGS:
+        console.print(f"Not installed: {', '.join(sorted(missing))}")
+
+
+@click.group(
+    name="workers",
+    invoke_without_command=False,
+    help="Run the background job workers.",
+)
+def worker_app() -> None:
+    """Run the background job workers."""
+
+
+@worker_app.command(
+    name="run",
+    help="Run the jobs of a queue and relay the outbox events until interrupted.",
+)
+@click.option(
+    "--queue",
+    help="Queue to run",
+    type=click.STRING,
+    default="default",
+    show_default=True,
+)
+@click.option(
+    "--concurrency",
+    help="Jobs run at once, WORKER_CONCURRENCY by default",
+    type=click.INT,
+    required=False,
+    show_default=False,
+)
+@click.option(
+    "--relay/--no-relay",
+    help="Relay the outbox events to their listeners",
+    default=True,
+    show_default=True,
+)
+def run_worker(queue: str, concurrency: int | None, relay: bool) -> None:
+    """Run the jobs of `queue`, finishing the running ones on SIGINT or SIGTERM."""
+    import asyncio
+    import signal
+
+    from src.app.config import get_settings
+    from src.app.config.app import alchemy
+    from src.app.domain.accounts import jobs, signals  # noqa: F401
+    from src.app.lib import metrics
+    from src.app.lib.jobs import Worker
+    from src.app.lib.outbox import OutboxRelay
+
+    settings = get_settings()
+    session_maker = alchemy.create_session_maker()
+    worker = Worker.from_settings(settings.worker, session_maker, queue=queue)
+    if concurrency is not None:
+        worker.concurrency = concurrency
+    metrics.register_collector("jobs", worker.stats)
+    outbox_relay = OutboxRelay.from_settings(settings.worker, session_maker)
+    metrics.register_collector("outbox", outbox_relay.stats)
+
+    async def _run() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        await asyncio.gather(
+            worker.run(stop), *((outbox_relay.run(stop),) if relay else ())
+        )
+
+    asyncio.run(_run())
@@ -3,10 +3,8 @@ from typing import cast
 
 from advanced_alchemy.extensions.litestar import (
     AsyncSessionConfig,
-    SQLAlchemyAsyncConfig,
     async_autocommit_before_send_handler,
 )
-from litestar.config.compression import CompressionConfig
 from litestar.config.cors import CORSConfig
 from litestar.config.csrf import CSRFConfig
 from litestar.logging.config import LoggingConfig, StructLoggingConfig
@@ -14,9 +12,16 @@ from litestar.middleware.logging import LoggingMiddlewareConfig
 from litestar.plugins.structlog import StructlogConfig
 
 from src.app.config.base import get_settings
+from src.app.lib.compression import NegotiatedCompressionConfig
+from src.app.lib.read_replica import (
+    READ_UNTIL_WRITE,
+    REPLICA_ENGINE,
+    ReplicaAsyncConfig,
+    RoutingSession,
+)
 
 settings = get_settings()
-compression = CompressionConfig(backend="gzip")
+compression = NegotiatedCompressionConfig()
 
 csrf = CSRFConfig(
     secret=settings.app.SECRET_KEY,
@@ -31,10 +36,22 @@ cors = CORSConfig(
     ),
 )
 
-alchemy = SQLAlchemyAsyncConfig(
+session_config = AsyncSessionConfig(expire_on_commit=False)
+if (read_engine := settings.db.get_read_engine()) is not None:
+    session_config = AsyncSessionConfig(
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        info={
+            REPLICA_ENGINE: read_engine.sync_engine,
+            # the SQLite readers share the file of the writer
+            READ_UNTIL_WRITE: settings.db.READ_URL is None,
+        },
+    )
+
+alchemy = ReplicaAsyncConfig(
     engine_instance=settings.db.get_engine(),
     before_send_handler=async_autocommit_before_send_handler,
-    session_config=AsyncSessionConfig(expire_on_commit=False),
+    session_config=session_config,
     # TODO: fix it with migrations
     # alembic_config=AlembicAsyncConfig(
     #     version_table_name=settings.db.MIGRATION_DDL_VERSION_TABLE,
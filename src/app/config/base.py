@@ -7,11 +7,13 @@ from pathlib import Path
 
 from advanced_alchemy.utils.text import slugify
 
-from src.app.config.common import TRUE_VALUES
+from src.app.config.common import BASE_DIR, TRUE_VALUES
 from src.app.config.db import DatabaseSettings
 from src.app.config.log import LogSettings
 from src.app.config.redis import RedisSettings
+from src.app.config.security import SecuritySettings
 from src.app.config.server import ServerSettings
+from src.app.config.worker import WorkerSettings
 
 
 @dataclass
@@ -58,6 +60,24 @@ class AppSettings:
         default_factory=lambda: "HS256",
     )
     """JWT Encryption Algorithm"""
+    HEALTH_CHECK_TIMEOUT: float = field(
+        default_factory=lambda: float(os.getenv("HEALTH_CHECK_TIMEOUT", "1"))
+    )
+    """Seconds a dependency of the health check has to answer."""
+    HEALTH_CHECK_CACHE_TTL: float = field(
+        default_factory=lambda: float(os.getenv("HEALTH_CHECK_CACHE_TTL", "2"))
+    )
+    """Seconds the outcome of a health check is served to later probes."""
+    USER_INDEX_TTL: float = field(
+        default_factory=lambda: float(os.getenv("USER_INDEX_TTL", "300"))
+    )
+    """Seconds after which the user autocomplete index is rebuilt from the database."""
+    OPENAPI_BUILD_DIR: str = field(
+        default_factory=lambda: os.getenv(
+            "OPENAPI_BUILD_DIR", f"{BASE_DIR}/static/openapi"
+        )
+    )
+    """Output directory of `litestar openapi build`, served on `/schema`."""
 
     @property
     def slug(self) -> str:
@@ -107,6 +127,12 @@ class Settings:
     redis: RedisSettings = field(
         default_factory=RedisSettings,
     )
+    security: SecuritySettings = field(
+        default_factory=SecuritySettings,
+    )
+    worker: WorkerSettings = field(
+        default_factory=WorkerSettings,
+    )
 
     @classmethod
     def from_env(cls, dotenv_filename: str = ".env") -> "Settings":
@@ -11,8 +11,20 @@ DTO_INFO_KEY = "info"
 """The name of the key used for storing DTO information."""
 DEFAULT_PAGINATION_SIZE = 20
 """Default page size to use."""
+MAX_PAGINATION_SIZE = 100
+"""Largest page size a client may request."""
+MAX_BULK_ROLE_USERS = 1000
+"""Maximum number of users of a single role assignment or revocation."""
 CACHE_EXPIRATION: int = 60
 """Default cache key expiration in seconds."""
+CACHE_TAGS_OPT_KEY = "cache_tags"
+"""Route handler `opt` key listing the tags of cached responses."""
+USER_LOAD_PROFILE_OPT_KEY = "user_load_profile"
+"""Route handler `opt` key naming the relationships loaded with users."""
+RESPONSE_CACHE_STORE = "response_cache"
+"""The name of the store used for cached responses."""
+USERS_CACHE_TAG = "users"
+"""Cache tag of responses listing users."""
 DEFAULT_USER_ROLE = "Application Access"
 """The name of the default role assigned to all users."""
 SITE_INDEX = "/"
@@ -1,13 +1,20 @@
 import os
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Literal, cast
 
 from litestar.serialization import decode_json, encode_json
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from src.app.config.common import BASE_DIR, TRUE_VALUES
+from src.app.lib.query_stats import instrument_engine
+from src.app.lib.sqlite import (
+    READER_PRAGMAS,
+    WRITER_PRAGMAS,
+    apply_pragmas,
+    is_file_database,
+)
 
 
 @dataclass
@@ -72,6 +79,46 @@ class DatabaseSettings:
         )
     )
     """SQLAlchemy Database URL."""
+    READ_URL: str | None = field(
+        default_factory=lambda: os.getenv("DATABASE_READ_URL") or None
+    )
+    """SQLAlchemy URL of a read replica, with its own pool.
+
+    Reads of safe requests and of the authentication are sent to it when set.
+    """
+    SQLITE_PROFILE: Literal["default", "performance"] = field(
+        default_factory=lambda: cast(
+            "Literal['default', 'performance']",
+            os.getenv("DATABASE_SQLITE_PROFILE", "default"),
+        )
+    )
+    """Tuning of SQLite database files.
+
+    `performance` enables WAL with tuned pragmas, serializes the writes of the
+    process on a single writer connection and serves the reads from a pool of
+    `POOL_SIZE` reader connections, unless `READ_URL` is set. A session only
+    takes the writer at its first write. See :mod:`src.app.lib.sqlite`.
+    """
+    COUNT_MODE: Literal["exact", "window", "cached", "estimated"] = field(
+        default_factory=lambda: cast(
+            "Literal['exact', 'window', 'cached', 'estimated']",
+            os.getenv("DATABASE_COUNT_MODE", "window"),
+        )
+    )
+    """Default strategy computing the total of paginated collections.
+
+    `exact` runs a separate `COUNT(*)`, `window` counts in the list statement,
+    `cached` keeps exact totals per filter set for `COUNT_CACHE_TTL` seconds and
+    `estimated` uses the PostgreSQL planner statistics (exact elsewhere).
+    """
+    COUNT_CACHE_TTL: float = field(
+        default_factory=lambda: float(os.getenv("DATABASE_COUNT_CACHE_TTL", "30"))
+    )
+    """Seconds a collection total is reused in the `cached` count mode."""
+    COUNT_CACHE_MAX_SIZE: int = field(
+        default_factory=lambda: int(os.getenv("DATABASE_COUNT_CACHE_MAX_SIZE", "1024"))
+    )
+    """Maximum number of collection totals cached per worker."""
     MIGRATION_CONFIG: str = f"{BASE_DIR}/db/migrations/alembic.ini"
     """The path to the `alembic.ini` configuration file."""
     MIGRATION_PATH: str = f"{BASE_DIR}/db/migrations"
@@ -82,14 +129,16 @@ class DatabaseSettings:
     """The path to JSON fixture files to load into tables."""
     _engine_instance: AsyncEngine | None = None
     """SQLAlchemy engine instance generated from settings."""
+    _read_engine_instance: AsyncEngine | None = None
+    """SQLAlchemy engine instance of the read replica."""
 
     @property
     def engine(self) -> AsyncEngine:
         return self.get_engine()
 
-    def _get_pg_engine(self) -> AsyncEngine:
+    def _get_pg_engine(self, url: str) -> AsyncEngine:
         engine = create_async_engine(
-            url=self.URL,
+            url=url,
             future=True,
             json_serializer=encode_json,
             json_deserializer=decode_json,
@@ -146,9 +195,19 @@ class DatabaseSettings:
 
         return engine
 
-    def _get_sqlite_engine(self) -> AsyncEngine:
+    def _get_sqlite_engine(self, url: str, readonly: bool = False) -> AsyncEngine:
+        performance = self.SQLITE_PROFILE == "performance" and is_file_database(url)
+        pool_options: dict[str, Any] = {}
+        if performance:
+            pool_options = {
+                "poolclass": AsyncAdaptedQueuePool,
+                "pool_size": self.POOL_SIZE if readonly else 1,
+                "max_overflow": self.POOL_MAX_OVERFLOW if readonly else 0,
+                "pool_timeout": self.POOL_TIMEOUT,
+                "pool_use_lifo": True,
+            }
         engine = create_async_engine(
-            url=self.URL,
+            url=url,
             future=True,
             json_serializer=encode_json,
             json_deserializer=decode_json,
@@ -156,23 +215,29 @@ class DatabaseSettings:
             echo_pool=self.ECHO_POOL,
             pool_recycle=self.POOL_RECYCLE,
             pool_pre_ping=self.POOL_PRE_PING,
+            **pool_options,
         )
+        begin = "BEGIN IMMEDIATE" if performance and not readonly else "BEGIN"
 
         @event.listens_for(engine.sync_engine, "connect")
         def _sqla_on_connect(dbapi_connection: Any, _: Any) -> Any:  # pragma: no cover
             """Override the default begin statement.  The disables the built in begin execution."""
             dbapi_connection.isolation_level = None
+            if performance:
+                apply_pragmas(
+                    dbapi_connection, READER_PRAGMAS if readonly else WRITER_PRAGMAS
+                )
 
         @event.listens_for(engine.sync_engine, "begin")
         def _sqla_on_begin(dbapi_connection: Any) -> Any:  # pragma: no cover
             """Emits a custom begin"""
-            dbapi_connection.exec_driver_sql("BEGIN")
+            dbapi_connection.exec_driver_sql(begin)
 
         return engine
 
-    def _get_custom_engine(self) -> AsyncEngine:
+    def _get_custom_engine(self, url: str) -> AsyncEngine:
         return create_async_engine(
-            url=self.URL,
+            url=url,
             future=True,
             json_serializer=encode_json,
             json_deserializer=decode_json,
@@ -185,16 +250,33 @@ class DatabaseSettings:
             pool_pre_ping=self.POOL_PRE_PING,
         )
 
+    def _create_engine(self, url: str, readonly: bool = False) -> AsyncEngine:
+        if url.startswith("postgresql+asyncpg"):
+            engine = self._get_pg_engine(url)
+        elif url.startswith("sqlite+aiosqlite"):
+            engine = self._get_sqlite_engine(url, readonly=readonly)
+        else:
+            engine = self._get_custom_engine(url)
+        # statements counted per request, see `QueryStatsMiddleware`
+        instrument_engine(engine)
+        return engine
+
     def get_engine(self) -> AsyncEngine:
         if self._engine_instance is not None:
             return self._engine_instance
-        if self.URL.startswith("postgresql+asyncpg"):
-            engine = self._get_pg_engine()
+        self._engine_instance = self._create_engine(self.URL)
+        return self._engine_instance
 
-        elif self.URL.startswith("sqlite+aiosqlite"):
-            engine = self._get_sqlite_engine()
+    def get_read_engine(self) -> AsyncEngine | None:
+        """Engine of the read replica.
 
-        else:
-            engine = self._get_custom_engine()
-        self._engine_instance = engine
-        return self._engine_instance
+        `None` without `READ_URL`, unless the SQLite `performance` profile
+        provides reader connections to the database file.
+        """
+        if self._read_engine_instance is not None:
+            return self._read_engine_instance
+        if self.READ_URL is not None:
+            self._read_engine_instance = self._create_engine(self.READ_URL)
+        elif self.SQLITE_PROFILE == "performance" and is_file_database(self.URL):
+            self._read_engine_instance = self._create_engine(self.URL, readonly=True)
+        return self._read_engine_instance
@@ -12,6 +12,10 @@ class RedisSettings:
         default_factory=lambda: os.getenv("REDIS_URL", "redis://localhost:6379/0")
     )
     """A Redis connection URL."""
+    ENABLED: bool = field(
+        default_factory=lambda: os.getenv("REDIS_ENABLED", "False") in TRUE_VALUES,
+    )
+    """Use Redis for state shared between workers (e.g. the response cache)."""
     SOCKET_CONNECT_TIMEOUT: int = field(
         default_factory=lambda: int(os.getenv("REDIS_CONNECT_TIMEOUT", "5"))
     )
@@ -0,0 +1,132 @@
+import os
+from dataclasses import dataclass, field
+from typing import Literal, cast
+
+from src.app.config.common import TRUE_VALUES
+
+
+@dataclass
+class SecuritySettings:
+    """Password hashing and authentication configuration."""
+
+    HASHING_POOL_KIND: Literal["thread", "process"] = field(
+        default_factory=lambda: cast(
+            "Literal['thread', 'process']",
+            os.getenv("PASSWORD_HASHING_POOL_KIND", "thread"),
+        )
+    )
+    """Executor type used for password hashing (`thread` or `process`)."""
+    HASHING_POOL_WORKERS: int = field(
+        default_factory=lambda: int(
+            os.getenv("PASSWORD_HASHING_POOL_WORKERS", str(min(4, os.cpu_count() or 1)))
+        )
+    )
+    """Number of workers dedicated to password hashing."""
+    HASHING_POOL_MAX_QUEUE: int = field(
+        default_factory=lambda: int(os.getenv("PASSWORD_HASHING_POOL_MAX_QUEUE", "32"))
+    )
+    """Maximum number of hashing jobs waiting for a free worker."""
+    HASHING_POOL_TIMEOUT: float = field(
+        default_factory=lambda: float(os.getenv("PASSWORD_HASHING_POOL_TIMEOUT", "5"))
+    )
+    """Deadline in seconds for a single hashing job, including queue time."""
+    HASHING_POOL_RETRY_AFTER: int = field(
+        default_factory=lambda: int(os.getenv("PASSWORD_HASHING_POOL_RETRY_AFTER", "1"))
+    )
+    """`Retry-After` value in seconds sent when the hashing pool is saturated."""
+    BULK_HASHING_POOL_WORKERS: int = field(
+        default_factory=lambda: int(
+            os.getenv("PASSWORD_BULK_HASHING_POOL_WORKERS", str(os.cpu_count() or 1))
+        )
+    )
+    """Number of worker processes hashing passwords of bulk imports."""
+    BULK_HASHING_POOL_MAX_QUEUE: int = field(
+        default_factory=lambda: int(
+            os.getenv("PASSWORD_BULK_HASHING_POOL_MAX_QUEUE", "1000")
+        )
+    )
+    """Maximum number of bulk hashing jobs waiting for a free worker."""
+    BULK_HASHING_POOL_TIMEOUT: float = field(
+        default_factory=lambda: float(
+            os.getenv("PASSWORD_BULK_HASHING_POOL_TIMEOUT", "600")
+        )
+    )
+    """Deadline in seconds for a single bulk hashing job, including queue time."""
+    ARGON2_TIME_COST: int = field(
+        default_factory=lambda: int(os.getenv("PASSWORD_ARGON2_TIME_COST", "3"))
+    )
+    """Argon2 time cost (number of iterations) for new password hashes."""
+    ARGON2_MEMORY_COST: int = field(
+        default_factory=lambda: int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", "65536"))
+    )
+    """Argon2 memory cost in KiB for new password hashes."""
+    ARGON2_PARALLELISM: int = field(
+        default_factory=lambda: int(os.getenv("PASSWORD_ARGON2_PARALLELISM", "4"))
+    )
+    """Argon2 degree of parallelism for new password hashes.
+
+    Stored hashes using other parameters are upgraded on the next login.
+    """
+    PRINCIPAL_CACHE_TTL: float = field(
+        default_factory=lambda: float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+    )
+    """Seconds an authenticated user stays cached per worker (`0` disables).
+
+    Invalidation is process local, other workers may serve a stale principal
+    until the entry expires.
+    """
+    PRINCIPAL_CACHE_MAX_SIZE: int = field(
+        default_factory=lambda: int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+    )
+    """Maximum number of cached principals per worker."""
+    STATELESS_AUTH: bool = field(
+        default_factory=lambda: os.getenv("STATELESS_AUTH", "False") in TRUE_VALUES
+    )
+    """Embed authorization claims in the JWT and skip the user lookup.
+
+    Changes to a user only apply once the token expires.
+    """
+    STATELESS_TOKEN_EXPIRATION: int = field(
+        default_factory=lambda: int(os.getenv("STATELESS_TOKEN_EXPIRATION", "300"))
+    )
+    """Lifetime in seconds of tokens issued in stateless mode."""
+    LOGIN_RATE_LIMIT_ENABLED: bool = field(
+        default_factory=lambda: os.getenv("LOGIN_RATE_LIMIT_ENABLED", "True")
+        in TRUE_VALUES
+    )
+    """Throttle login attempts before their password is verified."""
+    LOGIN_RATE_LIMIT_WINDOW: int = field(
+        default_factory=lambda: int(os.getenv("LOGIN_RATE_LIMIT_WINDOW", "60"))
+    )
+    """Length in seconds of the sliding window login attempts are counted in."""
+    LOGIN_RATE_LIMIT_PER_USERNAME: int = field(
+        default_factory=lambda: int(os.getenv("LOGIN_RATE_LIMIT_PER_USERNAME", "5"))
+    )
+    """Login attempts allowed per window for a username."""
+    LOGIN_RATE_LIMIT_PER_IP: int = field(
+        default_factory=lambda: int(os.getenv("LOGIN_RATE_LIMIT_PER_IP", "20"))
+    )
+    """Login attempts allowed per window from a client IP address.
+
+    Counters are shared by all workers when Redis is enabled.
+    """
+    LOGIN_STATS_FLUSH_INTERVAL: float = field(
+        default_factory=lambda: float(os.getenv("LOGIN_STATS_FLUSH_INTERVAL", "5"))
+    )
+    """Seconds between two writes of the pending login statistics."""
+    LOGIN_STATS_FLUSH_SIZE: int = field(
+        default_factory=lambda: int(os.getenv("LOGIN_STATS_FLUSH_SIZE", "500"))
+    )
+    """Logins recorded before the pending statistics are written early."""
+    AUDIT_BUFFER_SIZE: int = field(
+        default_factory=lambda: int(os.getenv("AUDIT_BUFFER_SIZE", "10000"))
+    )
+    """Audit entries held in memory at most, the entries over it are dropped."""
+    AUDIT_FLUSH_INTERVAL: float = field(
+        default_factory=lambda: float(os.getenv("AUDIT_FLUSH_INTERVAL", "2"))
+    )
+    """Seconds between two writes of the buffered audit entries."""
+    AUDIT_FLUSH_SIZE: int = field(
+        default_factory=lambda: int(os.getenv("AUDIT_FLUSH_SIZE", "500"))
+    )
+    """Buffered audit entries which trigger an early write, and written at once."""
@@ -0,0 +1,32 @@
+import os
+from dataclasses import dataclass, field
+
+
+@dataclass
+class WorkerSettings:
+    """Background job queue configuration."""
+
+    CONCURRENCY: int = field(
+        default_factory=lambda: int(os.getenv("WORKER_CONCURRENCY", "10"))
+    )
+    """Maximum number of jobs a worker process runs at once."""
+    POLL_INTERVAL: float = field(
+        default_factory=lambda: float(os.getenv("WORKER_POLL_INTERVAL", "1"))
+    )
+    """Seconds an idle worker waits before looking for new jobs."""
+    MAX_ATTEMPTS: int = field(
+        default_factory=lambda: int(os.getenv("WORKER_MAX_ATTEMPTS", "3"))
+    )
+    """Attempts of a job before it is marked as failed."""
+    RETRY_DELAY: float = field(
+        default_factory=lambda: float(os.getenv("WORKER_RETRY_DELAY", "5"))
+    )
+    """Seconds before the first retry of a failed job, doubled on every attempt."""
+    JOB_TIMEOUT: float = field(
+        default_factory=lambda: float(os.getenv("WORKER_JOB_TIMEOUT", "60"))
+    )
+    """Seconds a job may run before it is cancelled and counted as failed."""
+    OUTBOX_BATCH_SIZE: int = field(
+        default_factory=lambda: int(os.getenv("WORKER_OUTBOX_BATCH_SIZE", "100"))
+    )
+    """Outbox events relayed per transaction."""
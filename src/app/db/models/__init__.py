@@ -1,9 +1,15 @@
+from src.app.db.models.audit import AuditLog
+from src.app.db.models.job import Job
 from src.app.db.models.oauth_account import UserOauthAccount
+from src.app.db.models.outbox import OutboxEvent
 from src.app.db.models.role import Role
 from src.app.db.models.user import User
 from src.app.db.models.user_role import UserRole
 
 __all__ = (
+    "AuditLog",
+    "Job",
+    "OutboxEvent",
     "User",
     "UserOauthAccount",
     "Role",
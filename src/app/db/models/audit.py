@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from advanced_alchemy.base import UUIDv7Base
+from advanced_alchemy.types import DateTimeUTC, JsonB
+from sqlalchemy import Index, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class AuditLog(UUIDv7Base):
+    """Change made to an account, rows are only ever inserted."""
+
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_created_at_id", "created_at", "id"),
+        Index("ix_audit_log_target_id_created_at", "target_id", "created_at"),
+        {"comment": "Append-only log of the changes made to accounts."},
+    )
+    actor_id: Mapped[UUID | None] = mapped_column(default=None)
+    """User who made the change, `None` for the system. Not a foreign key, the
+    entries outlive the users."""
+    target_id: Mapped[UUID]
+    """User the change was made to."""
+    action: Mapped[str] = mapped_column(String(length=50))
+    """`update`, `update_password`, `delete`, `assign_role` or `revoke_role`."""
+    changed: Mapped[list[str]] = mapped_column(JsonB, default=list)
+    """Names of the changed fields."""
+    before: Mapped[dict[str, Any] | None] = mapped_column(JsonB, default=None)
+    """Recorded values before the change, the revoked role of `revoke_role`."""
+    after: Mapped[dict[str, Any] | None] = mapped_column(JsonB, default=None)
+    """Recorded values after the change, the assigned role of `assign_role`."""
+    created_at: Mapped[datetime] = mapped_column(
+        DateTimeUTC(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    """Time of the change, not of the write of the entry."""
+
+
+@event.listens_for(AuditLog, "before_update")
+@event.listens_for(AuditLog, "before_delete")
+def _append_only(*_: Any) -> None:
+    msg = "Audit log entries cannot be changed"
+    raise TypeError(msg)
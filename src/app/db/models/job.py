@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from advanced_alchemy.base import UUIDAuditBase
+from advanced_alchemy.types import DateTimeUTC, JsonB
+from sqlalchemy import Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class Job(UUIDAuditBase):
+    """Background job, run by `litestar workers run`."""
+
+    __tablename__ = "job"
+    __table_args__ = (
+        Index("ix_job_queue_status_scheduled_at", "queue", "status", "scheduled_at"),
+        {"comment": "Durable queue of background jobs."},
+    )
+    queue: Mapped[str] = mapped_column(String(length=50), default="default")
+    function: Mapped[str] = mapped_column(String(length=255))
+    kwargs: Mapped[dict[str, Any]] = mapped_column(JsonB, default=dict)
+    status: Mapped[str] = mapped_column(String(length=20), default="queued")
+    """`queued`, `active`, `complete` or `failed`."""
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column(default=3)
+    scheduled_at: Mapped[datetime] = mapped_column(
+        DateTimeUTC(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    """Earliest time the job may run, pushed back by the retries."""
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTimeUTC(timezone=True), default=None
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTimeUTC(timezone=True), default=None
+    )
+    locked_until: Mapped[datetime | None] = mapped_column(
+        DateTimeUTC(timezone=True), default=None
+    )
+    """End of the lease of the worker running the job."""
+    error: Mapped[str | None] = mapped_column(Text, default=None)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from advanced_alchemy.base import UUIDAuditBase
+from advanced_alchemy.types import DateTimeUTC, JsonB
+from sqlalchemy import Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class OutboxEvent(UUIDAuditBase):
+    """Domain event, written with the change it describes."""
+
+    __tablename__ = "outbox_event"
+    __table_args__ = (
+        Index("ix_outbox_event_status_available_at", "status", "available_at"),
+        {"comment": "Domain events waiting for the outbox relay."},
+    )
+    event_type: Mapped[str] = mapped_column(String(length=100))
+    payload: Mapped[dict[str, Any]] = mapped_column(JsonB, default=dict)
+    status: Mapped[str] = mapped_column(String(length=20), default="pending")
+    """`pending` or `failed`, published events are deleted."""
+    attempts: Mapped[int] = mapped_column(default=0)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTimeUTC(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    """Earliest time the event may be relayed, pushed back by the retries."""
+    locked_until: Mapped[datetime | None] = mapped_column(
+        DateTimeUTC(timezone=True), default=None
+    )
+    """End of the lease of the relay handling the event."""
+    error: Mapped[str | None] = mapped_column(Text, default=None)
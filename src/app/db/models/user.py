@@ -4,9 +4,12 @@ from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from advanced_alchemy.base import UUIDAuditBase
+from advanced_alchemy.types import DateTimeUTC
 from sqlalchemy import String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from src.app.lib.search import register_search_indexes
+
 if TYPE_CHECKING:
     from .oauth_account import UserOauthAccount
     from .user_role import UserRole
@@ -16,6 +19,7 @@ class User(UUIDAuditBase):
     __tablename__ = "user_account"
     __table_args__ = {"comment": "User accounts for application access"}
     __pii_columns__ = {"name", "email", "avatar_url"}
+    __searchable_columns__ = ("email", "name")
 
     email: Mapped[str] = mapped_column(unique=True, index=True, nullable=False)
     name: Mapped[str | None] = mapped_column(nullable=True, default=None)
@@ -31,20 +35,27 @@ class User(UUIDAuditBase):
     verified_at: Mapped[date] = mapped_column(nullable=True, default=None)
     joined_at: Mapped[date] = mapped_column(default=datetime.now)
     login_count: Mapped[int] = mapped_column(default=0)
+    last_login_at: Mapped[datetime | None] = mapped_column(
+        DateTimeUTC(timezone=True), nullable=True, default=None
+    )
+    """Written behind the logins, see `domain.accounts.login_stats`."""
     # -----------
     # ORM Relationships
     # ------------
 
     roles: Mapped[list[UserRole]] = relationship(
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
         uselist=True,
         cascade="all, delete",
     )
 
     oauth_accounts: Mapped[list[UserOauthAccount]] = relationship(
         back_populates="user",
-        lazy="noload",
+        lazy="raise",
         cascade="all, delete",
         uselist=True,
     )
+
+
+register_search_indexes(User)
@@ -0,0 +1,121 @@
+"""Schema changes applied to databases created before them.
+
+The schema is built with `create_all`, which creates missing tables but never
+alters an existing one. :func:`upgrade_schema` adds what later changes of the
+models need to the tables of a database created earlier:
+
+- the `user_account.last_login_at` column, written behind the logins;
+- the `audit_log.before` and `audit_log.after` columns, recording the roles
+  assigned and revoked;
+- the unique index on `user_account_role (user_id, role_id)`, targeted by the
+  ``ON CONFLICT`` clause of the role assignments, after removing the
+  duplicate links it would reject.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import delete, exists, inspect, select
+
+from src.app.db.models import AuditLog, User, UserRole
+
+if TYPE_CHECKING:
+    from sqlalchemy import Column, Connection
+    from sqlalchemy.engine import Inspector
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = ("ensure_schema_upgrades", "upgrade_schema")
+
+USER_ROLE_UNIQUE_INDEX = "uq_user_account_role_user_id_role_id"
+"""Name of the unique constraint of the user roles, reused for the index."""
+
+
+ADDED_COLUMNS: tuple[Column[Any], ...] = (
+    User.__table__.c.last_login_at,
+    AuditLog.__table__.c.before,
+    AuditLog.__table__.c.after,
+)
+"""Nullable columns added to existing tables."""
+
+
+def _add_column(
+    connection: Connection, inspector: Inspector, column: Column[Any]
+) -> bool:
+    table_name = column.table.name
+    if not inspector.has_table(table_name) or column.name in {
+        existing["name"] for existing in inspector.get_columns(table_name)
+    }:
+        return False
+    column_type = column.type.compile(dialect=connection.dialect)
+    # SQLite has no `IF NOT EXISTS` for columns, the inspector checked instead
+    if_not_exists = "IF NOT EXISTS " if connection.dialect.name == "postgresql" else ""
+    connection.exec_driver_sql(
+        f"ALTER TABLE {table_name} "
+        f"ADD COLUMN {if_not_exists}{column.name} {column_type}"
+    )
+    return True
+
+
+def _add_user_role_unique_index(connection: Connection, inspector: Inspector) -> bool:
+    table_name = UserRole.__tablename__
+    if not inspector.has_table(table_name):
+        return False
+    columns = {"user_id", "role_id"}
+    unique_column_sets = [
+        set(constraint["column_names"])
+        for constraint in inspector.get_unique_constraints(table_name)
+    ] + [
+        set(index["column_names"])
+        for index in inspector.get_indexes(table_name)
+        if index["unique"]
+    ]
+    if columns in unique_column_sets:
+        return False
+    links = UserRole.__table__
+    other = links.alias("other")
+    connection.execute(
+        delete(links).where(
+            exists(
+                select(other.c.id).where(
+                    other.c.user_id == links.c.user_id,
+                    other.c.role_id == links.c.role_id,
+                    other.c.id < links.c.id,
+                )
+            )
+        )
+    )
+    connection.exec_driver_sql(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {USER_ROLE_UNIQUE_INDEX} "
+        f"ON {table_name} (user_id, role_id)"
+    )
+    return True
+
+
+def upgrade_schema(connection: Connection) -> list[str]:
+    """Apply the missing schema changes to the existing tables.
+
+    Every change checks the current schema first, running it again is a no-op.
+
+    Args:
+        connection: Connection of the database.
+
+    Returns:
+        list[str]: Names of the applied changes.
+    """
+    inspector = inspect(connection)
+    applied: list[str] = []
+    applied.extend(
+        f"{column.table.name}.{column.name}"
+        for column in ADDED_COLUMNS
+        if _add_column(connection, inspector, column)
+    )
+    if _add_user_role_unique_index(connection, inspector):
+        applied.append(USER_ROLE_UNIQUE_INDEX)
+    return applied
+
+
+async def ensure_schema_upgrades(engine: AsyncEngine) -> list[str]:
+    """`on_startup` hook running :func:`upgrade_schema` on `engine`."""
+    async with engine.begin() as connection:
+        return await connection.run_sync(upgrade_schema)
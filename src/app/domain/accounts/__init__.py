@@ -1,6 +1,6 @@
 """User Account domain logic."""
 
-from src.app.domain.accounts import (  # controllers,; dependencies,; schemas,; services,; signals,; urls,
+from src.app.domain.accounts import (  # controllers,; dependencies,; jobs,; schemas,; services,; signals,; urls,
     guards,
 )
 
@@ -10,6 +10,7 @@ __all__ = [
     # "controllers",
     # "dependencies",
     # "schemas",
+    # "jobs",
     # "signals",
     # "urls",
 ]
@@ -0,0 +1,223 @@
+"""Audit log of the changes made to accounts.
+
+`UserService.update`, `update_password` and `delete` record who changed
+which fields of which user with :func:`audit_user_change`, without any
+statement, and `UserRoleService` records every role it assigns to or revokes
+from a user. Entries join :data:`audit_trail`, a bounded buffer in memory,
+once their session commits and are dropped on rollback. The buffer is
+written to the append-only `audit_log` table every `AUDIT_FLUSH_INTERVAL`
+seconds, or once `AUDIT_FLUSH_SIZE` entries are waiting, with a single
+multi-row insert per batch, and on shutdown.
+
+When the database falls behind and the buffer holds `AUDIT_BUFFER_SIZE`
+entries, new entries are dropped: every drop is counted in the `audit`
+metrics and the start of an overflow is logged as an error. Entries of a
+worker which dies are lost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import deque
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from src.app.config.app import alchemy
+from src.app.config.base import get_settings
+from src.app.db.models import AuditLog
+from src.app.lib import metrics
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from contextlib import AbstractAsyncContextManager
+    from uuid import UUID
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+__all__ = (
+    "AuditTrail",
+    "audit_trail",
+    "audit_user_change",
+)
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+_PENDING_KEY = "audit_entries"
+
+
+class AuditTrail:
+    """Buffer audit entries and write them in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+        maxsize: int = 10000,
+        flush_interval: float = 2.0,
+        flush_size: int = 500,
+    ) -> None:
+        self.session_factory = session_factory
+        self.maxsize = maxsize
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._overflowing = False
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._flushing: set[asyncio.Task[Any]] = set()
+        self._recorded = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed_flushes = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def stats(self) -> dict[str, Any]:
+        """Entries recorded, written, buffered and dropped on overflow."""
+        return {
+            "recorded": self._recorded,
+            "written": self._written,
+            "buffered": len(self._buffer),
+            "maxsize": self.maxsize,
+            "dropped": self._dropped,
+            "overflowing": self._overflowing,
+            "failed_flushes": self._failed_flushes,
+        }
+
+    def extend(self, entries: Iterable[dict[str, Any]]) -> None:
+        """Buffer committed entries, dropping those over `maxsize`."""
+        for entry in entries:
+            self._recorded += 1
+            if len(self._buffer) >= self.maxsize:
+                self._dropped += 1
+                if not self._overflowing:
+                    self._overflowing = True
+                    logger.error(
+                        "Audit buffer full, dropping entries", maxsize=self.maxsize
+                    )
+                continue
+            self._buffer.append(entry)
+        if len(self._buffer) >= self.flush_size and not self._flushing:
+            flushing = asyncio.create_task(self.flush())
+            self._flushing.add(flushing)
+            flushing.add_done_callback(self._flushing.discard)
+
+    async def flush(self) -> int:
+        """Write the buffered entries, `flush_size` at a time.
+
+        Returns:
+            int: Number of entries written.
+        """
+        written = 0
+        async with self._lock:
+            while self._buffer:
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(self.flush_size, len(self._buffer)))
+                ]
+                try:
+                    async with self.session_factory() as session, session.begin():
+                        await session.execute(insert(AuditLog), batch)
+                except Exception:  # noqa: BLE001
+                    self._failed_flushes += 1
+                    # back in front, in order, as long as they fit
+                    room = self.maxsize - len(self._buffer)
+                    self._dropped += max(0, len(batch) - room)
+                    self._buffer.extendleft(reversed(batch[:room]))
+                    await logger.aexception(
+                        "Could not write the audit entries", entries=len(batch)
+                    )
+                    break
+                written += len(batch)
+                self._written += len(batch)
+            if self._overflowing and len(self._buffer) < self.maxsize:
+                self._overflowing = False
+                await logger.awarning("Audit buffer drained", dropped=self._dropped)
+        return written
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # a cancellation must not drop the entries being written
+            await asyncio.shield(self.flush())
+
+    async def start(self) -> None:
+        """`on_startup` hook writing the entries periodically."""
+        self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        """`on_shutdown` hook writing the buffered entries."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._flushing:
+            await asyncio.wait(set(self._flushing))
+        await self.flush()
+
+    def clear(self) -> None:
+        """Drop the buffered entries."""
+        self._buffer.clear()
+        self._overflowing = False
+
+
+audit_trail = AuditTrail(
+    alchemy.get_session,
+    maxsize=settings.security.AUDIT_BUFFER_SIZE,
+    flush_interval=settings.security.AUDIT_FLUSH_INTERVAL,
+    flush_size=settings.security.AUDIT_FLUSH_SIZE,
+)
+"""Committed audit entries of this worker not written yet."""
+metrics.register_collector("audit", audit_trail.stats)
+
+
+def audit_user_change(
+    session: AsyncSession | Session,
+    action: str,
+    target_id: UUID,
+    actor_id: UUID | None,
+    changed: Iterable[str] = (),
+    before: dict[str, Any] | None = None,
+    after: dict[str, Any] | None = None,
+) -> None:
+    """Audit a change made to a user once `session` commits.
+
+    Args:
+        session: Session of the change.
+        action: What was done to the user.
+        target_id: The primary key of the changed user.
+        actor_id: The primary key of the user making the change, `None` for
+            the system.
+        changed: Names of the changed fields.
+        before: Recorded values before the change.
+        after: Recorded values after the change.
+    """
+    session.info.setdefault(_PENDING_KEY, []).append(
+        {
+            "actor_id": actor_id,
+            "target_id": target_id,
+            "action": action,
+            "changed": sorted(changed),
+            "before": before,
+            "after": after,
+            "created_at": datetime.now(UTC),
+        }
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _buffer_pending(session: Session) -> None:
+    if entries := session.info.pop(_PENDING_KEY, None):
+        audit_trail.extend(entries)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,193 @@
+"""User autocomplete served from an in-process prefix index.
+
+The index is built from the database on first use, or in the background at
+startup, and then follows the writes of this process: users flushed by the
+ORM (the create, update and delete paths of `UserService`) and the changes
+queued with :func:`index_user` and :func:`unindex_user` are applied once
+their session commits and dropped on rollback. Writes of other workers, of
+the CLI and of Core statements are picked up by the next rebuild: a lookup
+on an index older than `USER_INDEX_TTL` swaps in a freshly built one in the
+background.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from src.app.config.app import alchemy
+from src.app.config.base import get_settings
+from src.app.db.models import User
+from src.app.lib import metrics
+from src.app.lib.prefix_index import PrefixIndex
+from src.app.lib.read_replica import mark_read_only
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from uuid import UUID
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+__all__ = (
+    "MAX_AUTOCOMPLETE_RESULTS",
+    "ensure_user_index",
+    "index_user",
+    "rebuild_user_index",
+    "unindex_user",
+    "user_index",
+    "warm_user_index",
+)
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+MAX_AUTOCOMPLETE_RESULTS = 20
+"""Maximum number of suggestions of a single lookup."""
+BUILD_BATCH_SIZE = 5000
+"""Number of users fetched from the server side cursor at once while building."""
+_PENDING_KEY = "user_index_changes"
+
+user_index: PrefixIndex[UUID, tuple[UUID, str, str | None]] = PrefixIndex()
+"""Users keyed by id, found by email, full name and every word of the name."""
+metrics.register_collector("user_index", user_index.stats)
+
+_build_lock = asyncio.Lock()
+_replay: list[Callable[[], None]] | None = None
+"""Changes committed while the index is being built."""
+_rebuild_task: asyncio.Task[Any] | None = None
+
+
+def user_terms(email: str, name: str | None) -> list[str]:
+    """Terms a user is found by."""
+    if not name:
+        return [email]
+    return [email, name, *name.split()[1:]]
+
+
+def _apply(change: Callable[[], None]) -> None:
+    if _replay is not None:
+        _replay.append(change)
+    if user_index.built:
+        change()
+
+
+def _queue(session: AsyncSession | Session, change: Callable[[], None]) -> None:
+    session.info.setdefault(_PENDING_KEY, []).append(change)
+
+
+def index_user(
+    session: AsyncSession | Session, user_id: UUID, email: str, name: str | None
+) -> None:
+    """Add or update a user in the index once `session` commits."""
+    _queue(
+        session,
+        lambda: user_index.add(
+            user_id, (user_id, email, name), user_terms(email, name)
+        ),
+    )
+
+
+def unindex_user(session: AsyncSession | Session, user_id: UUID) -> None:
+    """Remove a user from the index once `session` commits."""
+    _queue(session, lambda: user_index.remove(user_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _track_users(session: Session, flush_context: Any) -> None:
+    # `new`, `dirty` and `deleted` still hold the pre-flush state here
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, User):
+            index_user(session, obj.id, obj.email, obj.name)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            unindex_user(session, obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    for change in session.info.pop(_PENDING_KEY, ()):
+        _apply(change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def _load_documents(
+    db_session: AsyncSession,
+) -> list[tuple[UUID, tuple[UUID, str, str | None], Iterable[str]]]:
+    documents: list[tuple[UUID, tuple[UUID, str, str | None], Iterable[str]]] = []
+    result = await db_session.stream(
+        select(User.id, User.email, User.name).execution_options(
+            yield_per=BUILD_BATCH_SIZE
+        )
+    )
+    async for rows in result.partitions():
+        documents.extend(
+            (user_id, (user_id, email, name), user_terms(email, name))
+            for user_id, email, name in rows
+        )
+    return documents
+
+
+async def _build() -> None:
+    global _replay
+    started = time.perf_counter()
+    _replay = []
+    try:
+        async with alchemy.get_session() as db_session:
+            mark_read_only(db_session)
+            documents = await _load_documents(db_session)
+        user_index.build(documents)
+        for change in _replay:
+            change()
+    finally:
+        _replay = None
+    await logger.ainfo(
+        "Built the user autocomplete index",
+        rebuild_seconds=round(time.perf_counter() - started, 3),
+        **user_index.stats(),
+    )
+
+
+async def rebuild_user_index() -> None:
+    """Swap in an index freshly built from the database in a dedicated session."""
+    async with _build_lock:
+        await _build()
+
+
+async def _rebuild() -> None:
+    try:
+        await rebuild_user_index()
+    except Exception:  # noqa: BLE001
+        await logger.aexception("Could not build the user autocomplete index")
+
+
+def _schedule_rebuild() -> None:
+    global _rebuild_task
+    if _rebuild_task is None or _rebuild_task.done():
+        _rebuild_task = asyncio.create_task(_rebuild())
+
+
+async def ensure_user_index() -> None:
+    """Build the index unless it is built, rebuild it in the background once stale.
+
+    The stale index keeps answering lookups until the rebuilt one replaces it.
+    """
+    if user_index.built_at is None:
+        async with _build_lock:
+            if not user_index.built:
+                await _build()
+    elif time.time() - user_index.built_at >= settings.app.USER_INDEX_TTL:
+        _schedule_rebuild()
+
+
+async def warm_user_index() -> None:
+    """`on_startup` hook building the index in the background."""
+    _schedule_rebuild()
@@ -0,0 +1,89 @@
+"""Account caches: authenticated principals and cached user responses."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.app.config import constants
+from src.app.config.base import get_settings
+from src.app.lib import metrics
+from src.app.lib.cache import TTLCache
+from src.app.lib.response_cache import invalidate_cache_tags
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from uuid import UUID
+
+    from litestar import Request
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.app.db.models import User
+
+__all__ = (
+    "invalidate_principal",
+    "invalidate_principals",
+    "invalidate_users_cache",
+    "principal_cache",
+)
+
+settings = get_settings()
+
+_PENDING_KEY = "invalidated_principals"
+
+principal_cache: TTLCache[str, User] = TTLCache(
+    maxsize=settings.security.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.security.PRINCIPAL_CACHE_TTL,
+)
+"""Detached users keyed by JWT subject, see `guards.current_user_from_token`."""
+metrics.register_collector("principal_cache", principal_cache.stats)
+
+
+def invalidate_principals(
+    session: AsyncSession | Session, user_ids: Iterable[UUID]
+) -> None:
+    """Drop the cached principals of users once `session` commits.
+
+    Dropping them earlier would let a concurrent request cache the state
+    the transaction is about to replace.
+
+    Args:
+        session: Session of the change.
+        user_ids: The primary keys of the changed users.
+    """
+    session.info.setdefault(_PENDING_KEY, set()).update(user_ids)
+
+
+def invalidate_principal(session: AsyncSession | Session, user_id: UUID) -> None:
+    """Drop the cached principal of a user once `session` commits.
+
+    Args:
+        session: Session of the change.
+        user_id: The primary key of the changed user.
+    """
+    invalidate_principals(session, (user_id,))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_pending(session: Session) -> None:
+    if user_ids := session.info.pop(_PENDING_KEY, None):
+        principal_cache.pop_where(lambda user: user.id in user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def invalidate_users_cache(request: Request) -> None:
+    """`after_response` hook of handlers changing users.
+
+    It runs once the transaction is committed, so a concurrent request cannot
+    cache the previous state again.
+
+    Args:
+        request: The handled request.
+    """
+    await invalidate_cache_tags(request.app, constants.USERS_CACHE_TAG)
@@ -1,7 +1,11 @@
 from src.app.domain.accounts.controllers.access import AccessController
+from src.app.domain.accounts.controllers.audit import AuditController
+from src.app.domain.accounts.controllers.user_role import UserRoleController
 from src.app.domain.accounts.controllers.users import UserController
 
 __all__ = [
     "AccessController",
+    "AuditController",
     "UserController",
+    "UserRoleController",
 ]
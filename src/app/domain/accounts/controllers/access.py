@@ -11,15 +11,23 @@ from litestar.enums import RequestEncodingType
 from litestar.params import Body
 from litestar.security.jwt import OAuth2Login
 
+from src.app.config import constants
 from src.app.db.models import User as UserModel
 from src.app.domain.accounts import urls
+from src.app.domain.accounts.cache import invalidate_users_cache
 from src.app.domain.accounts.dependencies import (
     provide_roles_service,
     provide_users_service,
 )
-from src.app.domain.accounts.guards import auth, requires_active_user
+from src.app.domain.accounts.guards import (
+    auth,
+    create_login_response,
+    is_token_principal,
+    requires_active_user,
+)
 from src.app.domain.accounts.schemas import AccountLogin, AccountRegister, User
 from src.app.domain.accounts.services import RoleService, UserService
+from src.app.domain.accounts.throttling import throttle_login
 
 
 class AccessController(Controller):
@@ -46,9 +54,11 @@ class AccessController(Controller):
         cache=False,
         summary="Login",
         exclude_from_auth=True,
+        opt={constants.USER_LOAD_PROFILE_OPT_KEY: "auth"},
     )
     async def login(
         self,
+        request: Request,
         users_service: UserService,
         data: Annotated[
             AccountLogin,
@@ -58,12 +68,17 @@ class AccessController(Controller):
             ),
         ],
     ) -> Response[OAuth2Login]:
-        """Authenticate a user."""
+        """Authenticate a user.
+
+        Attempts over the login rate limits are rejected with a `429` before
+        the password is verified.
+        """
+        await throttle_login(request, data.username)
         user = await users_service.authenticate(
             data.username,
             data.password,
         )
-        return auth.login(user.email)
+        return create_login_response(user)
 
     @post(
         operation_id="AccountLogout",
@@ -96,10 +111,11 @@ class AccessController(Controller):
         cache=False,
         summary="Create User",
         description="Register a new account.",
+        after_response=invalidate_users_cache,
+        opt={constants.USER_LOAD_PROFILE_OPT_KEY: "profile"},
     )
     async def signup(
         self,
-        request: Request,
         users_service: UserService,
         roles_service: RoleService,
         data: AccountRegister,
@@ -113,7 +129,6 @@ class AccessController(Controller):
         if role_obj is not None:
             user_data.update({"role_id": role_obj.id})
         user = await users_service.create(user_data)
-        request.app.emit(event_id="user_created", user_id=user.id)
         return users_service.to_schema(user, schema_type=User)
 
     @get(
@@ -123,6 +138,7 @@ class AccessController(Controller):
         guards=[requires_active_user],
         summary="User Profile",
         description="User profile information.",
+        opt={constants.USER_LOAD_PROFILE_OPT_KEY: "profile"},
     )
     async def profile(
         self,
@@ -130,7 +146,13 @@ class AccessController(Controller):
         current_user: UserModel,
         users_service: UserService,
     ) -> User:
-        """User Profile."""
+        """User Profile.
+
+        The principal is looked up with the `profile` load profile and
+        serialized as is, only the principals of stateless tokens are loaded.
+        """
+        if is_token_principal(current_user):
+            current_user = await users_service.get(current_user.id)
         return users_service.to_schema(
             current_user,
             schema_type=User,
@@ -0,0 +1,72 @@
+"""Audit Log Controllers."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Annotated
+from uuid import UUID
+
+from advanced_alchemy.filters import CollectionFilter
+from litestar import Controller, get
+from litestar.di import Provide
+from litestar.params import Parameter
+
+from src.app.config import constants
+from src.app.domain.accounts import urls
+from src.app.domain.accounts.dependencies import provide_audit_log_service
+from src.app.domain.accounts.guards import requires_superuser
+from src.app.domain.accounts.schemas import AuditEntry
+from src.app.domain.accounts.services import AuditLogService
+from src.app.lib.pagination import CursorPagination, Pagination, list_page
+
+if TYPE_CHECKING:
+    from typing import Any
+
+
+class AuditController(Controller):
+    """Read the audit log of the account changes."""
+
+    tags = ["Audit"]
+    guards = [requires_superuser]
+    dependencies = {"audit_log_service": Provide(provide_audit_log_service)}
+    signature_namespace = {"AuditLogService": AuditLogService, "UUID": UUID}
+
+    @get(
+        operation_id="ListAuditEntries",
+        name="users:audit",
+        summary="List Audit Entries",
+        description=(
+            "Changes made to users, latest first. Entries are written a few "
+            "seconds after their change."
+        ),
+        path=urls.ACCOUNT_AUDIT,
+    )
+    async def list_audit_entries(
+        self,
+        audit_log_service: AuditLogService,
+        cursor: Annotated[
+            str | None,
+            Parameter(
+                query="cursor",
+                description="`nextCursor` of the previous page, empty for the first page.",
+            ),
+        ] = None,
+        page_size: Annotated[
+            int,
+            Parameter(query="pageSize", ge=1, le=constants.MAX_PAGINATION_SIZE),
+        ] = constants.DEFAULT_PAGINATION_SIZE,
+        target_id: Annotated[
+            UUID | None, Parameter(query="targetId", title="Changed user")
+        ] = None,
+        actor_id: Annotated[
+            UUID | None, Parameter(query="actorId", title="User making the change")
+        ] = None,
+    ) -> Pagination[AuditEntry]:
+        """List audit entries with keyset pagination."""
+        filters: list[Any] = [CursorPagination(limit=page_size, cursor=cursor or None)]
+        if target_id is not None:
+            filters.append(CollectionFilter("target_id", [target_id]))
+        if actor_id is not None:
+            filters.append(CollectionFilter("actor_id", [actor_id]))
+        return await list_page(
+            audit_log_service, filters, schema_type=AuditEntry, count_mode="estimated"
+        )
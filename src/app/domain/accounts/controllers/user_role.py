@@ -0,0 +1,86 @@
+"""User Role Controllers."""
+
+from __future__ import annotations
+
+from litestar import Controller, post
+from litestar.di import Provide
+from litestar.exceptions import ValidationException
+from litestar.params import Parameter
+
+from src.app.domain.accounts import urls
+from src.app.domain.accounts.cache import invalidate_users_cache
+from src.app.domain.accounts.dependencies import provide_user_roles_service
+from src.app.domain.accounts.guards import requires_superuser
+from src.app.domain.accounts.schemas import (
+    UserRoleAdd,
+    UserRoleChange,
+    UserRoleRevoke,
+)
+from src.app.domain.accounts.services import UserRoleService
+
+
+class UserRoleController(Controller):
+    """Handles the adding and removing of User Role records."""
+
+    tags = ["User Account Roles"]
+    guards = [requires_superuser]
+    dependencies = {"user_roles_service": Provide(provide_user_roles_service)}
+    signature_namespace = {"UserRoleService": UserRoleService}
+
+    @post(
+        operation_id="AssignUserRole",
+        name="users:assign-role",
+        path=urls.ACCOUNT_ASSIGN_ROLE,
+        summary="Assign a role to users",
+        description="Users already having the role are left unchanged.",
+        cache_control=None,
+        status_code=200,
+        after_response=invalidate_users_cache,
+    )
+    async def assign_role(
+        self,
+        user_roles_service: UserRoleService,
+        data: UserRoleAdd,
+        role_slug: str = Parameter(
+            title="Role Slug",
+            description="The role to grant.",
+        ),
+    ) -> UserRoleChange:
+        """Assign a role to one or many users."""
+        emails = _get_emails(data)
+        role_id = await user_roles_service.get_role_id(role_slug)
+        matched, affected = await user_roles_service.assign_role(role_id, emails)
+        return UserRoleChange(role_slug=role_slug, matched=matched, affected=affected)
+
+    @post(
+        operation_id="RevokeUserRole",
+        name="users:revoke-role",
+        path=urls.ACCOUNT_REVOKE_ROLE,
+        summary="Revoke a role from users",
+        description="Users not having the role are left unchanged.",
+        cache_control=None,
+        status_code=200,
+        after_response=invalidate_users_cache,
+    )
+    async def revoke_role(
+        self,
+        user_roles_service: UserRoleService,
+        data: UserRoleRevoke,
+        role_slug: str = Parameter(
+            title="Role Slug",
+            description="The role to revoke.",
+        ),
+    ) -> UserRoleChange:
+        """Revoke a role from one or many users."""
+        emails = _get_emails(data)
+        role_id = await user_roles_service.get_role_id(role_slug)
+        matched, affected = await user_roles_service.revoke_role(role_id, emails)
+        return UserRoleChange(role_slug=role_slug, matched=matched, affected=affected)
+
+
+def _get_emails(data: UserRoleAdd) -> list[str]:
+    emails = data.emails
+    if not emails:
+        msg = "userName or userNames is required"
+        raise ValidationException(msg)
+    return emails
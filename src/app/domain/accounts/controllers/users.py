@@ -4,21 +4,42 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Annotated
 
-from litestar import Controller, delete, get, patch, post
+from litestar import Controller, Request, delete, get, patch, post
 from litestar.di import Provide
 from litestar.params import Dependency, Parameter
+from litestar.response import Stream
 
+from src.app.config import constants
 from src.app.domain.accounts import urls
+from src.app.domain.accounts.autocomplete import (
+    MAX_AUTOCOMPLETE_RESULTS,
+    ensure_user_index,
+    user_index,
+)
+from src.app.domain.accounts.cache import invalidate_users_cache
 from src.app.domain.accounts.dependencies import provide_users_service
+from src.app.domain.accounts.export import (
+    ExportFormat,
+    build_export_statement,
+    stream_users,
+)
 from src.app.domain.accounts.guards import requires_superuser
-from src.app.domain.accounts.schemas import User, UserCreate, UserUpdate
+from src.app.domain.accounts.importer import ImportFormat, import_users
+from src.app.domain.accounts.schemas import (
+    ImportReport,
+    User,
+    UserCreate,
+    UserSuggestion,
+    UserUpdate,
+)
 from src.app.domain.accounts.services import UserService
+from src.app.lib.dependencies import provide_ranked_search_filter
+from src.app.lib.pagination import CountMode, Pagination, list_page
 
 if TYPE_CHECKING:
     from uuid import UUID
 
     from advanced_alchemy.filters import FilterTypes
-    from advanced_alchemy.service import OffsetPagination
 
 
 class UserController(Controller):
@@ -26,7 +47,10 @@ class UserController(Controller):
 
     tags = ["User Accounts"]
     guards = [requires_superuser]
-    dependencies = {"users_service": Provide(provide_users_service)}
+    dependencies = {
+        "users_service": Provide(provide_users_service),
+        "search_filter": Provide(provide_ranked_search_filter, sync_to_thread=False),
+    }
     signature_namespace = {"UserService": UserService}
     dto = None
     return_dto = None
@@ -38,23 +62,95 @@ class UserController(Controller):
         description="Retrieve the users.",
         path=urls.ACCOUNT_LIST,
         cache=60,
+        opt={
+            constants.CACHE_TAGS_OPT_KEY: [constants.USERS_CACHE_TAG],
+            constants.USER_LOAD_PROFILE_OPT_KEY: "full",
+        },
     )
     async def list_users(
         self,
         users_service: UserService,
         filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)],
-    ) -> OffsetPagination[User]:
+        count_mode: CountMode,
+    ) -> Pagination[User]:
         """List users."""
-        results, total = await users_service.list_and_count(*filters)
-        return users_service.to_schema(
-            data=results, total=total, schema_type=User, filters=filters
+        return await list_page(
+            users_service, filters, schema_type=User, count_mode=count_mode
         )
 
+    @get(
+        operation_id="AutocompleteUsers",
+        name="users:autocomplete",
+        summary="Autocomplete Users",
+        description="Users whose email, name or a word of the name starts with the prefix.",
+        path=urls.ACCOUNT_AUTOCOMPLETE,
+    )
+    async def autocomplete_users(
+        self,
+        prefix: Annotated[str, Parameter(query="prefix", min_length=1, max_length=255)],
+        limit: Annotated[
+            int, Parameter(query="limit", ge=1, le=MAX_AUTOCOMPLETE_RESULTS)
+        ] = 10,
+    ) -> list[UserSuggestion]:
+        """Look up users in the in-process prefix index."""
+        await ensure_user_index()
+        return [
+            UserSuggestion(id=user_id, email=email, name=name)
+            for user_id, email, name in user_index.search(prefix, limit)
+        ]
+
+    @get(
+        operation_id="ExportUsers",
+        name="users:export",
+        summary="Export Users",
+        description="Stream the users matching the filters as NDJSON or CSV.",
+        path=urls.ACCOUNT_EXPORT,
+    )
+    async def export_users(
+        self,
+        filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)],
+        export_format: Annotated[
+            ExportFormat, Parameter(query="format", title="Export format")
+        ] = "ndjson",
+        include_roles: Annotated[
+            bool, Parameter(query="includeRoles", title="Include role slugs")
+        ] = False,
+    ) -> Stream:
+        """Export users without pagination."""
+        statement = build_export_statement(filters, include_roles=include_roles)
+        return Stream(
+            stream_users(statement, export_format, include_roles=include_roles),
+            media_type="text/csv" if export_format == "csv" else "application/x-ndjson",
+            headers={
+                "Content-Disposition": f'attachment; filename="users.{export_format}"'
+            },
+        )
+
+    @post(
+        operation_id="ImportUsers",
+        name="users:import",
+        summary="Import Users",
+        cache_control=None,
+        description="Create users in bulk from a CSV or NDJSON request body.",
+        path=urls.ACCOUNT_IMPORT,
+        after_response=invalidate_users_cache,
+    )
+    async def bulk_import_users(
+        self,
+        request: Request,
+        import_format: Annotated[
+            ImportFormat, Parameter(query="format", title="Import format")
+        ] = "ndjson",
+    ) -> ImportReport:
+        """Import users, the body is read as a stream."""
+        return await import_users(request.stream(), import_format)
+
     @get(
         operation_id="GetUser",
         name="users:get",
         path=urls.ACCOUNT_DETAIL,
         summary="Retrieve the details of a user.",
+        opt={constants.USER_LOAD_PROFILE_OPT_KEY: "profile"},
     )
     async def get_user(
         self,
@@ -78,6 +174,8 @@ class UserController(Controller):
         cache_control=None,
         description="A user who can login and use the system.",
         path=urls.ACCOUNT_CREATE,
+        after_response=invalidate_users_cache,
+        opt={constants.USER_LOAD_PROFILE_OPT_KEY: "profile"},
     )
     async def create_user(
         self,
@@ -92,6 +190,8 @@ class UserController(Controller):
         operation_id="UpdateUser",
         name="users:update",
         path=urls.ACCOUNT_UPDATE,
+        after_response=invalidate_users_cache,
+        opt={constants.USER_LOAD_PROFILE_OPT_KEY: "profile"},
     )
     async def update_user(
         self,
@@ -112,6 +212,7 @@ class UserController(Controller):
         path=urls.ACCOUNT_DELETE,
         summary="Remove User",
         description="Removes a user and all associated data from the system.",
+        after_response=invalidate_users_cache,
     )
     async def delete_user(
         self,
@@ -2,22 +2,55 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, Literal
 
 from sqlalchemy.orm import joinedload, selectinload
 
+from src.app.config import constants
 from src.app.db.models import Role
 from src.app.db.models import User as UserModel
 from src.app.db.models import UserRole
-from src.app.domain.accounts.services import RoleService, UserRoleService, UserService
+from src.app.domain.accounts.services import (
+    AuditLogService,
+    RoleService,
+    UserRoleService,
+    UserService,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, AsyncIterator
 
+    from advanced_alchemy.repository._util import LoadSpec
     from litestar.connection import Request
     from litestar.security.jwt import Token
     from sqlalchemy.ext.asyncio import AsyncSession
 
+UserLoadProfile = Literal["minimal", "auth", "profile", "full"]
+"""Relationships loaded with users, see `USER_LOAD_PROFILES`."""
+
+_ROLE = joinedload(UserRole.role, innerjoin=True)
+
+USER_LOAD_PROFILES: dict[UserLoadProfile, LoadSpec] = {
+    # columns only: writes, deletes and password checks
+    "minimal": [],
+    # role slugs read by token claims, in the user query
+    "auth": [joinedload(UserModel.roles).options(_ROLE)],
+    # single user serialized with the `User` schema, and the cached principal
+    # which `/me` serializes: both collections are joined in the user query
+    "profile": [
+        joinedload(UserModel.roles).options(_ROLE),
+        joinedload(UserModel.oauth_accounts),
+    ],
+    # pages of users serialized with the `User` schema, collections are
+    # loaded in one extra query per relationship instead of joined rows
+    "full": [
+        selectinload(UserModel.roles).options(_ROLE),
+        selectinload(UserModel.oauth_accounts),
+    ],
+}
+"""Loader options of every user load profile."""
+
 
 async def provide_user(
     request: Request[UserModel, Token, Any],
@@ -33,19 +66,42 @@ async def provide_user(
     return request.user
 
 
+@asynccontextmanager
+async def users_service_for(
+    db_session: AsyncSession, load_profile: UserLoadProfile
+) -> AsyncIterator[UserService]:
+    """Construct a user service loading the relationships of `load_profile`.
+
+    Args:
+        db_session: The database session.
+        load_profile: Relationships loaded with the users.
+
+    Yields:
+        UserService: A user service object.
+    """
+    async with UserService.new(
+        session=db_session, load=USER_LOAD_PROFILES[load_profile]
+    ) as service:
+        yield service
+
+
 async def provide_users_service(
     db_session: AsyncSession,
+    request: Request,
 ) -> AsyncGenerator[UserService, None]:
-    """Construct repository and service objects for the request."""
-    async with UserService.new(
-        session=db_session,
-        load=[
-            selectinload(UserModel.roles).options(
-                joinedload(UserRole.role, innerjoin=True)
-            ),
-            selectinload(UserModel.oauth_accounts),
-        ],
-    ) as service:
+    """Construct repository and service objects for the request.
+
+    The load profile is read from the `user_load_profile` opt of the route
+    handler and defaults to `minimal`. The authenticated user, if any, is the
+    actor audited with the changes.
+    """
+    load_profile: UserLoadProfile = request.route_handler.opt.get(
+        constants.USER_LOAD_PROFILE_OPT_KEY, "minimal"
+    )
+    async with users_service_for(db_session, load_profile) as service:
+        # `request.user` raises on the routes excluded from authentication
+        if (user := request.scope.get("user")) is not None:
+            service.actor_id = user.id
         yield service
 
 
@@ -71,16 +127,38 @@ async def provide_roles_service(
 
 async def provide_user_roles_service(
     db_session: AsyncSession | None = None,
+    request: Request | None = None,
 ) -> AsyncGenerator[UserRoleService, None]:
     """Provide user roles service.
 
     Args:
         db_session (AsyncSession | None, optional): current database session. Defaults to None.
+        request (Request | None, optional): current request, its authenticated
+            user is the actor audited with the changes. Defaults to None.
 
     Returns:
         UserRoleService: A user role service object
     """
     async with UserRoleService.new(
         session=db_session,
+    ) as service:
+        if request is not None and (user := request.scope.get("user")) is not None:
+            service.actor_id = user.id
+        yield service
+
+
+async def provide_audit_log_service(
+    db_session: AsyncSession | None = None,
+) -> AsyncGenerator[AuditLogService, None]:
+    """Provide audit log service.
+
+    Args:
+        db_session (AsyncSession | None, optional): current database session. Defaults to None.
+
+    Returns:
+        AuditLogService: An audit log service object
+    """
+    async with AuditLogService.new(
+        session=db_session,
     ) as service:
         yield service
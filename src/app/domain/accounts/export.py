@@ -0,0 +1,128 @@
+"""Streaming export of user accounts."""
+
+from __future__ import annotations
+
+import csv
+import io
+from typing import TYPE_CHECKING, Any, Literal
+
+import msgspec
+from advanced_alchemy.filters import PaginationFilter
+from sqlalchemy import func, select
+
+from src.app.config.app import alchemy
+from src.app.db.models import Role, User, UserRole
+from src.app.lib.read_replica import mark_read_only
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from sqlalchemy import Select
+
+__all__ = (
+    "EXPORT_BATCH_SIZE",
+    "EXPORT_FIELDS",
+    "ExportFormat",
+    "build_export_statement",
+    "stream_users",
+)
+
+ExportFormat = Literal["ndjson", "csv"]
+EXPORT_BATCH_SIZE = 500
+"""Number of rows fetched from the server side cursor at once."""
+EXPORT_FIELDS = (
+    "id",
+    "email",
+    "name",
+    "isActive",
+    "isSuperuser",
+    "isVerified",
+    "createdAt",
+    "updatedAt",
+)
+"""Exported columns, named like the fields of the `User` schema."""
+
+
+def build_export_statement(
+    filters: Sequence[Any], include_roles: bool = False
+) -> Select[Any]:
+    """Select the exported columns of the users matching `filters`.
+
+    Only plain columns are selected, no ORM instance is built.
+
+    Args:
+        filters: Collection filters, pagination filters are ignored.
+        include_roles: Add the comma separated role slugs of every user.
+
+    Returns:
+        Select[Any]: The export statement.
+    """
+    columns: list[Any] = [
+        User.id,
+        User.email,
+        User.name,
+        User.is_active,
+        User.is_superuser,
+        User.is_verified,
+        User.created_at,
+        User.updated_at,
+    ]
+    if include_roles:
+        columns.append(
+            select(func.aggregate_strings(Role.slug, ","))
+            .join(UserRole, UserRole.role_id == Role.id)
+            .where(UserRole.user_id == User.id)
+            .scalar_subquery()
+            .label("roles")
+        )
+    statement = select(*columns)
+    for filter_ in filters:
+        if not isinstance(filter_, PaginationFilter):
+            statement = filter_.append_to_statement(statement, User)
+    return statement
+
+
+def _to_record(row: Any, include_roles: bool) -> dict[str, Any]:
+    record = dict(zip(EXPORT_FIELDS, row, strict=False))
+    if include_roles:
+        record["roles"] = row.roles.split(",") if row.roles else []
+    return record
+
+
+async def stream_users(
+    statement: Select[Any], export_format: ExportFormat, include_roles: bool = False
+) -> AsyncIterator[bytes]:
+    """Stream the rows selected by `statement`.
+
+    The rows are read from a server side cursor in a dedicated session, so the
+    memory usage does not depend on the number of exported users.
+
+    Args:
+        statement: Statement built by :func:`build_export_statement`.
+        export_format: `ndjson` (one JSON object per line) or `csv`.
+        include_roles: Whether `statement` selects the role slugs.
+
+    Yields:
+        bytes: Encoded rows, one chunk per fetched batch.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow((*EXPORT_FIELDS, "roles") if include_roles else EXPORT_FIELDS)
+        yield buffer.getvalue().encode()
+    async with alchemy.get_session() as db_session:
+        mark_read_only(db_session)
+        result = await db_session.stream(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            if export_format == "ndjson":
+                yield b"".join(
+                    msgspec.json.encode(_to_record(row, include_roles)) + b"\n"
+                    for row in rows
+                )
+                continue
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(msgspec.to_builtins(tuple(row)) for row in rows)
+            yield buffer.getvalue().encode()
@@ -1,21 +1,28 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
+from uuid import UUID
 
 from litestar.exceptions import PermissionDeniedException
 from litestar.security.jwt import OAuth2PasswordBearerAuth
+from sqlalchemy import inspect
 
 from src.app.config import constants
 from src.app.config.app import alchemy
 from src.app.config.base import get_settings
 from src.app.db.models import User
 from src.app.domain.accounts import urls
-from src.app.domain.accounts.dependencies import provide_users_service
+from src.app.domain.accounts.cache import principal_cache
+from src.app.domain.accounts.dependencies import users_service_for
+from src.app.lib.read_replica import reading_from_replica
 
 if TYPE_CHECKING:
+    from litestar import Response
     from litestar.connection import ASGIConnection
     from litestar.handlers.base import BaseRouteHandler
-    from litestar.security.jwt import Token
+    from litestar.security.jwt import OAuth2Login, Token
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 
 __all__ = (
@@ -23,6 +30,8 @@ __all__ = (
     "requires_active_user",
     "requires_verified_user",
     "current_user_from_token",
+    "create_login_response",
+    "is_token_principal",
     "auth",
 )
 
@@ -84,12 +93,85 @@ def requires_verified_user(connection: ASGIConnection, _: BaseRouteHandler) -> N
     raise PermissionDeniedException(detail="User account is not verified.")
 
 
+def get_token_claims(user: User) -> dict[str, Any]:
+    """Authorization claims embedded in stateless tokens.
+
+    Args:
+        user (User): The authenticated user.
+
+    Returns:
+        dict[str, Any]: Token extras.
+    """
+    return {
+        "uid": str(user.id),
+        "is_active": user.is_active,
+        "is_superuser": user.is_superuser,
+        "is_verified": user.is_verified,
+    }
+
+
+def create_login_response(user: User) -> Response[OAuth2Login]:
+    """Issue the access token of an authenticated user.
+
+    In stateless mode the token is short-lived and carries the authorization
+    claims of the user.
+
+    Args:
+        user (User): The authenticated user.
+
+    Returns:
+        Response[OAuth2Login]: Login response setting the token.
+    """
+    if not settings.security.STATELESS_AUTH:
+        return auth.login(user.email)
+    return auth.login(
+        user.email,
+        token_extras=get_token_claims(user),
+        token_expiration=timedelta(
+            seconds=settings.security.STATELESS_TOKEN_EXPIRATION
+        ),
+    )
+
+
+def is_token_principal(user: User) -> bool:
+    """Whether the user was built from token claims instead of the database."""
+    return inspect(user).transient
+
+
+def _is_stateless_token(token: Token) -> bool:
+    return settings.security.STATELESS_AUTH and "uid" in token.extras
+
+
+def _user_from_claims(token: Token) -> User | None:
+    claims = token.extras
+    if not claims.get("is_active"):
+        return None
+    return User(
+        id=UUID(claims["uid"]),
+        email=token.sub,
+        is_active=True,
+        is_superuser=bool(claims.get("is_superuser")),
+        is_verified=bool(claims.get("is_verified")),
+    )
+
+
+async def _get_active_user(db_session: AsyncSession, email: str) -> User | None:
+    async with users_service_for(db_session, "profile") as service:
+        with reading_from_replica(db_session):
+            user = await service.get_one_or_none(email=email)
+    return user if user and user.is_active else None
+
+
 async def current_user_from_token(
     token: Token, connection: ASGIConnection[Any, Any, Any, Any]
 ) -> User | None:
     """Lookup current user from local JWT token.
 
-    Fetches the user information from the database
+    Fetches the user information from the database, or from the principal
+    cache. Cached users are loaded in their own session and merged into the
+    request session without emitting any SQL. Stateless tokens are resolved
+    from their claims alone. The lookup reads from the replica when one is
+    configured, whatever the request method.
 
 
     Args:
@@ -100,13 +182,21 @@ async def current_user_from_token(
     Returns:
         User: User record mapped to the JWT identifier
     """
-    service = await anext(
-        provide_users_service(
-            alchemy.provide_session(connection.app.state, connection.scope)
-        )
-    )
-    user = await service.get_one_or_none(email=token.sub)
-    return user if user and user.is_active else None
+    if _is_stateless_token(token):
+        return _user_from_claims(token)
+
+    db_session = alchemy.provide_session(connection.app.state, connection.scope)
+    if not principal_cache.enabled:
+        return await _get_active_user(db_session, token.sub)
+
+    user = principal_cache.get(token.sub)
+    if user is None:
+        async with alchemy.get_session() as cache_session:
+            user = await _get_active_user(cache_session, token.sub)
+        if user is None:
+            return None
+        principal_cache.set(token.sub, user)
+    return await db_session.merge(user, load=False)
 
 
 auth = OAuth2PasswordBearerAuth[User](
@@ -0,0 +1,325 @@
+"""Bulk import of user accounts."""
+
+from __future__ import annotations
+
+import csv
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, Literal
+from uuid import uuid4
+
+import msgspec
+from advanced_alchemy.utils.text import slugify
+from sqlalchemy import column, insert, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.app.config import constants
+from src.app.config.app import alchemy
+from src.app.db.models import Role, User, UserRole
+from src.app.domain.accounts.autocomplete import index_user
+from src.app.domain.accounts.schemas import ImportReport, ImportRowError, UserImport
+from src.app.lib import crypt
+from src.app.lib.exceptions import ServiceUnavailableError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator
+    from uuid import UUID
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.app.lib.crypt import PasswordHashingPool
+
+__all__ = (
+    "IMPORT_BATCH_SIZE",
+    "ImportFormat",
+    "import_users",
+    "iter_records",
+)
+
+ImportFormat = Literal["ndjson", "csv"]
+IMPORT_BATCH_SIZE = 500
+"""Number of users hashed in parallel and inserted per transaction."""
+
+
+def _camelize(key: str) -> str:
+    first, *rest = key.strip().split("_")
+    return first + "".join(word.capitalize() for word in rest)
+
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line
+    if buffer:
+        yield line_no + 1, buffer
+
+
+async def iter_records(
+    chunks: AsyncIterable[bytes], import_format: ImportFormat
+) -> AsyncIterator[tuple[int, UserImport | str]]:
+    """Parse an import stream one line at a time.
+
+    Column and key names may be camel case (as exported) or snake case. CSV
+    values must not contain line breaks.
+
+    Args:
+        chunks: Raw bytes of the import.
+        import_format: `ndjson` (one JSON object per line) or `csv` with a header.
+
+    Yields:
+        tuple[int, UserImport | str]: Line number and the parsed row, or the
+            reason the line was rejected.
+    """
+    header: list[str] | None = None
+    async for line_no, raw in _iter_lines(chunks):
+        try:
+            line = raw.decode("utf-8-sig").rstrip("\r")
+            if not line.strip():
+                continue
+            if import_format == "csv":
+                values = next(csv.reader([line]))
+                if header is None:
+                    header = [_camelize(value) for value in values]
+                    continue
+                data = {k: v for k, v in zip(header, values, strict=False) if v != ""}
+            else:
+                data = {
+                    _camelize(k): v
+                    for k, v in msgspec.json.decode(line, type=dict[str, Any]).items()
+                    if v is not None
+                }
+            record = msgspec.convert(data, UserImport, strict=False)
+        except (UnicodeDecodeError, csv.Error, msgspec.MsgspecError) as exc:
+            yield line_no, str(exc)
+            continue
+        yield line_no, record
+
+
+def _reject(
+    report: ImportReport, line: int, error: str, email: str | None = None
+) -> None:
+    report.failed += 1
+    report.errors.append(ImportRowError(line=line, error=error, email=email))
+
+
+async def _insert(
+    db_session: AsyncSession,
+    users: list[dict[str, Any]],
+    user_roles: list[dict[str, Any]],
+) -> set[UUID]:
+    """Insert the rows, skipping the users whose email already exists.
+
+    Users are copied into a staging table on PostgreSQL, then moved with
+    ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``. On SQLite they are
+    inserted with executemany and ``ON CONFLICT DO NOTHING``, other databases
+    reject the whole batch on a conflict. The roles of the skipped users are
+    not inserted.
+
+    Returns:
+        set[UUID]: The primary keys of the inserted users.
+    """
+    user_table = User.__table__
+    dialect = db_session.get_bind().dialect.name
+    if dialect != "postgresql":
+        if dialect == "sqlite":
+            inserted = set(
+                await db_session.scalars(
+                    sqlite_insert(user_table)
+                    .on_conflict_do_nothing(index_elements=["email"])
+                    .returning(user_table.c.id),
+                    users,
+                )
+            )
+        else:
+            await db_session.execute(insert(user_table), users)
+            inserted = {user["id"] for user in users}
+        user_roles = [row for row in user_roles if row["user_id"] in inserted]
+        if user_roles:
+            await db_session.execute(insert(UserRole.__table__), user_roles)
+        return inserted
+    connection = await db_session.connection()
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+    columns = list(users[0])
+    staging = f"{User.__tablename__}_import"
+    await connection.execute(
+        text(
+            f"CREATE TEMPORARY TABLE {staging} "
+            f"(LIKE {User.__tablename__} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+    )
+    await driver_connection.copy_records_to_table(
+        staging,
+        records=[tuple(row[column] for column in columns) for row in users],
+        columns=columns,
+    )
+    staged = table(staging, *(column(name) for name in columns))
+    inserted = set(
+        await db_session.scalars(
+            pg_insert(user_table)
+            .from_select(columns, select(*staged.c))
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(user_table.c.id)
+        )
+    )
+    user_roles = [row for row in user_roles if row["user_id"] in inserted]
+    if user_roles:
+        columns = list(user_roles[0])
+        await driver_connection.copy_records_to_table(
+            UserRole.__tablename__,
+            records=[tuple(row[column] for column in columns) for row in user_roles],
+            columns=columns,
+        )
+    return inserted
+
+
+async def _import_batch(
+    db_session: AsyncSession,
+    batch: list[tuple[int, UserImport]],
+    role_id: UUID | None,
+    report: ImportReport,
+    pool: PasswordHashingPool | None,
+) -> None:
+    existing = set(
+        await db_session.scalars(
+            select(User.email).where(User.email.in_([r.email for _, r in batch]))
+        )
+    )
+    for line, record in batch:
+        if record.email in existing:
+            _reject(report, line, "A user with this email already exists", record.email)
+    batch = [(line, record) for line, record in batch if record.email not in existing]
+    if not batch:
+        return
+    try:
+        hashes = iter(
+            await crypt.get_password_hashes(
+                [r.password for _, r in batch if r.hashed_password is None],  # type: ignore[misc]
+                pool=pool,
+            )
+        )
+    except ServiceUnavailableError as exc:
+        for line, record in batch:
+            _reject(report, line, exc.detail, record.email)
+        return
+
+    now = datetime.now(UTC)
+    users: list[dict[str, Any]] = []
+    user_roles: list[dict[str, Any]] = []
+    for _, record in batch:
+        user_id = uuid4()
+        users.append(
+            {
+                "id": user_id,
+                "email": record.email,
+                "name": record.name,
+                "hashed_password": record.hashed_password or next(hashes),
+                "avatar_url": record.avatar_url,
+                # same rule as `UserService.create`
+                "is_superuser": record.is_superuser or "admin" in record.email,
+                "is_active": record.is_active,
+                "is_verified": record.is_verified,
+                "joined_at": now.date(),
+                "login_count": 0,
+                "last_login_at": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        if role_id is not None:
+            user_roles.append(
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "role_id": role_id,
+                    "assigned_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+    try:
+        inserted = await _insert(db_session, users, user_roles)
+        for user in users:
+            if user["id"] in inserted:
+                index_user(db_session, user["id"], user["email"], user["name"])
+        await db_session.commit()
+    except SQLAlchemyError as exc:
+        await db_session.rollback()
+        for line, record in batch:
+            _reject(
+                report,
+                line,
+                f"Batch insert failed: {exc.__class__.__name__}",
+                record.email,
+            )
+        return
+    # inserted meanwhile, by another writer or by an earlier row of the import
+    for (line, record), user in zip(batch, users, strict=True):
+        if user["id"] not in inserted:
+            _reject(report, line, "A user with this email already exists", record.email)
+    report.imported += len(inserted)
+
+
+async def import_users(
+    chunks: AsyncIterable[bytes],
+    import_format: ImportFormat,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    pool: PasswordHashingPool | None = None,
+) -> ImportReport:
+    """Create users from a CSV or NDJSON stream.
+
+    Passwords of a batch are hashed in parallel on the bulk hashing pool, rows
+    carrying an argon2 `hashedPassword` are stored as is. Every batch is
+    inserted and committed on its own, the default role is assigned to every
+    imported user. Rows whose email already exists, including the emails of
+    earlier rows, are rejected on their own. No `user_created` event is
+    recorded.
+
+    Args:
+        chunks: Raw bytes of the import.
+        import_format: `ndjson` or `csv`.
+        batch_size: Number of users per transaction.
+        pool: Pool hashing the passwords, defaults to the bulk hashing pool.
+
+    Returns:
+        ImportReport: Counters, rejected rows and throughput.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    batch: list[tuple[int, UserImport]] = []
+    async with alchemy.get_session() as db_session:
+        role_id = await db_session.scalar(
+            select(Role.id).where(Role.slug == slugify(constants.DEFAULT_USER_ROLE))
+        )
+        async for line, record in iter_records(chunks, import_format):
+            report.total += 1
+            if isinstance(record, str):
+                _reject(report, line, record)
+                continue
+            if record.hashed_password is not None:
+                if not crypt.is_password_hash(record.hashed_password):
+                    _reject(report, line, "Unsupported password hash", record.email)
+                    continue
+            elif not record.password:
+                _reject(
+                    report,
+                    line,
+                    "A password or hashedPassword is required",
+                    record.email,
+                )
+                continue
+            batch.append((line, record))
+            if len(batch) >= batch_size:
+                await _import_batch(db_session, batch, role_id, report, pool)
+                batch = []
+        if batch:
+            await _import_batch(db_session, batch, role_id, report, pool)
+    report.duration = round(time.perf_counter() - started, 3)
+    if report.duration:
+        report.rows_per_second = round(report.imported / report.duration, 1)
+    return report
@@ -0,0 +1,21 @@
+"""Background tasks of the account domain, run by `litestar workers run`."""
+
+from __future__ import annotations
+
+import structlog
+
+from src.app.lib.jobs import task
+
+logger = structlog.get_logger()
+
+
+@task("user_created")
+async def user_created(user_id: str, email: str, name: str | None) -> None:
+    """Post signup flow of a new user.
+
+    Args:
+        user_id: The primary key of the user that was created.
+        email: Email of the user.
+        name: Name of the user.
+    """
+    await logger.ainfo("Running post signup flow.", id=user_id, email=email, name=name)
@@ -0,0 +1,179 @@
+"""Login statistics written behind the logins.
+
+:meth:`UserService.authenticate` records every successful login in
+:data:`login_stats`, in memory. The logins of a user are coalesced into a
+count and the time of the latest one, and written every
+`LOGIN_STATS_FLUSH_INTERVAL` seconds, or once `LOGIN_STATS_FLUSH_SIZE` logins
+are pending, with a single statement executed for all the pending users.
+The pending statistics are written on shutdown too.
+
+Statistics of a worker which dies are lost, those of a failed write are kept
+for the next one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from sqlalchemy import bindparam, update
+
+from src.app.config.app import alchemy
+from src.app.config.base import get_settings
+from src.app.db.models import User
+from src.app.lib import metrics
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from contextlib import AbstractAsyncContextManager
+    from uuid import UUID
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+__all__ = (
+    "LoginStatsRecorder",
+    "login_stats",
+)
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+_user_table = User.__table__
+_increment_logins = (
+    update(_user_table)
+    .where(_user_table.c.id == bindparam("b_id"))
+    .values(
+        login_count=_user_table.c.login_count + bindparam("b_logins"),
+        last_login_at=bindparam("b_last_login_at"),
+    )
+)
+
+
+class LoginStatsRecorder:
+    """Coalesce the logins of the users and write them in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+        flush_interval: float = 5.0,
+        flush_size: int = 500,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._pending: dict[UUID, tuple[int, datetime]] = {}
+        self._pending_logins = 0
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._flushing: set[asyncio.Task[Any]] = set()
+        self._recorded = 0
+        self._written = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Logins recorded and written, pending users and logins."""
+        return {
+            "recorded": self._recorded,
+            "written": self._written,
+            "pending_users": len(self._pending),
+            "pending_logins": self._pending_logins,
+            "flushes": self._flushes,
+            "failed_flushes": self._failed_flushes,
+        }
+
+    def record(self, user_id: UUID, at: datetime | None = None) -> None:
+        """Record a login of `user_id`, without any statement.
+
+        Args:
+            user_id: The primary key of the user.
+            at: Time of the login, now by default.
+        """
+        at = at or datetime.now(UTC)
+        logins, last_login_at = self._pending.get(user_id, (0, at))
+        self._pending[user_id] = (logins + 1, max(at, last_login_at))
+        self._pending_logins += 1
+        self._recorded += 1
+        if self._pending_logins >= self.flush_size and not self._flushing:
+            flushing = asyncio.create_task(self.flush())
+            self._flushing.add(flushing)
+            flushing.add_done_callback(self._flushing.discard)
+
+    async def flush(self) -> int:
+        """Write the pending statistics.
+
+        Returns:
+            int: Number of users written.
+        """
+        async with self._lock:
+            if not self._pending:
+                return 0
+            pending, logins = self._pending, self._pending_logins
+            self._pending, self._pending_logins = {}, 0
+            try:
+                async with self.session_factory() as session, session.begin():
+                    await session.execute(
+                        _increment_logins,
+                        [
+                            {
+                                "b_id": user_id,
+                                "b_logins": count,
+                                "b_last_login_at": last_login_at,
+                            }
+                            for user_id, (count, last_login_at) in pending.items()
+                        ],
+                    )
+            except Exception:  # noqa: BLE001
+                self._failed_flushes += 1
+                for user_id, (count, last_login_at) in pending.items():
+                    newer, latest = self._pending.get(user_id, (0, last_login_at))
+                    self._pending[user_id] = (
+                        count + newer,
+                        max(last_login_at, latest),
+                    )
+                self._pending_logins += logins
+                await logger.aexception(
+                    "Could not write the login statistics", users=len(pending)
+                )
+                return 0
+            self._flushes += 1
+            self._written += logins
+            return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # a cancellation must not drop the statistics being written
+            await asyncio.shield(self.flush())
+
+    async def start(self) -> None:
+        """`on_startup` hook writing the statistics periodically."""
+        self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        """`on_shutdown` hook writing the pending statistics."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._flushing:
+            await asyncio.wait(set(self._flushing))
+        await self.flush()
+
+    def clear(self) -> None:
+        """Drop the pending statistics."""
+        self._pending.clear()
+        self._pending_logins = 0
+
+
+login_stats = LoginStatsRecorder(
+    alchemy.get_session,
+    flush_interval=settings.security.LOGIN_STATS_FLUSH_INTERVAL,
+    flush_size=settings.security.LOGIN_STATS_FLUSH_SIZE,
+)
+"""Logins of this worker not written yet."""
+metrics.register_collector("login_stats", login_stats.stats)
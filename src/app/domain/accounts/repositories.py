@@ -1,17 +1,57 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from advanced_alchemy.repository import (
     SQLAlchemyAsyncRepository,
     SQLAlchemyAsyncSlugRepository,
 )
+from sqlalchemy import select
+
+from src.app.db.models import AuditLog, Role, User, UserRole
 
-from src.app.db.models import Role, User, UserRole
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 
 class UserRepository(SQLAlchemyAsyncRepository[User]):
     """User SQLAlchemy Repository."""
 
     model_type = User
+    # the `auth` and `profile` load profiles join the user collections
+    _uniquify_results = True
+
+    async def _refresh(
+        self,
+        instance: User,
+        auto_refresh: bool | None,
+        attribute_names: Iterable[str] | None = None,
+        with_for_update: bool | None = None,
+    ) -> None:
+        """Refresh `instance` with the relationships of the load profile.
+
+        `Session.refresh` leaves the `lazy="raise"` relationships unloaded, the
+        user is selected again with the loader options of the repository.
+        """
+        if auto_refresh is None:
+            auto_refresh = self.auto_refresh
+        if not auto_refresh or attribute_names or not self._default_loader_options:
+            return await super()._refresh(
+                instance,
+                auto_refresh=auto_refresh,
+                attribute_names=attribute_names,
+                with_for_update=with_for_update,
+            )
+        statement = (
+            select(User)
+            .where(User.id == instance.id)
+            .options(*self._default_loader_options)
+            .execution_options(populate_existing=True)
+        )
+        if with_for_update:
+            statement = statement.with_for_update()
+        (await self.session.execute(statement)).unique().one()
+        return None
 
 
 class RoleRepository(SQLAlchemyAsyncSlugRepository[Role]):
@@ -24,3 +64,9 @@ class UserRoleRepository(SQLAlchemyAsyncRepository[UserRole]):
     """User Role SQLAlchemy Repository."""
 
     model_type = UserRole
+
+
+class AuditLogRepository(SQLAlchemyAsyncRepository[AuditLog]):
+    """Audit Log SQLAlchemy Repository."""
+
+    model_type = AuditLog
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Annotated, Any
 from uuid import UUID
 
 import msgspec
 
+from src.app.config.constants import MAX_BULK_ROLE_USERS
 from src.app.lib.schema import CamelizedBaseStruct
 
 __all__ = (
     "AccountLogin",
     "AccountRegister",
+    "AuditEntry",
+    "ImportReport",
+    "ImportRowError",
+    "UserImport",
     "UserRoleAdd",
+    "UserRoleChange",
     "UserRoleRevoke",
     "UserCreate",
     "User",
+    "UserSuggestion",
     "UserRole",
     "UserUpdate",
 )
@@ -57,6 +65,27 @@ class User(CamelizedBaseStruct):
     oauth_accounts: list[OauthAccount] = []
 
 
+class AuditEntry(CamelizedBaseStruct):
+    """Change made to a user."""
+
+    id: UUID
+    actor_id: UUID | None
+    target_id: UUID
+    action: str
+    changed: list[str]
+    created_at: datetime
+    before: dict[str, Any] | None = None
+    after: dict[str, Any] | None = None
+
+
+class UserSuggestion(CamelizedBaseStruct):
+    """Autocomplete match."""
+
+    id: UUID
+    email: str
+    name: str | None = None
+
+
 class UserCreate(CamelizedBaseStruct):
     email: str
     password: str
@@ -67,6 +96,42 @@ class UserCreate(CamelizedBaseStruct):
     is_verified: bool = False
 
 
+class UserImport(CamelizedBaseStruct):
+    """A row of a bulk user import.
+
+    Either a plain `password` or an argon2 `hashed_password` is required.
+    """
+
+    email: str
+    password: str | None = None
+    hashed_password: str | None = None
+    name: str | None = None
+    avatar_url: str | None = None
+    is_superuser: bool = False
+    is_active: bool = True
+    is_verified: bool = False
+
+
+class ImportRowError(CamelizedBaseStruct):
+    """A rejected row of a bulk user import."""
+
+    line: int
+    error: str
+    email: str | None = None
+
+
+class ImportReport(CamelizedBaseStruct):
+    """Outcome of a bulk user import."""
+
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = []
+    duration: float = 0.0
+    """Seconds spent on the import."""
+    rows_per_second: float = 0.0
+
+
 class UserUpdate(CamelizedBaseStruct, omit_defaults=True):
     email: str | None | msgspec.UnsetType = msgspec.UNSET
     password: str | None | msgspec.UnsetType = msgspec.UNSET
@@ -88,12 +153,31 @@ class AccountRegister(CamelizedBaseStruct):
 
 
 class UserRoleAdd(CamelizedBaseStruct):
-    """User role add ."""
+    """User role add .
+
+    `user_name` and `user_names` hold user emails, at least one is required.
+    """
 
-    user_name: str
+    user_name: str | None = None
+    user_names: Annotated[list[str], msgspec.Meta(max_length=MAX_BULK_ROLE_USERS)] = []
 
+    @property
+    def emails(self) -> list[str]:
+        emails = list(self.user_names)
+        if self.user_name is not None:
+            emails.append(self.user_name)
+        return emails
 
-class UserRoleRevoke(CamelizedBaseStruct):
+
+class UserRoleRevoke(UserRoleAdd):
     """User role revoke ."""
 
-    user_name: str
+
+class UserRoleChange(CamelizedBaseStruct):
+    """Outcome of a role assignment or revocation."""
+
+    role_slug: str
+    matched: int
+    """Number of existing users among the requested ones."""
+    affected: int
+    """Number of memberships created or removed."""
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
 from advanced_alchemy.service.typing import (
@@ -13,21 +13,30 @@ from advanced_alchemy.service.typing import (
     is_msgspec_model,
     is_pydantic_model,
 )
-from litestar.exceptions import PermissionDeniedException
+from litestar.exceptions import NotFoundException, PermissionDeniedException
+from sqlalchemy import and_, delete, exists, func, insert, literal, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from src.app.config import constants
-from src.app.db.models import Role, User, UserRole
+from src.app.db.models import AuditLog, Role, User, UserRole
+from src.app.domain.accounts.audit import audit_trail, audit_user_change
+from src.app.domain.accounts.cache import invalidate_principal, invalidate_principals
+from src.app.domain.accounts.login_stats import login_stats
 from src.app.domain.accounts.repositories import (
+    AuditLogRepository,
     RoleRepository,
     UserRepository,
     UserRoleRepository,
 )
 from src.app.lib import crypt
+from src.app.lib.outbox import record_event
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable
 
     from advanced_alchemy.repository._util import LoadSpec
+    from sqlalchemy import ColumnElement
     from sqlalchemy.orm import InstrumentedAttribute
 
 
@@ -40,6 +49,8 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
     def __init__(self, **repo_kwargs: Any) -> None:
         self.repository: UserRepository = self.repository_type(**repo_kwargs)
         self.model_type = self.repository.model_type
+        self.actor_id: UUID | None = None
+        """User making the changes, audited with them. `None` for the system."""
 
     async def create(
         self,
@@ -58,6 +69,15 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
             self.append_role_if_exists(role_id, data.roles)
         if "admin" in data.email:
             data.is_superuser = True
+        # the key is generated at flush time, the event is written in the same one
+        data.id = data.id or uuid4()
+        record_event(
+            self.repository.session,
+            "user_created",
+            user_id=data.id,
+            email=data.email,
+            name=data.name,
+        )
         return await super().create(
             data=data,
             load=load,
@@ -81,10 +101,26 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
         auto_expunge: bool | None = None,
         auto_refresh: bool | None = None,
     ) -> User:
+        changed = sorted(attribute_names or ())
         if isinstance(data, dict):
             role_id: UUID | None = data.pop("role_id", None)
+            changed = sorted({*data, *(("roles",) if role_id else ())})
             data = await self.to_model(data, "update")
             self.append_role_if_exists(role_id, data.roles)
+        record_event(
+            self.repository.session,
+            "user_updated",
+            user_id=item_id or data.id,
+            changed=changed,
+        )
+        audit_user_change(
+            self.repository.session,
+            "update",
+            target_id=item_id or data.id,
+            actor_id=self.actor_id,
+            changed=changed,
+        )
+        invalidate_principal(self.repository.session, item_id or data.id)
 
         return await super().update(
             data=data,
@@ -99,6 +135,33 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
             execution_options=execution_options,
         )
 
+    async def delete(
+        self,
+        item_id: Any,
+        *,
+        id_attribute: str | InstrumentedAttribute[Any] | None = None,
+        load: LoadSpec | None = None,
+        execution_options: dict[str, Any] | None = None,
+        auto_commit: bool | None = None,
+        auto_expunge: bool | None = None,
+    ) -> User:
+        record_event(self.repository.session, "user_deleted", user_id=item_id)
+        audit_user_change(
+            self.repository.session,
+            "delete",
+            target_id=item_id,
+            actor_id=self.actor_id,
+        )
+        invalidate_principal(self.repository.session, item_id)
+        return await super().delete(
+            item_id=item_id,
+            id_attribute=id_attribute,
+            load=load,
+            execution_options=execution_options,
+            auto_commit=auto_commit,
+            auto_expunge=auto_expunge,
+        )
+
     def append_role_if_exists(
         self,
         role_id: UUID | None,
@@ -121,6 +184,9 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
     ) -> User:
         """Authenticate a user.
 
+        Hashes created with outdated argon2 parameters are transparently
+        replaced by a hash using the current ones.
+
         Args:
             username (str): _description_
             password (str | bytes): _description_
@@ -137,10 +203,11 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
             msg = "User not found or password invalid"
             raise PermissionDeniedException(msg)
 
-        if not await crypt.verify_password(
+        valid, new_hash = await crypt.verify_and_update_password(
             password,
             db_obj.hashed_password,
-        ):
+        )
+        if not valid:
             msg = "User not found or password invalid"
             raise PermissionDeniedException(msg)
 
@@ -148,6 +215,12 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
             msg = "User account is inactive"
             raise PermissionDeniedException(msg)
 
+        if new_hash is not None:
+            # The hash uses outdated argon2 parameters. No statement is issued
+            # here, the change is flushed with the session commit.
+            db_obj.hashed_password = new_hash
+        # written behind, with the other logins of the next few seconds
+        login_stats.record(db_obj.id)
         return db_obj
 
     async def update_password(
@@ -180,6 +253,20 @@ class UserService(SQLAlchemyAsyncRepositoryService[User]):
         db_obj.hashed_password = await crypt.get_password_hash(
             data["new_password"],
         )
+        record_event(
+            self.repository.session,
+            "user_updated",
+            user_id=db_obj.id,
+            changed=["password"],
+        )
+        audit_user_change(
+            self.repository.session,
+            "update_password",
+            target_id=db_obj.id,
+            actor_id=self.actor_id,
+            changed=["password"],
+        )
+        invalidate_principal(self.repository.session, db_obj.id)
         await self.repository.update(db_obj)
 
     async def to_model(
@@ -270,3 +357,249 @@ class UserRoleService(SQLAlchemyAsyncRepositoryService[UserRole]):
     """Handles database operations for user roles."""
 
     repository_type = UserRoleRepository
+
+    def __init__(self, **repo_kwargs: Any) -> None:
+        self.repository: UserRoleRepository = self.repository_type(**repo_kwargs)
+        self.model_type = self.repository.model_type
+        self.actor_id: UUID | None = None
+        """User making the changes, audited with them. `None` for the system."""
+
+    def _audit_role_changes(
+        self,
+        action: str,
+        user_ids: list[UUID],
+        *,
+        before: dict[str, Any] | None = None,
+        after: dict[str, Any] | None = None,
+    ) -> None:
+        for user_id in user_ids:
+            audit_user_change(
+                self.repository.session,
+                action,
+                target_id=user_id,
+                actor_id=self.actor_id,
+                changed=["roles"],
+                before=before,
+                after=after,
+            )
+
+    async def _insert_user_roles(
+        self, role_id: UUID, users: ColumnElement[bool]
+    ) -> list[UUID]:
+        """Link `role_id` to the users matching `users` in one statement.
+
+        Links created concurrently are skipped by the unique constraint on
+        the user and the role. Every link created is audited.
+
+        Returns:
+            list[UUID]: The primary keys of the users linked by this call.
+        """
+        session = self.repository.session
+        user, user_role = User.__table__, UserRole.__table__
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            new_id: Any = func.gen_random_uuid()
+            dialect_insert: Any = pg_insert
+        elif dialect == "sqlite":
+            new_id = func.randomblob(16)
+            dialect_insert = sqlite_insert
+        else:
+            user_ids = list(await session.scalars(select(user.c.id).where(users)))
+            if user_ids:
+                await session.execute(
+                    insert(user_role),
+                    [{"user_id": user_id, "role_id": role_id} for user_id in user_ids],
+                )
+            self._audit_role_changes(
+                "assign_role", user_ids, after={"role_id": str(role_id)}
+            )
+            invalidate_principals(session, user_ids)
+            return user_ids
+        now = literal(datetime.now(timezone.utc), user_role.c.assigned_at.type)
+        statement = (
+            dialect_insert(user_role)
+            .from_select(
+                ["id", "user_id", "role_id", "assigned_at", "created_at", "updated_at"],
+                select(
+                    new_id,
+                    user.c.id,
+                    literal(role_id, user_role.c.role_id.type),
+                    now,
+                    now,
+                    now,
+                ).where(users),
+                include_defaults=False,
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "role_id"])
+            .returning(user_role.c.user_id)
+        )
+        user_ids = list(await session.scalars(statement))
+        self._audit_role_changes(
+            "assign_role", user_ids, after={"role_id": str(role_id)}
+        )
+        invalidate_principals(session, user_ids)
+        return user_ids
+
+    def _missing_role_criteria(
+        self, role_id: UUID, only_active: bool
+    ) -> ColumnElement[bool]:
+        user, user_role = User.__table__, UserRole.__table__
+        has_role = exists().where(
+            and_(user_role.c.user_id == user.c.id, user_role.c.role_id == role_id)
+        )
+        return and_(user.c.is_active if only_active else true(), ~has_role)
+
+    async def count_missing_role(self, role_id: UUID, only_active: bool = True) -> int:
+        """Count the users an `assign_role_to_all` call would assign `role_id` to.
+
+        Args:
+            role_id: The role to assign.
+            only_active: Only consider active users.
+
+        Returns:
+            int: The number of users without the role.
+        """
+        statement = (
+            select(func.count())
+            .select_from(User.__table__)
+            .where(self._missing_role_criteria(role_id, only_active))
+        )
+        return (await self.repository.session.execute(statement)).scalar_one()
+
+    async def assign_role_to_all(
+        self,
+        role_id: UUID,
+        *,
+        only_active: bool = True,
+        batch_size: int = 10000,
+        on_progress: Callable[[int], None] | None = None,
+        auto_commit: bool = True,
+    ) -> int:
+        """Assign a role to every user missing it.
+
+        Users are processed in primary key ranges of `batch_size` rows, every
+        range is a single ``INSERT ... SELECT ... WHERE NOT EXISTS`` statement
+        (committed on its own when `auto_commit` is set), so neither the users
+        nor their roles are loaded. Links inserted meanwhile by a concurrent
+        run are skipped by the unique constraint, and not counted. The audit
+        entries of a committed batch are written before the next one.
+
+        Args:
+            role_id: The role to assign.
+            only_active: Only assign the role to active users.
+            batch_size: Number of users scanned per statement.
+            on_progress: Called with the number of inserted roles after each batch.
+            auto_commit: Commit after each batch.
+
+        Returns:
+            int: The number of roles inserted by this call.
+        """
+        session = self.repository.session
+        user = User.__table__
+        criteria = self._missing_role_criteria(role_id, only_active)
+        assigned = 0
+        lower: Any = None
+        while True:
+            # upper bound of the next primary key range, `None` on the last one
+            bound = (
+                select(user.c.id).order_by(user.c.id).offset(batch_size - 1).limit(1)
+            )
+            if lower is not None:
+                bound = bound.where(user.c.id > lower)
+            upper = await session.scalar(bound)
+            batch = criteria
+            if lower is not None:
+                batch = and_(batch, user.c.id > lower)
+            if upper is not None:
+                batch = and_(batch, user.c.id <= upper)
+            assigned += len(await self._insert_user_roles(role_id, batch))
+            if auto_commit:
+                await session.commit()
+                # one audit entry per user, keep them from piling up in the buffer
+                await audit_trail.flush()
+            if on_progress is not None:
+                on_progress(assigned)
+            if upper is None:
+                break
+            lower = upper
+        return assigned
+
+    async def get_role_id(self, role_slug: str) -> UUID:
+        """Get the primary key of a role without loading it.
+
+        Raises:
+            NotFoundException: The role does not exist.
+        """
+        role_id = await self.repository.session.scalar(
+            select(Role.id).where(Role.slug == role_slug)
+        )
+        if role_id is None:
+            msg = f"Role '{role_slug}' not found"
+            raise NotFoundException(msg)
+        return role_id
+
+    async def _count_users(self, emails: list[str]) -> int:
+        statement = select(func.count()).where(User.__table__.c.email.in_(emails))
+        return (await self.repository.session.execute(statement)).scalar_one()
+
+    async def assign_role(self, role_id: UUID, emails: list[str]) -> tuple[int, int]:
+        """Assign a role to users, users already having it are skipped.
+
+        Args:
+            role_id: The role to assign.
+            emails: Emails of the users.
+
+        Returns:
+            tuple[int, int]: The number of matched users and of assigned roles.
+        """
+        matched = await self._count_users(emails)
+        if not matched:
+            return 0, 0
+        users = and_(
+            User.__table__.c.email.in_(emails),
+            self._missing_role_criteria(role_id, only_active=False),
+        )
+        user_ids = await self._insert_user_roles(role_id, users)
+        return matched, len(user_ids)
+
+    async def revoke_role(self, role_id: UUID, emails: list[str]) -> tuple[int, int]:
+        """Revoke a role from users, users not having it are skipped.
+
+        Args:
+            role_id: The role to revoke.
+            emails: Emails of the users.
+
+        Returns:
+            tuple[int, int]: The number of matched users and of revoked roles.
+        """
+        matched = await self._count_users(emails)
+        if not matched:
+            return 0, 0
+        user, user_role = User.__table__, UserRole.__table__
+        user_ids = list(
+            await self.repository.session.scalars(
+                delete(user_role)
+                .where(
+                    user_role.c.role_id == role_id,
+                    user_role.c.user_id.in_(
+                        select(user.c.id).where(user.c.email.in_(emails))
+                    ),
+                )
+                .returning(user_role.c.user_id)
+            )
+        )
+        self._audit_role_changes(
+            "revoke_role", user_ids, before={"role_id": str(role_id)}
+        )
+        invalidate_principals(self.repository.session, user_ids)
+        return matched, len(user_ids)
+
+
+class AuditLogService(SQLAlchemyAsyncRepositoryService[AuditLog]):
+    """Reads the audit log, entries are written by `audit.audit_trail`."""
+
+    repository_type = AuditLogRepository
+
+    def __init__(self, **repo_kwargs: Any) -> None:
+        self.repository: AuditLogRepository = self.repository_type(**repo_kwargs)
+        self.model_type = self.repository.model_type
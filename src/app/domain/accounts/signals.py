@@ -1,38 +1,29 @@
+"""Listeners of the account domain events, run by the outbox relay."""
+
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-import structlog
-from litestar.events import listener
-
-from src.app.config.app import alchemy
-
-from .dependencies import provide_users_service
+from src.app.domain.accounts import jobs
+from src.app.lib.jobs import enqueue
+from src.app.lib.outbox import listener
 
 if TYPE_CHECKING:
-    from uuid import UUID
-
-logger = structlog.get_logger()
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 
 @listener("user_created")
 async def user_created_event_handler(
-    user_id: UUID,
+    session: AsyncSession, user_id: str, email: str, name: str | None
 ) -> None:
-    """Executes when a new user is created.
+    """Enqueue the post signup flow of a new user.
+
+    The job commits with the removal of the event from the outbox.
 
     Args:
+        session: Session of the outbox relay.
         user_id: The primary key of the user that was created.
+        email: Email of the user.
+        name: Name of the user.
     """
-    await logger.ainfo("Running post signup flow.")
-    async with alchemy.get_session() as db_session:
-        service = await anext(provide_users_service(db_session))
-        obj = await service.get_one_or_none(id=user_id)
-        if obj is None:
-            await logger.aerror(
-                "Could not locate the specified user",
-                id=user_id,
-            )
-            return
-
-        await logger.ainfo("Found user", **obj.to_dict(exclude={"hashed_password"}))
+    enqueue(session, jobs.user_created, user_id=user_id, email=email, name=name)
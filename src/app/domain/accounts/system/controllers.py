@@ -1,11 +1,24 @@
+from typing import Any
+
 import structlog
 from litestar import Controller, MediaType, Request, get
 from litestar.response import Response
+from litestar.status_codes import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
 
+from src.app.config.app import alchemy
+from src.app.config.base import get_settings
+from src.app.domain.accounts.guards import requires_superuser
+from src.app.domain.accounts.system.health import health_checker
 from src.app.domain.accounts.system.schemas import SystemHealth
-from src.app.domain.accounts.system.urls import LIVENESS, SYSTEM_HEALTH
+from src.app.domain.accounts.system.urls import (
+    LIVENESS,
+    SYSTEM_HEALTH,
+    SYSTEM_METRICS,
+)
+from src.app.lib import metrics
 
 logger = structlog.get_logger()
+settings = get_settings()
 
 
 class SystemController(Controller):
@@ -19,19 +32,28 @@ class SystemController(Controller):
         cache=False,
         tags=["System"],
         summary="Health Check",
-        description="Execute a health check against backend.",
+        description=(
+            "Probe the database, its read replica and Redis in parallel, "
+            "answer 503 when any of them is offline."
+        ),
         exclude_from_auth=True,
     )
     async def check_system_health(
         self,
         request: Request,
     ) -> Response[SystemHealth]:
-        await logger.adebug(
-            "System Health check",
+        health = await health_checker.check(
+            engine=request.app.state[alchemy.engine_app_state_key],
+            replica=settings.db.get_read_engine(),
+            redis=settings.redis.get_client() if settings.redis.ENABLED else None,
         )
+        if health.status != "online":
+            await logger.awarning("System Health check failed", health=health)
         return Response(
-            content=SystemHealth(),
-            status_code=200,
+            content=health,
+            status_code=HTTP_200_OK
+            if health.status == "online"
+            else HTTP_503_SERVICE_UNAVAILABLE,
             media_type=MediaType.JSON,
         )
 
@@ -56,3 +78,21 @@ class SystemController(Controller):
             status_code=200,
             media_type=MediaType.TEXT,
         )
+
+    @get(
+        operation_id="SystemMetrics",
+        name="system:metrics",
+        path=SYSTEM_METRICS,
+        media_type=MediaType.JSON,
+        cache=False,
+        tags=["System"],
+        guards=[requires_superuser],
+        summary="Runtime Metrics",
+        description="Process local runtime counters of the backend.",
+    )
+    async def runtime_metrics(
+        self,
+        request: Request,
+    ) -> dict[str, dict[str, Any]]:
+        """Runtime Metrics."""
+        return metrics.collect()
@@ -0,0 +1,149 @@
+"""Health probes of the backend dependencies.
+
+The database, its read replica and Redis are probed in parallel, each within
+`HEALTH_CHECK_TIMEOUT`. The outcome is reused for `HEALTH_CHECK_CACHE_TTL`
+seconds and concurrent checks share a single round of probes, so frequent
+load balancer probes do not load the dependencies themselves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from src.app.config.base import get_settings
+from src.app.domain.accounts.system.schemas import (
+    DatabaseHealth,
+    ServiceHealth,
+    SystemHealth,
+)
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = (
+    "HealthChecker",
+    "health_checker",
+    "probe_database",
+    "probe_redis",
+)
+
+settings = get_settings()
+
+
+def _error(exc: BaseException) -> str:
+    return "Timed out" if isinstance(exc, TimeoutError) else exc.__class__.__name__
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+async def probe_database(engine: AsyncEngine, timeout: float) -> DatabaseHealth:
+    """Run ``SELECT 1`` on a pooled connection of `engine`."""
+    pool = engine.pool
+    health = DatabaseHealth(status="offline")
+    if isinstance(pool, QueuePool):
+        health.pool_size = pool.size()
+        health.checked_out = pool.checkedout()
+        health.overflow = pool.overflow()
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout), engine.connect() as conn:
+            health.pool_wait_ms = _elapsed_ms(started)
+            query_started = time.perf_counter()
+            await conn.execute(text("SELECT 1"))
+            health.latency_ms = _elapsed_ms(query_started)
+    except Exception as exc:  # noqa: BLE001
+        health.error = _error(exc)
+        return health
+    health.status = "online"
+    return health
+
+
+async def probe_redis(client: Redis, timeout: float) -> ServiceHealth:
+    """Ping Redis."""
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout):
+            await client.ping()
+    except Exception as exc:  # noqa: BLE001
+        return ServiceHealth(status="offline", error=_error(exc))
+    return ServiceHealth(status="online", latency_ms=_elapsed_ms(started))
+
+
+class HealthChecker:
+    """Probe the dependencies, reusing the outcome for `ttl` seconds."""
+
+    def __init__(self, timeout: float, ttl: float) -> None:
+        self.timeout = timeout
+        self.ttl = ttl
+        self._lock = asyncio.Lock()
+        self._checked: SystemHealth | None = None
+        self._expires_at = 0.0
+
+    def clear(self) -> None:
+        """Forget the cached outcome."""
+        self._checked = None
+        self._expires_at = 0.0
+
+    def _cached(self) -> SystemHealth | None:
+        if self._checked is not None and time.monotonic() < self._expires_at:
+            return self._checked
+        return None
+
+    async def check(
+        self,
+        engine: AsyncEngine,
+        replica: AsyncEngine | None = None,
+        redis: Redis | None = None,
+    ) -> SystemHealth:
+        """Probe the dependencies unless a recent outcome is cached.
+
+        Args:
+            engine: Engine of the primary database.
+            replica: Engine of the read replica, if any.
+            redis: Redis client, if Redis is enabled.
+
+        Returns:
+            SystemHealth: `offline` when any dependency failed its probe.
+        """
+        if (health := self._cached()) is not None:
+            return health
+        async with self._lock:
+            # probed by the check holding the lock
+            if (health := self._cached()) is not None:
+                return health
+            database, replica_health, redis_health = await asyncio.gather(
+                probe_database(engine, self.timeout),
+                probe_database(replica, self.timeout) if replica else _none(),
+                probe_redis(redis, self.timeout) if redis else _none(),
+            )
+            probes = (database, replica_health, redis_health)
+            health = SystemHealth(
+                status="online"
+                if all(probe.status == "online" for probe in probes if probe)
+                else "offline",
+                database=database,
+                replica=replica_health,
+                redis=redis_health,
+                checked_at=datetime.now(UTC),
+            )
+            self._checked = health
+            self._expires_at = time.monotonic() + self.ttl
+            return health
+
+
+async def _none() -> None:
+    return None
+
+
+health_checker = HealthChecker(
+    timeout=settings.app.HEALTH_CHECK_TIMEOUT, ttl=settings.app.HEALTH_CHECK_CACHE_TTL
+)
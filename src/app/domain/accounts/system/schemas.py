@@ -1,18 +1,52 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Literal
 
 from src.app.__about__ import __version__ as current_version
 from src.app.config.base import get_settings
 
-__all__ = ("SystemHealth",)
+__all__ = (
+    "DatabaseHealth",
+    "ServiceHealth",
+    "SystemHealth",
+)
 
 settings = get_settings()
 
 
+@dataclass
+class ServiceHealth:
+    """Outcome of the probe of a backend service."""
+
+    status: Literal["online", "offline"]
+    latency_ms: float | None = None
+    """Round trip of the probe."""
+    error: str | None = None
+
+
+@dataclass
+class DatabaseHealth(ServiceHealth):
+    """Outcome of the probe of a database and its connection pool."""
+
+    pool_wait_ms: float | None = None
+    """Time the probe waited for a pooled connection."""
+    pool_size: int | None = None
+    checked_out: int | None = None
+    """Connections in use when the probe started."""
+    overflow: int | None = None
+    """Connections opened beyond the pool size, negative while it fills up."""
+
+
 @dataclass
 class SystemHealth:
     """System Health Response."""
 
-    status: Literal["online"] = "online"
+    status: Literal["online", "offline"] = "online"
     app: str = settings.app.NAME
     version: str = current_version
+    database: DatabaseHealth | None = None
+    replica: DatabaseHealth | None = None
+    """The read replica, when configured."""
+    redis: ServiceHealth | None = None
+    """Redis, when enabled."""
+    checked_at: datetime | None = None
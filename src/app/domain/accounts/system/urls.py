@@ -2,3 +2,4 @@
 
 SYSTEM_HEALTH: str = "/health"
 LIVENESS: str = "/liveness"
+SYSTEM_METRICS: str = "/metrics"
@@ -3,9 +3,13 @@ ACCOUNT_LOGOUT = "/access/logout"
 ACCOUNT_REGISTER = "/access/signup"
 ACCOUNT_PROFILE = "/me"
 ACCOUNT_LIST = "/users"
+ACCOUNT_EXPORT = "/users/export"
+ACCOUNT_IMPORT = "/users/import"
+ACCOUNT_AUTOCOMPLETE = "/users/autocomplete"
 ACCOUNT_DELETE = "/users/{user_id:uuid}"
 ACCOUNT_DETAIL = "/users/{user_id:uuid}"
 ACCOUNT_UPDATE = "/users/{user_id:uuid}"
 ACCOUNT_CREATE = "/users"
 ACCOUNT_ASSIGN_ROLE = "/roles/{role_slug:str}/assign"
 ACCOUNT_REVOKE_ROLE = "/roles/{role_slug:str}/revoke"
+ACCOUNT_AUDIT = "/users/audit"
@@ -2,10 +2,37 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import multiprocessing
+import statistics
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
 
 from passlib.context import CryptContext
+from passlib.hash import argon2
 
-password_crypt_context = CryptContext(schemes=["argon2"], deprecated="auto")
+from src.app.config.base import get_settings
+from src.app.lib import metrics
+from src.app.lib.exceptions import ServiceUnavailableError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from concurrent.futures import Future
+
+    from src.app.config.security import SecuritySettings
+
+T = TypeVar("T")
+
+settings = get_settings()
+password_crypt_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.security.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.security.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.security.ARGON2_PARALLELISM,
+)
 
 
 def get_encryption_key(secret: str) -> bytes:
@@ -22,6 +49,185 @@ def get_encryption_key(secret: str) -> bytes:
     return base64.urlsafe_b64encode(secret.encode())
 
 
+def _hash(password: str | bytes) -> str:
+    return password_crypt_context.hash(password)
+
+
+def _verify_and_update(
+    plain_password: str | bytes, hashed_password: str
+) -> tuple[bool, str | None]:
+    return password_crypt_context.verify_and_update(plain_password, hashed_password)
+
+
+def _timed_call(fn: Callable[..., T], *args: Any) -> tuple[float, T]:
+    """Run `fn` in a worker and report when it actually started.
+
+    Wall clock time is used so the value is comparable across processes.
+    """
+    return time.time(), fn(*args)
+
+
+_PROCESS_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+class PasswordHashingPool:
+    """Bounded executor dedicated to password hashing.
+
+    Argon2 is CPU and memory heavy, so it runs in its own executor instead of
+    the event loop default one. Jobs beyond ``max_workers + max_queue`` are
+    rejected immediately and every job has a deadline covering queue and run
+    time.
+    """
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"] = "thread",
+        max_workers: int = 4,
+        max_queue: int = 32,
+        timeout: float = 5,
+        retry_after: int = 1,
+    ) -> None:
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: SecuritySettings) -> PasswordHashingPool:
+        return cls(
+            kind=settings.HASHING_POOL_KIND,
+            max_workers=settings.HASHING_POOL_WORKERS,
+            max_queue=settings.HASHING_POOL_MAX_QUEUE,
+            timeout=settings.HASHING_POOL_TIMEOUT,
+            retry_after=settings.HASHING_POOL_RETRY_AFTER,
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a free worker."""
+        return max(0, self._pending - self.max_workers)
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of the pool counters."""
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._pending,
+                "queue_depth": self.queue_depth,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "wait_time_total": round(self._wait_time_total, 6),
+                "wait_time_max": round(self._wait_time_max, 6),
+            }
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # forking the threaded server process could copy a held lock
+                # into the workers, they are forked from a clean server instead
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(_PROCESS_START_METHOD),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hashing",
+                )
+        return self._executor
+
+    def start(self) -> None:
+        """Create the executor ahead of the first job, `on_startup` hook.
+
+        Process pools also start their fork server and a first worker.
+        """
+        executor = self._get_executor()
+        if self.kind == "process":
+            executor.submit(int)
+
+    def _release(self, _: Future[Any]) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _reject(self, detail: str) -> ServiceUnavailableError:
+        return ServiceUnavailableError(detail=detail, retry_after=self.retry_after)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run `fn` on the hashing pool.
+
+        Args:
+            fn: Module level callable (it must be picklable for process pools).
+            *args: Arguments passed to `fn`.
+
+        Raises:
+            ServiceUnavailableError: The pool is saturated or the job missed its deadline.
+
+        Returns:
+            The value returned by `fn`.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise self._reject("Password hashing capacity exhausted")
+            self._pending += 1
+        submitted_at = time.time()
+        try:
+            future = self._get_executor().submit(_timed_call, fn, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # the slot is only released once the worker is really done with the job
+        future.add_done_callback(self._release)
+        try:
+            started_at, result = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=self.timeout
+            )
+        except TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            raise self._reject("Password hashing timed out") from None
+        wait_time = max(0.0, started_at - submitted_at)
+        with self._lock:
+            self._completed += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the workers; the pool is recreated on next use."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = PasswordHashingPool.from_settings(settings.security)
+metrics.register_collector("password_hashing", hashing_pool.stats)
+bulk_hashing_pool = PasswordHashingPool(
+    kind="process",
+    max_workers=settings.security.BULK_HASHING_POOL_WORKERS,
+    max_queue=settings.security.BULK_HASHING_POOL_MAX_QUEUE,
+    timeout=settings.security.BULK_HASHING_POOL_TIMEOUT,
+    retry_after=settings.security.HASHING_POOL_RETRY_AFTER,
+)
+"""Process pool of bulk imports, kept apart so imports never delay logins."""
+metrics.register_collector("bulk_password_hashing", bulk_hashing_pool.stats)
+
+
 async def get_password_hash(password: str | bytes) -> str:
     """Get password hash.
 
@@ -30,9 +236,34 @@ async def get_password_hash(password: str | bytes) -> str:
     Returns:
         str: Hashed password
     """
-    return await asyncio.get_running_loop().run_in_executor(
-        None, password_crypt_context.hash, password
-    )
+    return await hashing_pool.run(_hash, password)
+
+
+async def get_password_hashes(
+    passwords: Iterable[str | bytes], pool: PasswordHashingPool | None = None
+) -> list[str]:
+    """Hash many passwords in parallel.
+
+    Args:
+        passwords: Plain passwords
+        pool: Pool running the hashes, defaults to the bulk hashing pool
+    Returns:
+        list[str]: Hashed passwords, in the order of `passwords`
+    """
+    pool = pool or bulk_hashing_pool
+    return list(await asyncio.gather(*(pool.run(_hash, p) for p in passwords)))
+
+
+def is_password_hash(value: str) -> bool:
+    """Whether `value` is a hash of a supported scheme.
+
+    Args:
+        value (str): The value to check
+
+    Returns:
+        bool: True if `value` can be stored as a password hash.
+    """
+    return password_crypt_context.identify(value, required=False) is not None
 
 
 async def verify_password(plain_password: str | bytes, hashed_password: str) -> bool:
@@ -45,10 +276,96 @@ async def verify_password(plain_password: str | bytes, hashed_password: str) ->
     Returns:
         bool: True if password matches hash.
     """
-    valid, _ = await asyncio.get_running_loop().run_in_executor(
-        None,
-        password_crypt_context.verify_and_update,
+    valid, _ = await verify_and_update_password(plain_password, hashed_password)
+    return valid
+
+
+async def verify_and_update_password(
+    plain_password: str | bytes, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify Password and compute an upgraded hash when required.
+
+    Args:
+        plain_password (str | bytes): The string or byte password
+        hashed_password (str): the hash of the password
+
+    Returns:
+        tuple[bool, str | None]: Whether the password matches and the new hash
+            to store when `hashed_password` uses outdated parameters.
+    """
+    valid, new_hash = await hashing_pool.run(
+        _verify_and_update,
         plain_password,
         hashed_password,
     )
-    return bool(valid)
+    return bool(valid), new_hash if valid else None
+
+
+@dataclass
+class Argon2Parameters:
+    """Argon2 cost parameters measured on the current host."""
+
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    p50_ms: float
+
+    def to_env(self) -> dict[str, str]:
+        return {
+            "PASSWORD_ARGON2_TIME_COST": str(self.time_cost),
+            "PASSWORD_ARGON2_MEMORY_COST": str(self.memory_cost),
+            "PASSWORD_ARGON2_PARALLELISM": str(self.parallelism),
+        }
+
+
+def _measure_argon2(
+    time_cost: int, memory_cost: int, parallelism: int, samples: int
+) -> float:
+    handler = argon2.using(
+        rounds=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash("argon2-calibration")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_argon2(
+    target_ms: float = 50,
+    max_memory_cost: int = 65536,
+    min_memory_cost: int = 8192,
+    parallelism: int = 4,
+    max_time_cost: int = 10,
+    samples: int = 5,
+) -> Argon2Parameters:
+    """Find the strongest argon2 parameters hashing within `target_ms` (p50).
+
+    Memory is the preferred cost: it starts at `max_memory_cost` and is halved
+    until a single iteration fits the target, then the time cost is raised
+    while the median hashing time stays within the target.
+
+    Args:
+        target_ms: Target median hashing time in milliseconds.
+        max_memory_cost: Upper memory bound in KiB.
+        min_memory_cost: Lower memory bound in KiB.
+        parallelism: Argon2 degree of parallelism.
+        max_time_cost: Upper bound for the number of iterations.
+        samples: Number of hashes measured per candidate.
+
+    Returns:
+        Argon2Parameters: The selected parameters and their measured p50.
+    """
+    memory_cost = max(max_memory_cost, min_memory_cost)
+    p50 = _measure_argon2(1, memory_cost, parallelism, samples)
+    while p50 > target_ms and memory_cost // 2 >= min_memory_cost:
+        memory_cost //= 2
+        p50 = _measure_argon2(1, memory_cost, parallelism, samples)
+    best = Argon2Parameters(1, memory_cost, parallelism, round(p50, 2))
+    for time_cost in range(2, max_time_cost + 1):
+        p50 = _measure_argon2(time_cost, memory_cost, parallelism, samples)
+        if p50 > target_ms:
+            break
+        best = Argon2Parameters(time_cost, memory_cost, parallelism, round(p50, 2))
+    return best
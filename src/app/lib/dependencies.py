@@ -16,22 +16,31 @@ from advanced_alchemy.filters import (
 )
 from litestar.di import Provide
 from litestar.params import Dependency, Parameter
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.config import constants
+from src.app.config import constants, get_settings
+from src.app.lib.pagination import CountMode, CursorPagination
+from src.app.lib.search import RankedSearchFilter
 
 __all__ = [
     "create_collection_dependencies",
+    "provide_count_mode",
+    "provide_cursor_pagination",
     "provide_created_filter",
     "provide_filter_dependencies",
     "provide_id_filter",
     "provide_limit_offset_pagination",
     "provide_updated_filter",
     "provide_search_filter",
+    "provide_ranked_search_filter",
     "provide_order_by",
     "BeforeAfter",
     "CollectionFilter",
+    "CountMode",
+    "CursorPagination",
     "LimitOffset",
     "OrderBy",
+    "RankedSearchFilter",
     "SearchFilter",
     "FilterTypes",
 ]
@@ -46,6 +55,8 @@ FILTERS_DEPENDENCY_KEY = "filters"
 CREATED_FILTER_DEPENDENCY_KEY = "created_filter"
 ID_FILTER_DEPENDENCY_KEY = "id_filter"
 LIMIT_OFFSET_DEPENDENCY_KEY = "limit_offset"
+CURSOR_PAGINATION_DEPENDENCY_KEY = "cursor_pagination"
+COUNT_MODE_DEPENDENCY_KEY = "count_mode"
 UPDATED_FILTER_DEPENDENCY_KEY = "updated_filter"
 ORDER_BY_DEPENDENCY_KEY = "order_by"
 SEARCH_FILTER_DEPENDENCY_KEY = "search_filter"
@@ -112,6 +123,53 @@ def provide_search_filter(
     )  # type: ignore[arg-type]
 
 
+def provide_ranked_search_filter(
+    db_session: AsyncSession,
+    field: StringOrNone = Parameter(
+        title="Fields to search",
+        description="Comma separated, all searchable fields by default.",
+        query="searchField",
+        default=None,
+        required=False,
+    ),
+    search: StringOrNone = Parameter(
+        title="Value to search for", query="searchString", default=None, required=False
+    ),
+    ignore_case: BooleanOrNone = Parameter(
+        title="Search should be case insensitive",
+        query="searchIgnoreCase",
+        default=None,
+        required=False,
+    ),
+) -> RankedSearchFilter:
+    """Add an index backed search, replaces `provide_search_filter`.
+
+    Only the fields listed in the ``__searchable_columns__`` of the model can
+    be searched, the matches are ranked unless ``orderBy`` is set. The search
+    ignores the case unless ``searchIgnoreCase`` is false.
+
+    Args:
+        db_session (AsyncSession): Session of the request, selects the index lookup.
+        field (StringOrNone): Comma separated field names to search.
+        search (StringOrNone): Value to search for.
+        ignore_case (BooleanOrNone): Whether to ignore case when searching.
+
+    Returns:
+        RankedSearchFilter: Filter for searching fields.
+    """
+    field_names: set[str] | None = None
+    if search is not None:
+        field_names = {
+            name.strip() for name in (field or "").split(",") if name.strip()
+        }
+    return RankedSearchFilter(
+        field_name=field_names,  # type: ignore[arg-type]
+        value=search,  # type: ignore[arg-type]
+        ignore_case=ignore_case is not False,
+        dialect_name=db_session.get_bind().dialect.name,
+    )
+
+
 def provide_order_by(
     field_name: StringOrNone = Parameter(
         title="Order by field", query="orderBy", default=None, required=False
@@ -157,6 +215,7 @@ def provide_limit_offset_pagination(
     page_size: int = Parameter(
         query="pageSize",
         ge=1,
+        le=constants.MAX_PAGINATION_SIZE,
         default=constants.DEFAULT_PAGINATION_SIZE,
         required=False,
     ),
@@ -175,11 +234,68 @@ def provide_limit_offset_pagination(
     return LimitOffset(page_size, page_size * (current_page - 1))
 
 
+def provide_cursor_pagination(
+    cursor: StringOrNone = Parameter(
+        title="Pagination cursor",
+        description="`nextCursor` of the previous page, empty for the first page.",
+        query="cursor",
+        default=None,
+        required=False,
+    ),
+    page_size: int = Parameter(
+        query="pageSize",
+        ge=1,
+        le=constants.MAX_PAGINATION_SIZE,
+        default=constants.DEFAULT_PAGINATION_SIZE,
+        required=False,
+    ),
+) -> CursorPagination | None:
+    """Add keyset pagination.
+
+    Cursor pagination replaces offset pagination when the `cursor` query
+    parameter is present. Pages are sorted on `orderBy` (`created_at` by
+    default) and `id`.
+
+    Args:
+        cursor (StringOrNone): Cursor of the previous page.
+        page_size (int): Number of records per page.
+
+    Returns:
+        CursorPagination | None: Filter for query pagination, `None` when
+            cursor pagination is not requested.
+    """
+    if cursor is None:
+        return None
+    return CursorPagination(limit=page_size, cursor=cursor or None)
+
+
+def provide_count_mode(
+    mode: CountMode | None = Parameter(
+        title="Total count strategy",
+        description="`exact`, `window`, `cached` or `estimated` (PostgreSQL).",
+        query="countMode",
+        default=None,
+        required=False,
+    ),
+) -> CountMode:
+    """Select how the total of a paginated collection is computed.
+
+    Args:
+        mode (CountMode | None): Requested strategy, defaults to the
+            `DATABASE_COUNT_MODE` setting.
+
+    Returns:
+        CountMode: Strategy consumed by ``list_page()``.
+    """
+    return mode or get_settings().db.COUNT_MODE
+
+
 def provide_filter_dependencies(
     created_filter: BeforeAfter = Dependency(skip_validation=True),
     updated_filter: BeforeAfter = Dependency(skip_validation=True),
     id_filter: CollectionFilter = Dependency(skip_validation=True),
     limit_offset: LimitOffset = Dependency(skip_validation=True),
+    cursor_pagination: CursorPagination | None = Dependency(skip_validation=True),
     search_filter: SearchFilter = Dependency(skip_validation=True),
     order_by: OrderBy = Dependency(skip_validation=True),
 ) -> list[FilterTypes]:
@@ -201,6 +317,8 @@ def provide_filter_dependencies(
         updated_filter (BeforeAfter): Filter for a scoping query to instance update date/time.
         id_filter (CollectionFilter): Filter for a scoping query to a limited set of identities.
         limit_offset (LimitOffset): Filter for query pagination.
+        cursor_pagination (CursorPagination | None): Filter for keyset query
+            pagination, replaces `limit_offset` and `order_by` when set.
         search_filter (SearchFilter): Filter for searching fields.
         order_by (OrderBy): Order by for query.
 
@@ -210,10 +328,19 @@ def provide_filter_dependencies(
     filters: list[FilterTypes] = []
     if id_filter.values:  # noqa: PD011
         filters.append(id_filter)
-    filters.extend([created_filter, limit_offset, updated_filter])
+    filters.extend([created_filter, updated_filter])
 
     if search_filter.field_name is not None and search_filter.value is not None:
+        if isinstance(search_filter, RankedSearchFilter):
+            search_filter.rank = order_by.field_name is None
         filters.append(search_filter)
+    if cursor_pagination is not None:
+        if order_by.field_name is not None:
+            cursor_pagination.field_name = order_by.field_name
+        cursor_pagination.sort_order = order_by.sort_order
+        filters.append(cursor_pagination)  # type: ignore[arg-type]
+        return filters
+    filters.append(limit_offset)
     if order_by.field_name is not None:
         filters.append(order_by)
     return filters
@@ -232,6 +359,14 @@ def create_collection_dependencies() -> dict[str, Provide]:
             provide_limit_offset_pagination,
             sync_to_thread=False,
         ),
+        CURSOR_PAGINATION_DEPENDENCY_KEY: Provide(
+            provide_cursor_pagination,
+            sync_to_thread=False,
+        ),
+        COUNT_MODE_DEPENDENCY_KEY: Provide(
+            provide_count_mode,
+            sync_to_thread=False,
+        ),
         UPDATED_FILTER_DEPENDENCY_KEY: Provide(
             provide_updated_filter,
             sync_to_thread=False,
@@ -15,6 +15,8 @@ from litestar.exceptions import (
     InternalServerException,
     NotFoundException,
     PermissionDeniedException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
 )
 from litestar.exceptions.responses import (
     create_debug_response,
@@ -36,6 +38,8 @@ __all__ = (
     "AuthorizationError",
     "HealthCheckConfigurationError",
     "ApplicationError",
+    "ServiceUnavailableError",
+    "TooManyRequestsError",
     "after_exception_hook_handler",
 )
 
@@ -89,6 +93,46 @@ class HealthCheckConfigurationError(ApplicationError):
     """An error occurred while registering an health check."""
 
 
+class ServiceUnavailableError(ApplicationError):
+    """A backend resource is saturated, the client should retry later."""
+
+    retry_after: int = 1
+
+    def __init__(
+        self, *args: Any, detail: str = "", retry_after: int | None = None
+    ) -> None:
+        """Initialize ``ServiceUnavailableError``.
+
+        Args:
+            *args: args are converted to :class:`str` before passing to :class:`Exception`
+            detail: detail of the exception.
+            retry_after: seconds the client should wait before retrying.
+        """
+        if retry_after is not None:
+            self.retry_after = retry_after
+        super().__init__(*args, detail=detail)
+
+
+class TooManyRequestsError(ApplicationClientError):
+    """A client exceeded a rate limit and should retry later."""
+
+    retry_after: int = 1
+
+    def __init__(
+        self, *args: Any, detail: str = "", retry_after: int | None = None
+    ) -> None:
+        """Initialize ``TooManyRequestsError``.
+
+        Args:
+            *args: args are converted to :class:`str` before passing to :class:`Exception`
+            detail: detail of the exception.
+            retry_after: seconds the client should wait before retrying.
+        """
+        if retry_after is not None:
+            self.retry_after = retry_after
+        super().__init__(*args, detail=detail)
+
+
 class _HTTPConflictException(HTTPException):
     """Request conflict with the current state of the target resource."""
 
@@ -128,6 +172,22 @@ def exception_to_http_response(
     Returns:
         Exception response appropriate to the type of original exception.
     """
+    if isinstance(exc, ServiceUnavailableError):
+        return create_exception_response(
+            request,
+            ServiceUnavailableException(
+                detail=exc.detail,
+                headers={"Retry-After": str(exc.retry_after)},
+            ),
+        )
+    if isinstance(exc, TooManyRequestsError):
+        return create_exception_response(
+            request,
+            TooManyRequestsException(
+                detail=exc.detail,
+                headers={"Retry-After": str(exc.retry_after)},
+            ),
+        )
     http_exc: type[HTTPException]
     if isinstance(exc, NotFoundError):
         http_exc = NotFoundException
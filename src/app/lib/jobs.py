@@ -0,0 +1,275 @@
+"""Durable background jobs.
+
+Jobs are rows of the `job` table. :func:`enqueue` adds one to the session of
+the caller, so a job exists if and only if the transaction which asked for it
+commits. ``litestar workers run`` starts a :class:`Worker` in a process of
+its own: slow work never shares the event loop of the request handlers.
+
+A worker claims due jobs with a lease, runs up to `concurrency` of them at
+once, and retries failures with an exponential backoff until `max_attempts`.
+Jobs of a worker which died mid-run are claimed again once their lease is
+over, so a job runs at least once and tasks must be idempotent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+import structlog
+from sqlalchemy import and_, or_, select, update
+
+from src.app.config.base import get_settings
+from src.app.db.models.job import Job
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from src.app.config.worker import WorkerSettings
+
+__all__ = (
+    "Worker",
+    "enqueue",
+    "task",
+)
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+_tasks: dict[str, Callable[..., Awaitable[Any]]] = {}
+
+
+def task(
+    name: str,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Register a coroutine function as the task `name`.
+
+    Tasks receive the keyword arguments given to :func:`enqueue`, as JSON
+    builtins: carry what the task needs rather than keys to fetch it again.
+    """
+
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        _tasks[name] = fn
+        fn.task_name = name  # type: ignore[attr-defined]
+        return fn
+
+    return decorator
+
+
+def enqueue(
+    session: AsyncSession,
+    fn: Callable[..., Awaitable[Any]],
+    *,
+    queue: str = "default",
+    max_attempts: int | None = None,
+    delay: float = 0,
+    **kwargs: Any,
+) -> Job:
+    """Add a job running `fn` to `session`, committed with the session.
+
+    Args:
+        session: Session of the transaction the job belongs to.
+        fn: A function registered with :func:`task`.
+        queue: Queue of the job.
+        max_attempts: Attempts before the job is marked as failed,
+            `WORKER_MAX_ATTEMPTS` by default.
+        delay: Seconds before the job may run.
+        **kwargs: Payload of the job, passed to `fn`.
+
+    Returns:
+        Job: The pending job.
+    """
+    job = Job(
+        queue=queue,
+        function=fn.task_name,  # type: ignore[attr-defined]
+        kwargs=msgspec.to_builtins(kwargs),
+        max_attempts=max_attempts or settings.worker.MAX_ATTEMPTS,
+        scheduled_at=datetime.now(UTC) + timedelta(seconds=delay),
+    )
+    session.add(job)
+    return job
+
+
+class Worker:
+    """Run the jobs of a queue."""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        queue: str = "default",
+        concurrency: int = 10,
+        poll_interval: float = 1.0,
+        retry_delay: float = 5.0,
+        timeout: float = 60.0,
+    ) -> None:
+        self.session_maker = session_maker
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self._running: set[asyncio.Task[None]] = set()
+        self._claimed = 0
+        self._completed = 0
+        self._retried = 0
+        self._failed = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: WorkerSettings,
+        session_maker: async_sessionmaker[AsyncSession],
+        queue: str = "default",
+    ) -> Worker:
+        return cls(
+            session_maker,
+            queue=queue,
+            concurrency=settings.CONCURRENCY,
+            poll_interval=settings.POLL_INTERVAL,
+            retry_delay=settings.RETRY_DELAY,
+            timeout=settings.JOB_TIMEOUT,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Job counters and queue latency, the wait between due and claimed."""
+        return {
+            "queue": self.queue,
+            "concurrency": self.concurrency,
+            "running": len(self._running),
+            "claimed": self._claimed,
+            "completed": self._completed,
+            "retried": self._retried,
+            "failed": self._failed,
+            "queue_latency_avg": round(self._latency_total / self._claimed, 4)
+            if self._claimed
+            else 0.0,
+            "queue_latency_max": round(self._latency_max, 4),
+        }
+
+    async def _claim(self, limit: int) -> list[Job]:
+        now = datetime.now(UTC)
+        due = (
+            select(Job.id)
+            .where(
+                Job.queue == self.queue,
+                or_(
+                    and_(Job.status == "queued", Job.scheduled_at <= now),
+                    # abandoned by a worker which died
+                    and_(Job.status == "active", Job.locked_until < now),
+                ),
+            )
+            .order_by(Job.scheduled_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_maker() as session, session.begin():
+            jobs = await session.scalars(
+                update(Job)
+                .where(Job.id.in_(due.scalar_subquery()))
+                .values(
+                    status="active",
+                    attempts=Job.attempts + 1,
+                    started_at=now,
+                    locked_until=now + timedelta(seconds=self.timeout * 2),
+                    updated_at=now,
+                )
+                .returning(Job)
+                .execution_options(synchronize_session=False)
+            )
+            claimed = list(jobs)
+            # detached, the attributes outlive the transaction
+            session.expunge_all()
+            return claimed
+
+    async def _finish(self, job_id: Any, **values: Any) -> None:
+        async with self.session_maker() as session, session.begin():
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(locked_until=None, updated_at=datetime.now(UTC), **values)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def _run(self, job: Job) -> None:
+        log = logger.bind(
+            job_id=str(job.id), function=job.function, attempt=job.attempts
+        )
+        try:
+            fn = _tasks[job.function]
+            async with asyncio.timeout(self.timeout):
+                await fn(**job.kwargs)
+        except Exception as exc:  # noqa: BLE001
+            error = f"{exc.__class__.__name__}: {exc}"
+            if job.attempts < job.max_attempts:
+                self._retried += 1
+                delay = self.retry_delay * 2 ** (job.attempts - 1)
+                await log.awarning("Job failed, retrying", error=error, delay=delay)
+                await self._finish(
+                    job.id,
+                    status="queued",
+                    error=error,
+                    scheduled_at=datetime.now(UTC) + timedelta(seconds=delay),
+                )
+            else:
+                self._failed += 1
+                await log.aerror("Job failed", error=error)
+                await self._finish(
+                    job.id, status="failed", error=error, completed_at=datetime.now(UTC)
+                )
+            return
+        self._completed += 1
+        await self._finish(job.id, status="complete", completed_at=datetime.now(UTC))
+        await log.ainfo("Job complete")
+
+    async def run_once(self) -> int:
+        """Claim as many due jobs as there are free slots and start them.
+
+        Returns:
+            int: Number of jobs started.
+        """
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            return 0
+        jobs = await self._claim(free)
+        for job in jobs:
+            latency = max(0.0, (job.started_at - job.scheduled_at).total_seconds())
+            self._claimed += 1
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+            running = asyncio.create_task(self._run(job))
+            self._running.add(running)
+            running.add_done_callback(self._running.discard)
+        return len(jobs)
+
+    async def join(self) -> None:
+        """Wait for the running jobs."""
+        while self._running:
+            await asyncio.wait(set(self._running))
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Run jobs until `stop` is set, then let the running ones finish."""
+        await logger.ainfo(
+            "Worker started", queue=self.queue, concurrency=self.concurrency
+        )
+        while not stop.is_set():
+            if len(self._running) >= self.concurrency:
+                await asyncio.wait(
+                    set(self._running), return_when=asyncio.FIRST_COMPLETED
+                )
+                continue
+            free = self.concurrency - len(self._running)
+            if await self.run_once() == free:
+                # the queue may hold more due jobs
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except TimeoutError:
+                pass
+        await self.join()
+        await logger.ainfo("Worker stopped", **self.stats())
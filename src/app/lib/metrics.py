@@ -0,0 +1,38 @@
+"""Process-local runtime counters.
+
+Components register a collector returning a snapshot of their counters; the
+system metrics endpoint renders every registered collector.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+__all__ = (
+    "collect",
+    "register_collector",
+)
+
+_collectors: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register_collector(name: str, collector: Callable[[], dict[str, Any]]) -> None:
+    """Register a metrics collector.
+
+    Args:
+        name: Section name the counters are reported under.
+        collector: Callable returning the current counters.
+    """
+    _collectors[name] = collector
+
+
+def collect() -> dict[str, dict[str, Any]]:
+    """Snapshot all registered collectors.
+
+    Returns:
+        dict[str, dict[str, Any]]: Counters keyed by collector name.
+    """
+    return {name: collector() for name, collector in sorted(_collectors.items())}
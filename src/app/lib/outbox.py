@@ -0,0 +1,243 @@
+"""Transactional outbox of domain events.
+
+:func:`record_event` adds an event to the session of the change it
+describes: it is flushed with the change, and exists if and only if the
+change commits. The :class:`OutboxRelay`, started by ``litestar workers
+run``, drains the outbox in batches and hands every event to the listeners
+registered with :func:`listener`.
+
+Listeners of a batch share a transaction, each event in a savepoint of its
+own: the writes of listeners commit with the removal of their event from the
+outbox, a failing event is retried on its own with an exponential backoff.
+Events of a relay which died mid-batch are claimed again once their lease is
+over: delivery is at least once, listeners with side effects outside of the
+database must be idempotent. Events are relayed in their order of creation
+but a retried event is overtaken by the later ones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+import structlog
+from sqlalchemy import delete, or_, select, update
+
+from src.app.db.models.outbox import OutboxEvent
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from src.app.config.worker import WorkerSettings
+
+    Listener = Callable[..., Awaitable[Any]]
+
+__all__ = (
+    "OutboxRelay",
+    "listener",
+    "record_event",
+)
+
+logger = structlog.get_logger()
+
+_listeners: defaultdict[str, list[Listener]] = defaultdict(list)
+
+
+def listener(event_type: str) -> Callable[[Listener], Listener]:
+    """Register a coroutine function as a listener of `event_type`.
+
+    Listeners are called with the session of the relay and the payload of
+    the event as keyword arguments, in JSON builtins.
+    """
+
+    def decorator(fn: Listener) -> Listener:
+        _listeners[event_type].append(fn)
+        return fn
+
+    return decorator
+
+
+def record_event(session: AsyncSession, event_type: str, **payload: Any) -> OutboxEvent:
+    """Add an event to `session`, committed with the session.
+
+    Args:
+        session: Session of the change the event describes.
+        event_type: Type of the event, the key of its listeners.
+        **payload: Content of the event.
+
+    Returns:
+        OutboxEvent: The pending event.
+    """
+    event = OutboxEvent(event_type=event_type, payload=msgspec.to_builtins(payload))
+    session.add(event)
+    return event
+
+
+class OutboxRelay:
+    """Hand the events of the outbox to their listeners."""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        max_attempts: int = 3,
+        retry_delay: float = 5.0,
+        lease: float = 60.0,
+    ) -> None:
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self._relayed = 0
+        self._retried = 0
+        self._failed = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: WorkerSettings,
+        session_maker: async_sessionmaker[AsyncSession],
+    ) -> OutboxRelay:
+        return cls(
+            session_maker,
+            batch_size=settings.OUTBOX_BATCH_SIZE,
+            poll_interval=settings.POLL_INTERVAL,
+            max_attempts=settings.MAX_ATTEMPTS,
+            retry_delay=settings.RETRY_DELAY,
+            lease=settings.JOB_TIMEOUT,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Event counters and lag, the wait between recorded and relayed."""
+        return {
+            "relayed": self._relayed,
+            "retried": self._retried,
+            "failed": self._failed,
+            "lag_avg": round(self._lag_total / self._relayed, 4)
+            if self._relayed
+            else 0.0,
+            "lag_max": round(self._lag_max, 4),
+        }
+
+    async def _claim(self) -> list[OutboxEvent]:
+        now = datetime.now(UTC)
+        due = (
+            select(OutboxEvent.id)
+            .where(
+                OutboxEvent.status == "pending",
+                OutboxEvent.available_at <= now,
+                or_(
+                    OutboxEvent.locked_until.is_(None),
+                    # abandoned by a relay which died
+                    OutboxEvent.locked_until < now,
+                ),
+            )
+            .order_by(OutboxEvent.created_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_maker() as session, session.begin():
+            events = await session.scalars(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(due.scalar_subquery()))
+                .values(
+                    attempts=OutboxEvent.attempts + 1,
+                    locked_until=now + timedelta(seconds=self.lease),
+                    updated_at=now,
+                )
+                .returning(OutboxEvent)
+                .execution_options(synchronize_session=False)
+            )
+            claimed = sorted(events, key=lambda event: event.created_at)
+            # detached, the attributes outlive the transaction
+            session.expunge_all()
+            return claimed
+
+    async def relay_once(self) -> int:
+        """Relay a batch of due events.
+
+        Returns:
+            int: Number of events claimed.
+        """
+        events = await self._claim()
+        if not events:
+            return 0
+        published, failures = [], []
+        async with self.session_maker() as session, session.begin():
+            for event in events:
+                try:
+                    async with session.begin_nested():
+                        for fn in _listeners[event.event_type]:
+                            await fn(session, **event.payload)
+                except Exception as exc:  # noqa: BLE001
+                    failures.append((event, f"{exc.__class__.__name__}: {exc}"))
+                else:
+                    published.append(event.id)
+            if published:
+                await session.execute(
+                    delete(OutboxEvent)
+                    .where(OutboxEvent.id.in_(published))
+                    .execution_options(synchronize_session=False)
+                )
+            now = datetime.now(UTC)
+            for event, error in failures:
+                await self._fail(session, event, error, now)
+        for event in events:
+            if event.id in published:
+                lag = max(0.0, (now - event.created_at).total_seconds())
+                self._relayed += 1
+                self._lag_total += lag
+                self._lag_max = max(self._lag_max, lag)
+        return len(events)
+
+    async def _fail(
+        self, session: AsyncSession, event: OutboxEvent, error: str, now: datetime
+    ) -> None:
+        log = logger.bind(
+            event_id=str(event.id), event_type=event.event_type, attempt=event.attempts
+        )
+        values: dict[str, Any] = {
+            "locked_until": None,
+            "error": error,
+            "updated_at": now,
+        }
+        if event.attempts < self.max_attempts:
+            self._retried += 1
+            delay = self.retry_delay * 2 ** (event.attempts - 1)
+            values["available_at"] = now + timedelta(seconds=delay)
+            await log.awarning(
+                "Event listener failed, retrying", error=error, delay=delay
+            )
+        else:
+            self._failed += 1
+            values["status"] = "failed"
+            await log.aerror("Event listener failed", error=error)
+        await session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event.id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Relay events until `stop` is set."""
+        await logger.ainfo("Outbox relay started", batch_size=self.batch_size)
+        while not stop.is_set():
+            if await self.relay_once() == self.batch_size:
+                # the outbox may hold more due events
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except TimeoutError:
+                pass
+        await logger.ainfo("Outbox relay stopped", **self.stats())
@@ -0,0 +1,334 @@
+"""Collection pagination.
+
+A cursor encodes the sort value and the primary key of the last item of a
+page. The next page is selected with a ``WHERE (column, id) > (value, id)``
+predicate instead of an ``OFFSET``, so every page costs the same index range
+scan regardless of its depth.
+
+The total of a page is computed with one of the :data:`CountMode`
+strategies, the response reports the strategy which produced it.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
+
+import msgspec
+from advanced_alchemy.filters import OrderBy, PaginationFilter
+from litestar.exceptions import ValidationException
+from litestar.serialization import decode_json
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from src.app.config.base import get_settings
+from src.app.lib import metrics
+from src.app.lib.cache import TTLCache
+from src.app.lib.schema import CamelizedBaseStruct
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from advanced_alchemy.filters import FilterTypes
+    from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
+    from sqlalchemy import ColumnElement, Select, StatementLambdaElement
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import InstrumentedAttribute
+    from sqlalchemy.sql.compiler import SQLCompiler
+
+__all__ = (
+    "CountMode",
+    "CursorPagination",
+    "Pagination",
+    "count_cache",
+    "count_total",
+    "decode_cursor",
+    "encode_cursor",
+    "list_page",
+)
+
+T = TypeVar("T")
+ModelT = TypeVar("ModelT")
+CountMode = Literal["exact", "window", "cached", "estimated"]
+"""Strategies computing the total of a paginated collection."""
+
+settings = get_settings()
+count_cache: TTLCache[str, int] = TTLCache(
+    maxsize=settings.db.COUNT_CACHE_MAX_SIZE, ttl=settings.db.COUNT_CACHE_TTL
+)
+metrics.register_collector("count_cache", count_cache.stats)
+
+
+class Pagination(CamelizedBaseStruct, Generic[T]):
+    """Container for data returned using limit/offset or cursor pagination."""
+
+    items: list[T]
+    """List of data being sent as part of the response."""
+    limit: int
+    """Maximal number of items to send."""
+    offset: int
+    """Offset from the beginning of the query (`0` for cursor pages)."""
+    total: int
+    """Total number of items."""
+    total_mode: CountMode = "exact"
+    """Strategy which produced `total`, only `exact` and `window` are exact."""
+    next_cursor: str | None = None
+    """Cursor of the next page, `None` on the last page or without cursor pagination."""
+
+
+def encode_cursor(field_name: str, value: Any, item_id: Any) -> str:
+    """Encode an opaque pagination cursor.
+
+    Args:
+        field_name: Name of the sort column.
+        value: Sort value of the last item of the page.
+        item_id: Primary key of the last item of the page.
+
+    Returns:
+        str: URL safe cursor.
+    """
+    raw = msgspec.json.encode(
+        [field_name, msgspec.to_builtins(value), msgspec.to_builtins(item_id)]
+    )
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, Any, Any]:
+    """Decode a cursor built by :func:`encode_cursor`.
+
+    Sort value and primary key are returned in their JSON form, they are
+    converted to the column types when the filter is applied.
+
+    Raises:
+        ValidationException: The cursor is malformed.
+
+    Returns:
+        tuple[str, Any, Any]: Sort column name, sort value and primary key.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        field_name, value, item_id = msgspec.json.decode(raw, type=tuple[str, Any, Any])
+    except (binascii.Error, ValueError, msgspec.DecodeError) as exc:
+        msg = "Invalid pagination cursor"
+        raise ValidationException(msg) from exc
+    return field_name, value, item_id
+
+
+@dataclass
+class CursorPagination(PaginationFilter):
+    """Data required to add keyset pagination to a query.
+
+    The statement is ordered by ``(field_name, id)`` and one extra row is
+    fetched to detect whether a next page exists, see :meth:`paginate`.
+    """
+
+    limit: int
+    """Maximal number of items of the page."""
+    cursor: str | None = None
+    """Cursor returned with the previous page, `None` for the first page."""
+    field_name: str = "created_at"
+    """Name of the model attribute to sort on, it must not be nullable."""
+    sort_order: Literal["asc", "desc"] = "desc"
+    """Sort ascending or descending."""
+
+    def _get_keyset(
+        self, model: Any
+    ) -> tuple[ColumnElement[bool] | None, tuple[Any, ...]]:
+        field = self._get_column(model, self.field_name)
+        pk = self._get_column(model, "id")
+        if self.sort_order == "desc":
+            order_by: tuple[Any, ...] = (field.desc(), pk.desc())
+        else:
+            order_by = (field.asc(), pk.asc())
+        if not self.cursor:
+            return None, order_by
+        field_name, value, item_id = decode_cursor(self.cursor)
+        if field_name != self.field_name:
+            msg = f"Pagination cursor was issued for ordering by '{field_name}'"
+            raise ValidationException(msg)
+        try:
+            value = msgspec.convert(value, field.type.python_type, strict=False)
+            item_id = msgspec.convert(item_id, pk.type.python_type, strict=False)
+        except msgspec.ValidationError as exc:
+            msg = "Invalid pagination cursor"
+            raise ValidationException(msg) from exc
+        if self.sort_order == "desc":
+            where = or_(field < value, and_(field == value, pk < item_id))
+        else:
+            where = or_(field > value, and_(field == value, pk > item_id))
+        return where, order_by
+
+    def _get_column(self, model: Any, key: str) -> InstrumentedAttribute[Any]:
+        field = getattr(model, key, None)
+        columns = getattr(getattr(field, "property", None), "columns", None)
+        if not columns:
+            msg = f"Cannot paginate on '{key}'"
+            raise ValidationException(msg)
+        if columns[0].nullable:
+            msg = f"Cannot paginate on nullable field '{key}'"
+            raise ValidationException(msg)
+        return field  # type: ignore[no-any-return]
+
+    def append_to_statement(
+        self, statement: Select[tuple[ModelT]], model: type[ModelT]
+    ) -> Select[tuple[ModelT]]:
+        where, order_by = self._get_keyset(model)
+        if where is not None:
+            statement = statement.where(where)
+        return statement.order_by(None).order_by(*order_by).limit(self.limit + 1)
+
+    def append_to_lambda_statement(
+        self,
+        statement: StatementLambdaElement,
+        model: type[ModelT],
+    ) -> StatementLambdaElement:
+        where, order_by = self._get_keyset(model)
+        if where is not None:
+            statement += lambda s: s.where(where)
+        limit = self.limit + 1
+        statement += lambda s: s.order_by(None).order_by(*order_by).limit(limit)
+        return statement
+
+    def paginate(self, items: Sequence[T]) -> tuple[list[T], str | None]:
+        """Trim the extra row fetched by the filter and build the next cursor.
+
+        Args:
+            items: Rows selected with this filter applied.
+
+        Returns:
+            tuple[list[T], str | None]: Items of the page and the cursor of the
+                next page, `None` on the last page.
+        """
+        if len(items) <= self.limit:
+            return list(items), None
+        page = list(items[: self.limit])
+        last = page[-1]
+        return page, encode_cursor(
+            self.field_name, getattr(last, self.field_name), getattr(last, "id")
+        )
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a select statement."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def _count_filters(filters: Sequence[Any]) -> list[Any]:
+    """Filters changing the total of a collection."""
+    return [f for f in filters if not isinstance(f, (PaginationFilter, OrderBy))]
+
+
+def _count_cache_key(model: type[Any], filters: Sequence[Any]) -> str:
+    return f"{model.__tablename__}:{_count_filters(filters)!r}"
+
+
+async def _estimate_count(
+    session: AsyncSession, model: type[Any], filters: Sequence[Any]
+) -> int | None:
+    """Row estimate of the PostgreSQL planner, `None` on other databases."""
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+    statement = select(model)
+    for filter_ in _count_filters(filters):
+        statement = filter_.append_to_statement(statement, model)
+    plan = (await session.execute(_Explain(statement))).scalar_one()
+    if isinstance(plan, (str, bytes)):
+        plan = decode_json(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_total(
+    service: SQLAlchemyAsyncRepositoryService[Any],
+    filters: Sequence[Any],
+    count_mode: CountMode,
+) -> tuple[int, CountMode]:
+    """Count the items of a collection, ignoring pagination.
+
+    Args:
+        service: Service of the counted model.
+        filters: Collection filters.
+        count_mode: Counting strategy, `window` is only available while
+            listing and counts exactly here.
+
+    Returns:
+        tuple[int, CountMode]: The total and the strategy which produced it.
+    """
+    repository = service.repository
+    if count_mode == "cached":
+        key = _count_cache_key(repository.model_type, filters)
+        total = count_cache.get(key)
+        if total is None:
+            total = await service.count(*filters)
+            count_cache.set(key, total)
+        return total, "cached"
+    if count_mode == "estimated":
+        total = await _estimate_count(
+            repository.session, repository.model_type, filters
+        )
+        if total is not None:
+            return total, "estimated"
+    return await service.count(*filters), "exact"
+
+
+async def list_page(
+    service: SQLAlchemyAsyncRepositoryService[Any],
+    filters: Sequence[FilterTypes | CursorPagination],
+    schema_type: type[T],
+    count_mode: CountMode = "window",
+) -> Pagination[T]:
+    """List a page of a collection with limit/offset or cursor pagination.
+
+    Args:
+        service: Service of the listed model.
+        filters: Collection filters, including at most one pagination filter.
+        schema_type: Schema the items are converted to.
+        count_mode: Strategy computing the total of the collection.
+
+    Returns:
+        Pagination[T]: The page.
+    """
+    cursor = next((f for f in filters if isinstance(f, CursorPagination)), None)
+    if cursor is None and count_mode == "window":
+        results, total = await service.list_and_count(*filters)
+        page = service.to_schema(
+            data=results, total=total, filters=filters, schema_type=schema_type
+        )
+        return Pagination(
+            items=page.items,
+            limit=page.limit,
+            offset=page.offset,
+            total=page.total,
+            total_mode="window",
+        )
+    next_cursor = None
+    results = await service.list(*filters)
+    if cursor is not None:
+        results, next_cursor = cursor.paginate(results)
+    page = service.to_schema(
+        data=results, total=0, filters=filters, schema_type=schema_type
+    )
+    offset = 0 if cursor is not None else page.offset
+    total, total_mode = await count_total(service, filters, count_mode)
+    if total_mode == "estimated":
+        # the planner may underestimate, never report less than what was listed
+        total = max(total, offset + len(page.items))
+    return Pagination(
+        items=page.items,
+        limit=cursor.limit if cursor is not None else page.limit,
+        offset=offset,
+        total=total,
+        total_mode=total_mode,
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,251 @@
+"""OpenAPI schema rendered at build time.
+
+``litestar openapi build`` renders the schema of the application as JSON and
+YAML, with gzip and, when the ``brotli`` package is installed, brotli
+variants, next to a manifest recording a fingerprint of the route table.
+
+:class:`PrebuiltSchemaMiddleware` serves those bytes from memory on the
+schema paths, with strong ETags and the encoding negotiated from
+``Accept-Encoding``. When the build is missing or its fingerprint no longer
+matches the application, requests fall through to the schema Litestar
+generates. Changes to the fields of request or response models leave the
+route table as is: rebuild the schema with the application.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+import yaml
+from litestar.datastructures import Headers
+from litestar.enums import OpenAPIMediaType, ScopeType
+from litestar.middleware import AbstractMiddleware
+from litestar.response.base import ASGIResponse
+from litestar.routes import HTTPRoute
+from litestar.serialization import encode_json, get_serializer
+from litestar.status_codes import HTTP_304_NOT_MODIFIED
+from litestar.utils.helpers import unwrap_partial
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+if TYPE_CHECKING:
+    from litestar import Litestar
+    from litestar.types import ASGIApp, Receive, Scope, Send
+
+__all__ = (
+    "MANIFEST_NAME",
+    "PrebuiltSchema",
+    "PrebuiltSchemaMiddleware",
+    "build_schema",
+    "route_fingerprint",
+)
+
+MANIFEST_NAME = "manifest.json"
+SCHEMA_FILES = {
+    "openapi.json": OpenAPIMediaType.OPENAPI_JSON.value,
+    "openapi.yaml": OpenAPIMediaType.OPENAPI_YAML.value,
+}
+_ALIASES = {"openapi.yml": "openapi.yaml"}
+_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+_APP_STATE_KEY = "prebuilt_schema"
+
+
+def route_fingerprint(app: Litestar) -> str:
+    """Digest of the documented routes, their handlers and the schema metadata."""
+    config = app.openapi_config
+    entries = [f"{config.title} {config.version}" if config else ""]
+    for route in app.routes:
+        if not isinstance(route, HTTPRoute):
+            continue
+        for handler in route.route_handlers:
+            if not handler.resolve_include_in_schema():
+                continue
+            signature = handler.parsed_fn_signature
+            entries.append(
+                " ".join(
+                    (
+                        route.path,
+                        ",".join(sorted(handler.http_methods)),
+                        f"{unwrap_partial(handler.fn).__module__}.{handler.handler_name}",
+                        repr(signature.return_type.annotation),
+                        *(
+                            f"{name}:{parameter.annotation!r}"
+                            for name, parameter in sorted(signature.parameters.items())
+                        ),
+                    )
+                )
+            )
+    return hashlib.sha256("\n".join(sorted(entries)).encode()).hexdigest()
+
+
+def _render(app: Litestar) -> dict[str, bytes]:
+    serializer = get_serializer(app.type_encoders)
+    schema = app.openapi_schema.to_schema()
+    return {
+        "openapi.json": encode_json(schema, serializer=serializer),
+        "openapi.yaml": yaml.dump(
+            msgspec.to_builtins(schema, enc_hook=serializer), default_flow_style=False
+        ).encode("utf-8"),
+    }
+
+
+def _compress(content: bytes) -> dict[str, bytes]:
+    variants = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content, mode=brotli.MODE_TEXT, quality=11)
+    return variants
+
+
+def build_schema(app: Litestar, directory: Path) -> dict[str, Any]:
+    """Render the schema of `app` into `directory`.
+
+    Returns:
+        dict[str, Any]: The manifest, also written to `directory`.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest: dict[str, Any] = {"fingerprint": route_fingerprint(app), "files": {}}
+    for name, content in _render(app).items():
+        (directory / name).write_bytes(content)
+        variants = _compress(content)
+        for encoding, compressed in variants.items():
+            (directory / f"{name}{_SUFFIXES[encoding]}").write_bytes(compressed)
+        manifest["files"][name] = {
+            "etag": hashlib.sha256(content).hexdigest()[:32],
+            "size": len(content),
+            "encodings": {
+                encoding: len(compressed) for encoding, compressed in variants.items()
+            },
+        }
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted: set[str] = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+@dataclass
+class _Representation:
+    media_type: str
+    etag: str
+    content: dict[str | None, bytes] = field(default_factory=dict)
+    """Bytes keyed by content coding, `None` for identity."""
+
+    def select(self, accept_encoding: str) -> tuple[str | None, bytes]:
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.content and (encoding in accepted or "*" in accepted):
+                return encoding, self.content[encoding]
+        return None, self.content[None]
+
+    def tag(self, encoding: str | None) -> str:
+        return f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+
+
+class PrebuiltSchema:
+    """Schema files of a build matching the running application."""
+
+    def __init__(self, representations: dict[str, _Representation]) -> None:
+        self.representations = representations
+
+    @classmethod
+    def load(cls, directory: Path, fingerprint: str) -> PrebuiltSchema | None:
+        """Read a build, `None` when missing or built for other routes."""
+        try:
+            manifest = json.loads((directory / MANIFEST_NAME).read_text())
+            if manifest["fingerprint"] != fingerprint:
+                return None
+            representations = {}
+            for name, entry in manifest["files"].items():
+                representation = _Representation(
+                    media_type=SCHEMA_FILES[name], etag=entry["etag"]
+                )
+                representation.content[None] = (directory / name).read_bytes()
+                for encoding in entry["encodings"]:
+                    representation.content[encoding] = (
+                        directory / f"{name}{_SUFFIXES[encoding]}"
+                    ).read_bytes()
+                representations[name] = representation
+        except (OSError, KeyError, ValueError):
+            return None
+        return cls(representations)
+
+    def response(self, name: str, scope: Scope) -> ASGIResponse | None:
+        representation = self.representations.get(_ALIASES.get(name, name))
+        if representation is None:
+            return None
+        headers = Headers.from_scope(scope)
+        encoding, content = representation.select(headers.get("accept-encoding", ""))
+        etag = representation.tag(encoding)
+        response_headers = {"etag": etag, "vary": "Accept-Encoding"}
+        if encoding:
+            response_headers["content-encoding"] = encoding
+        if_none_match = headers.get("if-none-match", "")
+        if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            return ASGIResponse(
+                status_code=HTTP_304_NOT_MODIFIED, headers=response_headers
+            )
+        return ASGIResponse(
+            body=content,
+            media_type=representation.media_type,
+            headers=response_headers,
+            is_head_response=scope["method"] == "HEAD",
+        )
+
+
+class PrebuiltSchemaMiddleware(AbstractMiddleware):
+    """Serve the schema files of a build matching the application."""
+
+    def __init__(self, app: ASGIApp, directory: Path) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: The next ASGI application.
+            directory: Output directory of ``litestar openapi build``.
+        """
+        super().__init__(app, scopes={ScopeType.HTTP})
+        self.directory = directory
+
+    def _get_schema(self, litestar_app: Litestar) -> PrebuiltSchema | None:
+        state = litestar_app.state
+        if _APP_STATE_KEY not in state:
+            # once per application, the route table is final by now
+            state[_APP_STATE_KEY] = PrebuiltSchema.load(
+                self.directory, route_fingerprint(litestar_app)
+            )
+        return state[_APP_STATE_KEY]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        litestar_app = scope["app"]
+        config = litestar_app.openapi_config
+        directory, _, name = scope["path"].rpartition("/")
+        if (
+            config is not None
+            and scope["method"] in {"GET", "HEAD"}
+            and directory == (config.path or "/schema")
+            and (name in SCHEMA_FILES or name in _ALIASES)
+            and (schema := self._get_schema(litestar_app)) is not None
+            and (response := schema.response(name, scope)) is not None
+        ):
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
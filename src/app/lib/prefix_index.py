@@ -0,0 +1,158 @@
+"""In-process prefix index."""
+
+from __future__ import annotations
+
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = ("PrefixIndex",)
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class PrefixIndex(Generic[K, V]):
+    """Sorted array of lowercased terms answering prefix lookups with bisect.
+
+    Every document is stored under a key, with a value returned by
+    :meth:`search` and the terms it is found by. The index is meant to be used
+    from the event loop thread and does not lock.
+    """
+
+    __slots__ = (
+        "_docs",
+        "_keys",
+        "_size",
+        "_terms",
+        "build_seconds",
+        "built_at",
+        "lookups",
+    )
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every document, the index is no longer built."""
+        self._terms: list[str] = []
+        self._keys: list[K] = []
+        self._docs: dict[K, tuple[V, tuple[str, ...]]] = {}
+        self._size = 0
+        self.build_seconds = 0.0
+        self.built_at: float | None = None
+        self.lookups = 0
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _normalize(terms: Iterable[str]) -> tuple[str, ...]:
+        normalized: dict[str, None] = {}
+        for term in terms:
+            lowered = term.strip().lower() if term else ""
+            # keep the given string when already normalized, it is usually
+            # also referenced by the value
+            normalized[term if lowered == term else lowered] = None
+        normalized.pop("", None)
+        return tuple(normalized)
+
+    @staticmethod
+    def _sizeof(value: V, terms: tuple[str, ...]) -> int:
+        items = value if isinstance(value, tuple) else (value,)
+        ids = {id(item) for item in items}
+        return sum(sys.getsizeof(item) for item in items) + sum(
+            sys.getsizeof(term) for term in terms if id(term) not in ids
+        )
+
+    def build(self, documents: Iterable[tuple[K, V, Iterable[str]]]) -> None:
+        """Replace the content of the index.
+
+        Args:
+            documents: Key, value and terms of every document.
+        """
+        started = time.perf_counter()
+        docs: dict[K, tuple[V, tuple[str, ...]]] = {}
+        entries: list[tuple[str, K]] = []
+        size = 0
+        for key, value, terms in documents:
+            normalized = self._normalize(terms)
+            docs[key] = (value, normalized)
+            entries.extend((term, key) for term in normalized)
+            size += self._sizeof(value, normalized)
+        entries.sort(key=lambda entry: entry[0])
+        self._terms = [term for term, _ in entries]
+        self._keys = [key for _, key in entries]
+        self._docs = docs
+        self._size = size
+        self.build_seconds = time.perf_counter() - started
+        self.built_at = time.time()
+
+    def add(self, key: K, value: V, terms: Iterable[str]) -> None:
+        """Add a document, replacing the one stored under `key`."""
+        self.remove(key)
+        normalized = self._normalize(terms)
+        for term in normalized:
+            position = bisect_right(self._terms, term)
+            self._terms.insert(position, term)
+            self._keys.insert(position, key)
+        self._docs[key] = (value, normalized)
+        self._size += self._sizeof(value, normalized)
+
+    def remove(self, key: K) -> None:
+        """Remove the document stored under `key`, if any."""
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        value, terms = doc
+        for term in terms:
+            position = bisect_left(self._terms, term)
+            while position < len(self._terms) and self._terms[position] == term:
+                if self._keys[position] == key:
+                    del self._terms[position]
+                    del self._keys[position]
+                    break
+                position += 1
+        self._size -= self._sizeof(value, terms)
+
+    def search(self, prefix: str, limit: int) -> list[V]:
+        """Values of at most `limit` documents with a term starting with `prefix`.
+
+        Documents are ordered by their first matching term.
+        """
+        self.lookups += 1
+        prefix = prefix.strip().lower()
+        results: list[V] = []
+        seen: set[K] = set()
+        position = bisect_left(self._terms, prefix)
+        while len(results) < limit and position < len(self._terms):
+            if not self._terms[position].startswith(prefix):
+                break
+            key = self._keys[position]
+            if key not in seen:
+                seen.add(key)
+                results.append(self._docs[key][0])
+            position += 1
+        return results
+
+    def stats(self) -> dict[str, Any]:
+        """Size, approximate memory use and build time of the index."""
+        return {
+            "documents": len(self._docs),
+            "terms": len(self._terms),
+            "memory_bytes": self._size
+            + sys.getsizeof(self._terms)
+            + sys.getsizeof(self._keys)
+            + sys.getsizeof(self._docs),
+            "build_seconds": round(self.build_seconds, 3),
+            "built_at": self.built_at,
+            "lookups": self.lookups,
+        }
@@ -0,0 +1,202 @@
+"""Per-request SQL statement statistics.
+
+Engines instrumented with :func:`instrument_engine` report every statement to
+the collectors opened with :func:`track_queries` in the current context.
+:class:`QueryStatsMiddleware` opens one per HTTP request: the counters are
+bound to the structlog context of the request and, in debug mode, returned
+in response headers. Statements sharing a fingerprint more than
+`N_PLUS_ONE_THRESHOLD` times in a request are logged as a probable N+1.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from litestar.datastructures import MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.middleware import AbstractMiddleware
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from litestar.types import ASGIApp, Message, Receive, Scope, Send
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = (
+    "N_PLUS_ONE_THRESHOLD",
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "fingerprint",
+    "instrument_engine",
+    "track_queries",
+)
+
+logger = structlog.get_logger()
+
+N_PLUS_ONE_THRESHOLD = 5
+"""Executions of a single statement fingerprint reported as an N+1."""
+STATEMENTS_HEADER = "x-db-statements"
+DURATION_HEADER = "x-db-duration-ms"
+REPEATED_HEADER = "x-db-repeated-statements"
+_TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA")
+_START_KEY = "query_stats_started_at"
+_SUMMARY_KEYS = ("db_statements", "db_duration_ms", "db_repeated_statements")
+_PARAMETER_LISTS = re.compile(
+    r"\(\s*(?:\?|\$\d+|%\(\w+\)s)(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s))*\s*\)"
+)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+_collectors: ContextVar[tuple[QueryStats, ...]] = ContextVar(
+    "query_stats_collectors", default=()
+)
+
+
+def fingerprint(statement: str) -> str:
+    """`statement` with its literals and expanded parameter lists collapsed."""
+    statement = _LITERALS.sub("?", statement)
+    statement = _PARAMETER_LISTS.sub("(...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while the collector was open.
+
+    Transaction control statements are not counted.
+    """
+
+    statements: list[str] = field(default_factory=list)
+    duration: float = 0.0
+    """Seconds spent executing the statements."""
+    fingerprints: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def repeated(self) -> dict[str, int]:
+        """Fingerprints executed more than once, most frequent first."""
+        return {
+            statement: count
+            for statement, count in self.fingerprints.most_common()
+            if count > 1
+        }
+
+    def record(self, statement: str, duration: float) -> None:
+        self.statements.append(statement)
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Counters bound to the log context of a request."""
+        return {
+            "db_statements": self.count,
+            "db_duration_ms": round(self.duration * 1000, 2),
+            "db_repeated_statements": max(self.fingerprints.values(), default=0),
+        }
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed in the current context.
+
+    Collectors nest: a statement is reported to every open collector.
+    """
+    stats = QueryStats()
+    token = _collectors.set((*_collectors.get(), stats))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if _collectors.get():
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    collectors = _collectors.get()
+    if not collectors or not conn.info.get(_START_KEY):
+        return
+    duration = time.perf_counter() - conn.info[_START_KEY].pop()
+    if statement.lstrip().upper().startswith(_TRANSACTION_CONTROL):
+        return
+    for stats in collectors:
+        stats.record(statement, duration)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Report the statements of `engine` to the open collectors."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware(AbstractMiddleware):
+    """Collect the statements of every HTTP request."""
+
+    def __init__(self, app: ASGIApp, expose_headers: bool = False) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: The next ASGI application.
+            expose_headers: Return the counters in the response headers.
+        """
+        super().__init__(app, scopes={ScopeType.HTTP})
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        with track_queries() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    summary = stats.summary()
+                    structlog.contextvars.bind_contextvars(**summary)
+                    if self.expose_headers:
+                        headers = MutableScopeHeaders.from_message(message)
+                        headers[STATEMENTS_HEADER] = str(summary["db_statements"])
+                        headers[DURATION_HEADER] = str(summary["db_duration_ms"])
+                        headers[REPEATED_HEADER] = str(
+                            summary["db_repeated_statements"]
+                        )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                structlog.contextvars.unbind_contextvars(*_SUMMARY_KEYS)
+            repeated = {
+                statement: count
+                for statement, count in stats.repeated.items()
+                if count > N_PLUS_ONE_THRESHOLD
+            }
+            if repeated:
+                await logger.awarning(
+                    "Repeated statements, probable N+1",
+                    path=scope["path"],
+                    repeated=repeated,
+                )
@@ -0,0 +1,215 @@
+"""Sliding window rate limits.
+
+A :class:`RateLimiter` counts hits per key in fixed windows and estimates the
+rate over the last `window` seconds as the count of the current window plus
+the count of the previous one, weighted by the share of it still inside the
+sliding window. Two counters per key, whatever the rate.
+
+Every hit is counted, rejected ones included: a client which keeps hammering
+stays limited, one which honours ``Retry-After`` gets through.
+
+The counters live in a :class:`MemoryRateLimitBackend`, local to the worker,
+or in a :class:`RedisRateLimitBackend` shared by all workers. The Redis
+backend increments and reads the counters of a hit in a single
+``MULTI``/``EXEC`` transaction, atomic across workers.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol
+
+from src.app.lib.exceptions import TooManyRequestsError
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from redis.asyncio import Redis
+
+__all__ = (
+    "MemoryRateLimitBackend",
+    "RateLimitBackend",
+    "RateLimitRule",
+    "RateLimiter",
+    "RedisRateLimitBackend",
+)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """At most `limit` hits per `window` seconds and per value of `name`."""
+
+    name: str
+    limit: int
+    window: int
+
+
+class RateLimitBackend(Protocol):
+    async def hit(
+        self, counters: Sequence[tuple[str, str, int]]
+    ) -> list[tuple[int, int]]:
+        """Increment counters and read the counters of the previous windows.
+
+        Args:
+            counters: Keys of the previous and of the current window, and
+                seconds the current one must be kept.
+
+        Returns:
+            list[tuple[int, int]]: Previous and incremented current counts,
+                in the order of `counters`.
+        """
+        ...
+
+    async def clear(self) -> None:
+        """Drop every counter."""
+        ...
+
+
+class MemoryRateLimitBackend:
+    """Counters local to the worker."""
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        self.maxsize = maxsize
+        self._counters: dict[str, tuple[float, int]] = {}
+
+    def _purge(self, now: float) -> None:
+        self._counters = {
+            key: entry for key, entry in self._counters.items() if entry[0] > now
+        }
+        while len(self._counters) >= self.maxsize:
+            # the oldest counters first, dicts keep the insertion order
+            del self._counters[next(iter(self._counters))]
+
+    async def hit(
+        self, counters: Sequence[tuple[str, str, int]]
+    ) -> list[tuple[int, int]]:
+        now = time.monotonic()
+        if len(self._counters) >= self.maxsize:
+            self._purge(now)
+        counts = []
+        for previous_key, key, expires_in in counters:
+            previous = self._counters.get(previous_key, (0.0, 0))
+            expires_at, current = self._counters.get(key, (now + expires_in, 0))
+            self._counters[key] = (expires_at, current + 1)
+            counts.append((previous[1] if previous[0] > now else 0, current + 1))
+        return counts
+
+    async def clear(self) -> None:
+        self._counters.clear()
+
+
+class RedisRateLimitBackend:
+    """Counters shared by all workers."""
+
+    def __init__(self, redis: Redis, namespace: str = "rate-limit") -> None:
+        self.redis = redis
+        self.namespace = namespace
+
+    async def hit(
+        self, counters: Sequence[tuple[str, str, int]]
+    ) -> list[tuple[int, int]]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for previous_key, key, expires_in in counters:
+                pipe.get(f"{self.namespace}:{previous_key}")
+                pipe.incr(f"{self.namespace}:{key}")
+                pipe.expire(f"{self.namespace}:{key}", expires_in)
+            results = await pipe.execute()
+        return [
+            (int(results[i] or 0), int(results[i + 1]))
+            for i in range(0, len(results), 3)
+        ]
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.redis.scan_iter(f"{self.namespace}:*")]
+        if keys:
+            await self.redis.delete(*keys)
+
+
+def _retry_after(
+    previous: int, current: int, rule: RateLimitRule, elapsed: float
+) -> float:
+    """Seconds until a hit fits in `rule` again, if no other hit comes."""
+    room = rule.limit - current - 1
+    if room >= 0 and previous:
+        # the previous window slides out
+        return rule.window * (1 - room / previous) - elapsed
+    # the current window becomes the previous one
+    return (
+        rule.window - elapsed + rule.window * max(0.0, 1 - (rule.limit - 1) / current)
+    )
+
+
+class RateLimiter:
+    """Enforce sliding window rules, each keyed by a value of the hit."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        rules: Sequence[RateLimitRule],
+        enabled: bool = True,
+    ) -> None:
+        self.backend = backend
+        self.rules = rules
+        self.enabled = enabled
+        self._allowed = 0
+        self._rejected: Counter[str] = Counter()
+
+    def stats(self) -> dict[str, Any]:
+        """Allowed and rejected hits, the rejections per rule."""
+        return {
+            "enabled": self.enabled,
+            "allowed": self._allowed,
+            "rejected": sum(self._rejected.values()),
+            **{
+                f"rejected_by_{rule.name}": self._rejected[rule.name]
+                for rule in self.rules
+            },
+        }
+
+    async def hit(self, values: Mapping[str, str | None]) -> None:
+        """Count a hit against every rule.
+
+        Args:
+            values: Value of the hit for each rule name, rules without a
+                value are skipped.
+
+        Raises:
+            TooManyRequestsError: A rule is exceeded, with the number of
+                seconds before the hit would fit in every rule.
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        rules, counters = [], []
+        for rule in self.rules:
+            if (value := values.get(rule.name)) is None:
+                continue
+            window = int(now // rule.window)
+            rules.append(rule)
+            counters.append(
+                (
+                    f"{rule.name}:{value}:{window - 1}",
+                    f"{rule.name}:{value}:{window}",
+                    rule.window * 2,
+                )
+            )
+        counts = await self.backend.hit(counters)
+        waits = []
+        for rule, (previous, current) in zip(rules, counts, strict=True):
+            elapsed = now % rule.window
+            if previous * (1 - elapsed / rule.window) + current > rule.limit:
+                self._rejected[rule.name] += 1
+                waits.append(_retry_after(previous, current, rule, elapsed))
+        if waits:
+            raise TooManyRequestsError(
+                detail="Too many attempts, retry later",
+                retry_after=max(1, math.ceil(round(max(waits), 3))),
+            )
+        self._allowed += 1
+
+    async def clear(self) -> None:
+        """Drop every counter, the statistics are kept."""
+        await self.backend.clear()
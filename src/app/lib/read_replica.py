@@ -0,0 +1,124 @@
+"""Routing of read statements to a read replica.
+
+Sessions created by :class:`ReplicaAsyncConfig` route their statements with
+:class:`RoutingSession`:
+
+- sessions of requests with a safe method (``GET``, ``HEAD``, ``OPTIONS``)
+  read from the replica, as do the statements run within
+  :func:`reading_from_replica` and those carrying the :data:`USE_REPLICA`
+  execution option;
+- flushes, DML statements and ``SELECT ... FOR UPDATE`` always run on the
+  primary, and every later statement of the session stays there, so a
+  request reads its own writes;
+- with :data:`READ_UNTIL_WRITE`, the sessions of the other requests read from
+  the replica until their first write too. It is meant for replicas which
+  never lag, such as the reader connections of the SQLite ``performance``
+  profile: the single writer connection is only taken at the first flush.
+
+The replica may lag behind the primary, a client writing then reading in
+two requests can observe the previous state.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from advanced_alchemy.extensions.litestar import SQLAlchemyAsyncConfig
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from litestar.datastructures import State
+    from litestar.types import Scope
+    from sqlalchemy import Engine
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+__all__ = (
+    "READ_ONLY",
+    "READ_UNTIL_WRITE",
+    "REPLICA_ENGINE",
+    "USE_REPLICA",
+    "ReplicaAsyncConfig",
+    "RoutingSession",
+    "mark_read_only",
+    "reading_from_replica",
+)
+
+REPLICA_ENGINE = "replica_engine"
+"""Session `info` key holding the sync engine of the replica."""
+READ_ONLY = "read_only"
+"""Session `info` key, `True` when every read may use the replica."""
+READ_UNTIL_WRITE = "read_until_write"
+"""Session `info` key, `True` when the reads preceding the first write may use
+the replica."""
+USE_REPLICA = "use_replica"
+"""Execution option sending a single select to the replica.
+
+Options are not part of the cache key of lambda statements, use
+:func:`reading_from_replica` for the statements of repositories.
+"""
+_PINNED = "pinned_to_primary"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RoutingSession(Session):
+    """Session sending reads to the engine stored under :data:`REPLICA_ENGINE`."""
+
+    def get_bind(
+        self, mapper: Any = None, clause: Any = None, **kw: Any
+    ) -> Engine | Any:
+        replica = self.info.get(REPLICA_ENGINE)
+        if replica is None or self.info.get(_PINNED):
+            return super().get_bind(mapper, clause=clause, **kw)
+        if (
+            self._flushing
+            or isinstance(clause, UpdateBase)
+            or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            self.info[_PINNED] = True
+            return super().get_bind(mapper, clause=clause, **kw)
+        if (
+            self.info.get(READ_ONLY)
+            or self.info.get(READ_UNTIL_WRITE)
+            or (clause is not None and clause.get_execution_options().get(USE_REPLICA))
+        ):
+            return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def mark_read_only(session: AsyncSession | Session) -> None:
+    """Let every read of `session` use the replica."""
+    session.info[READ_ONLY] = True
+
+
+@contextmanager
+def reading_from_replica(session: AsyncSession | Session) -> Iterator[None]:
+    """Let the reads of `session` use the replica within the block.
+
+    A session already pinned to the primary keeps reading from it.
+    """
+    read_only = session.info.get(READ_ONLY, False)
+    session.info[READ_ONLY] = True
+    try:
+        yield
+    finally:
+        session.info[READ_ONLY] = read_only
+
+
+@dataclass
+class ReplicaAsyncConfig(SQLAlchemyAsyncConfig):
+    """Hand sessions reading from the replica to requests with a safe method.
+
+    The replica engine is set in the ``info`` of the session config, without it
+    every statement runs on the primary.
+    """
+
+    def provide_session(self, state: State, scope: Scope) -> AsyncSession:
+        session = super().provide_session(state, scope)
+        if scope.get("method") in SAFE_METHODS:
+            mark_read_only(session)
+        return session
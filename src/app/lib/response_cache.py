@@ -0,0 +1,185 @@
+"""Response cache stores with tag based invalidation.
+
+Cached responses are tagged through their cache key: keys built by
+:func:`build_cache_key` embed the tags of the route, and the stores index
+every key under its tags so that :meth:`invalidate_tags` can drop all the
+entries of a tag at once.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections import defaultdict
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
+
+from litestar.stores.memory import MemoryStore
+from litestar.stores.redis import RedisStore
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import timedelta
+
+    from litestar import Litestar
+    from litestar.stores.base import Store
+
+    from src.app.config.base import Settings
+
+__all__ = (
+    "TaggedMemoryStore",
+    "TaggedRedisStore",
+    "TaggedStore",
+    "build_cache_key",
+    "create_response_cache_store",
+    "invalidate_cache_tags",
+)
+
+_TAGS_MARKER = "tags="
+
+
+def build_cache_key(prefix: str, tags: Iterable[str], request_key: str) -> str:
+    """Build a cache key carrying the tags of the cached response.
+
+    Args:
+        prefix: Application prefix of the key.
+        tags: Tags of the cached response.
+        request_key: Key identifying the request.
+
+    Returns:
+        str: The cache key.
+    """
+    if not tags:
+        return f"{prefix}:{request_key}"
+    return f"{prefix}:{_TAGS_MARKER}{','.join(sorted(tags))}:{request_key}"
+
+
+def get_key_tags(key: str) -> list[str]:
+    """Extract the tags of a key built by :func:`build_cache_key`."""
+    _, _, rest = key.partition(":")
+    if not rest.startswith(_TAGS_MARKER):
+        return []
+    tags, _, _ = rest[len(_TAGS_MARKER) :].partition(":")
+    return tags.split(",")
+
+
+@runtime_checkable
+class TaggedStore(Protocol):
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry stored under any of `tags`.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        ...
+
+
+class TaggedMemoryStore(MemoryStore):
+    """Process local store, used when Redis is not enabled."""
+
+    __slots__ = ("_tags",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._tags: defaultdict[str, set[str]] = defaultdict(set)
+
+    async def set(
+        self, key: str, value: str | bytes, expires_in: int | timedelta | None = None
+    ) -> None:
+        await super().set(key, value, expires_in=expires_in)
+        for tag in get_key_tags(key):
+            self._tags[tag].add(key)
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        deleted = 0
+        for tag in tags:
+            for key in self._tags.pop(tag, set()):
+                if await self.exists(key):
+                    deleted += 1
+                await self.delete(key)
+        return deleted
+
+
+class TaggedRedisStore(RedisStore):
+    """Redis store shared by all workers, values are zlib compressed.
+
+    Every tag is a Redis set holding the keys stored under it. The set expires
+    together with the last entry added to it.
+    """
+
+    __slots__ = ()
+
+    def _make_tag_key(self, tag: str) -> str:
+        return self._make_key(f"{_TAGS_MARKER}{tag}")
+
+    async def set(
+        self, key: str, value: str | bytes, expires_in: int | timedelta | None = None
+    ) -> None:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        data = zlib.compress(value)
+        tags = get_key_tags(key)
+        if not tags:
+            await super().set(key, data, expires_in=expires_in)
+            return
+        redis_key = self._make_key(key)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(redis_key, data, ex=expires_in)
+            for tag in tags:
+                tag_key = self._make_tag_key(tag)
+                pipe.sadd(tag_key, redis_key)
+                if expires_in is not None:
+                    pipe.expire(tag_key, expires_in)
+            await pipe.execute()
+
+    async def get(
+        self, key: str, renew_for: int | timedelta | None = None
+    ) -> bytes | None:
+        data = await super().get(key, renew_for=renew_for)
+        return None if data is None else zlib.decompress(data)
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        tag_keys = [self._make_tag_key(tag) for tag in tags]
+        keys: set[bytes] = set()
+        for tag_key in tag_keys:
+            keys.update(await self._redis.smembers(tag_key))
+        if not keys:
+            await self._redis.delete(*tag_keys)
+            return 0
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*keys)
+            pipe.delete(*tag_keys)
+            deleted, _ = await pipe.execute()
+        return int(deleted)
+
+
+def create_response_cache_store(settings: Settings) -> Store:
+    """Create the store of cached responses.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        Store: A Redis store shared by all workers when Redis is enabled, a
+            process local store otherwise.
+    """
+    if settings.redis.ENABLED:
+        return TaggedRedisStore(
+            settings.redis.get_client(),
+            namespace=f"{settings.app.slug}-response-cache",
+        )
+    return TaggedMemoryStore()
+
+
+async def invalidate_cache_tags(app: Litestar, *tags: str) -> int:
+    """Drop the cached responses stored under `tags`.
+
+    Args:
+        app: The application owning the response cache.
+        *tags: Tags to invalidate.
+
+    Returns:
+        int: The number of deleted entries.
+    """
+    store = app.response_cache_config.get_store_from_app(app)
+    if not isinstance(store, TaggedStore):
+        return 0
+    return await store.invalidate_tags(*tags)
@@ -0,0 +1,284 @@
+"""Index backed text search.
+
+Models listing their searchable columns in ``__searchable_columns__`` get
+supporting indexes with :func:`register_search_indexes`:
+
+- on PostgreSQL, a ``pg_trgm`` GIN index per column, which serves the
+  ``LIKE`` / ``ILIKE '%term%'`` predicates and ranks rows by similarity;
+- on SQLite, an FTS5 table using the ``trigram`` tokenizer, kept in sync with
+  the model table by triggers and ranked with ``bm25``.
+
+Other databases, and terms shorter than a trigram, fall back to a plain
+``LIKE`` scan.
+
+The indexes are created with the tables, :func:`ensure_search_indexes` adds
+them to the tables of a database created earlier.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from advanced_alchemy.filters import SearchFilter
+from litestar.exceptions import ValidationException
+from sqlalchemy import DDL, and_, event, func, inspect, literal_column, or_, table
+
+if TYPE_CHECKING:
+    from sqlalchemy import (
+        ColumnElement,
+        Connection,
+        Select,
+        StatementLambdaElement,
+        Table,
+    )
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.sql.expression import TableClause
+
+__all__ = (
+    "MIN_INDEXED_TERM_LENGTH",
+    "RankedSearchFilter",
+    "create_search_indexes",
+    "ensure_search_indexes",
+    "fts_table_name",
+    "register_search_indexes",
+)
+
+ModelT = TypeVar("ModelT")
+MIN_INDEXED_TERM_LENGTH = 3
+"""Terms shorter than a trigram cannot be looked up in the indexes."""
+_searchable_tables: dict[str, tuple[str, ...]] = {}
+"""Searchable columns of the tables given to `register_search_indexes`."""
+
+
+def fts_table_name(table_name: str) -> str:
+    """Name of the SQLite FTS5 table indexing `table_name`."""
+    return f"{table_name}_fts"
+
+
+def _sqlite_ddl(table_name: str, columns: tuple[str, ...]) -> list[str]:
+    fts = fts_table_name(table_name)
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new});"
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.rowid, {old});"
+    )
+    return [
+        (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, "
+            f"content='{table_name}', content_rowid='rowid', tokenize='trigram')"
+        ),
+        (
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} "
+            f"BEGIN {insert_new} END"
+        ),
+        (
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} "
+            f"BEGIN {delete_old} END"
+        ),
+        (
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} "
+            f"ON {table_name} BEGIN {delete_old} {insert_new} END"
+        ),
+        # index the rows inserted before the table was created
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def _postgresql_ddl(table_name: str, columns: tuple[str, ...]) -> list[str]:
+    return [
+        (
+            f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{column}_trgm "
+            f"ON {table_name} USING gin ({column} gin_trgm_ops)"
+        )
+        for column in columns
+    ]
+
+
+def register_search_indexes(model: type[Any]) -> None:
+    """Create and drop the search indexes of `model` together with its table.
+
+    The SQLite FTS5 table references the implicit ``rowid`` of the model
+    table, which ``VACUUM`` may renumber: rebuild the index afterwards with
+    ``INSERT INTO <table>_fts(<table>_fts) VALUES ('rebuild')``.
+
+    Args:
+        model: Model declaring ``__searchable_columns__``.
+    """
+    model_table: Table = model.__table__
+    table_name = model_table.name
+    columns = tuple(model.__searchable_columns__)
+    _searchable_tables[table_name] = columns
+    event.listen(
+        model_table,
+        "before_create",
+        DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+    )
+    for statement in _postgresql_ddl(table_name, columns):
+        event.listen(
+            model_table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+    for statement in _sqlite_ddl(table_name, columns):
+        event.listen(
+            model_table, "after_create", DDL(statement).execute_if(dialect="sqlite")
+        )
+    event.listen(
+        model_table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts_table_name(table_name)}").execute_if(
+            dialect="sqlite"
+        ),
+    )
+
+
+def create_search_indexes(connection: Connection) -> list[str]:
+    """Create the missing search indexes of the existing searchable tables.
+
+    Every statement is idempotent. On SQLite, the FTS5 table, its triggers and
+    its backfill only run when the FTS5 table is missing.
+
+    Args:
+        connection: Connection of the database.
+
+    Returns:
+        list[str]: Names of the tables whose indexes were created.
+    """
+    dialect = connection.dialect.name
+    if dialect not in {"postgresql", "sqlite"}:
+        return []
+    inspector = inspect(connection)
+    created: list[str] = []
+    for table_name, columns in _searchable_tables.items():
+        if not inspector.has_table(table_name):
+            continue
+        if dialect == "sqlite":
+            if inspector.has_table(fts_table_name(table_name)):
+                continue
+            statements = _sqlite_ddl(table_name, columns)
+        else:
+            statements = [
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                *_postgresql_ddl(table_name, columns),
+            ]
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+        created.append(table_name)
+    return created
+
+
+async def ensure_search_indexes(engine: AsyncEngine) -> list[str]:
+    """`on_startup` hook running :func:`create_search_indexes` on `engine`."""
+    async with engine.begin() as connection:
+        return await connection.run_sync(create_search_indexes)
+
+
+def _fts_phrase(field_names: list[str], value: str) -> str:
+    """FTS5 query matching `value` as a substring of any of `field_names`."""
+    phrase = '"' + value.replace('"', '""') + '"'
+    return f"{{{' '.join(field_names)}}} : {phrase}"
+
+
+@dataclass
+class RankedSearchFilter(SearchFilter):
+    """Search the ``__searchable_columns__`` of a model through its indexes.
+
+    Matching rows are ordered by relevance unless `rank` is disabled. Fields
+    must be listed in ``__searchable_columns__``, an empty `field_name`
+    searches all of them. Without `ignore_case`, the matches of the index
+    lookup are filtered on their case.
+    """
+
+    rank: bool = True
+    """Order the matching rows by relevance, best first."""
+    dialect_name: str = "sqlite"
+    """Dialect of the searched database, selects the index lookup."""
+
+    def _get_field_names(self, model: Any) -> list[str]:
+        searchable = getattr(model, "__searchable_columns__", ())
+        field_names = sorted(self.normalized_field_names or searchable)
+        if unknown := [name for name in field_names if name not in searchable]:
+            msg = f"Cannot search on {', '.join(repr(name) for name in unknown)}"
+            raise ValidationException(msg)
+        return field_names
+
+    def _get_fts_lookup(
+        self, model: Any, field_names: list[str]
+    ) -> tuple[TableClause, ColumnElement[bool], ColumnElement[bool]]:
+        table_name = model.__tablename__
+        fts = table(fts_table_name(table_name))
+        onclause = literal_column(f"{fts.name}.rowid") == literal_column(
+            f"{table_name}.rowid"
+        )
+        where = literal_column(fts.name).match(_fts_phrase(field_names, self.value))
+        if not self.ignore_case:
+            # the trigram tokenizer folds the case, the matches are filtered
+            where = and_(where, self._case_sensitive_match(model, field_names))
+        return fts, onclause, where
+
+    def _case_sensitive_match(
+        self, model: Any, field_names: list[str]
+    ) -> ColumnElement[bool]:
+        """`LIKE` ignores the case of ASCII letters on SQLite, `instr` does not."""
+        fields = [self._get_instrumented_attr(model, name) for name in field_names]
+        return or_(*(func.instr(field, self.value) > 0 for field in fields))
+
+    def _get_like_lookup(
+        self, model: Any, field_names: list[str]
+    ) -> tuple[ColumnElement[bool], Any]:
+        fields = [self._get_instrumented_attr(model, name) for name in field_names]
+        if self.ignore_case:
+            where = or_(
+                *(field.icontains(self.value, autoescape=True) for field in fields)
+            )
+        elif self.dialect_name == "sqlite":
+            where = self._case_sensitive_match(model, field_names)
+        else:
+            where = or_(
+                *(field.contains(self.value, autoescape=True) for field in fields)
+            )
+        similarity = func.greatest(
+            *(func.similarity(field, self.value) for field in fields)
+        )
+        return where, similarity.desc()
+
+    def _use_fts(self) -> bool:
+        return (
+            self.dialect_name == "sqlite" and len(self.value) >= MIN_INDEXED_TERM_LENGTH
+        )
+
+    def append_to_statement(
+        self, statement: Select[tuple[ModelT]], model: type[ModelT]
+    ) -> Select[tuple[ModelT]]:
+        field_names = self._get_field_names(model)
+        if self._use_fts():
+            fts, onclause, where = self._get_fts_lookup(model, field_names)
+            statement = statement.join(fts, onclause).where(where)
+            if self.rank:
+                statement = statement.order_by(literal_column(f"{fts.name}.rank"))
+            return statement
+        where, order_by = self._get_like_lookup(model, field_names)
+        statement = statement.where(where)
+        if self.rank and self.dialect_name == "postgresql":
+            statement = statement.order_by(order_by)
+        return statement
+
+    def append_to_lambda_statement(
+        self,
+        statement: StatementLambdaElement,
+        model: type[ModelT],
+    ) -> StatementLambdaElement:
+        field_names = self._get_field_names(model)
+        if self._use_fts():
+            fts, onclause, where = self._get_fts_lookup(model, field_names)
+            statement += lambda s: s.join(fts, onclause).where(where)
+            if self.rank:
+                rank = literal_column(f"{fts.name}.rank")
+                statement += lambda s: s.order_by(rank)
+            return statement
+        where, order_by = self._get_like_lookup(model, field_names)
+        statement += lambda s: s.where(where)
+        if self.rank and self.dialect_name == "postgresql":
+            statement += lambda s: s.order_by(order_by)
+        return statement
@@ -0,0 +1,190 @@
+"""SQLite connection tuning.
+
+The ``performance`` profile of :class:`~src.app.config.db.DatabaseSettings`
+opens two engines on the same database file:
+
+- a writer, holding a single connection: the pool queues the sessions
+  waiting to write, so a process never has two write transactions competing
+  for the database lock. Transactions start with ``BEGIN IMMEDIATE`` and wait
+  up to ``busy_timeout`` for the writers of other processes;
+- a pool of ``query_only`` readers, used as the read replica of
+  :mod:`src.app.lib.read_replica`. In WAL mode they read a consistent
+  snapshot without blocking the writer, nor being blocked by it.
+
+Sessions read from the readers until their first flush, so the writer is
+held from the first write to the commit only, never across the reads and
+the password hashing preceding the write of a request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = (
+    "READER_PRAGMAS",
+    "WRITER_PRAGMAS",
+    "WriteBenchmark",
+    "apply_pragmas",
+    "benchmark_transactions",
+    "benchmark_writes",
+    "is_file_database",
+)
+
+_COMMON_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "wal",
+    # durable at checkpoints, a commit only appends to the WAL
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+    "cache_size": -64000,
+    "mmap_size": 268435456,
+    "temp_store": "memory",
+}
+WRITER_PRAGMAS: dict[str, str | int] = {
+    **_COMMON_PRAGMAS,
+    "journal_size_limit": 67108864,
+}
+"""Pragmas of the writer connection."""
+READER_PRAGMAS: dict[str, str | int] = {**_COMMON_PRAGMAS, "query_only": "on"}
+"""Pragmas of the reader connections."""
+
+
+def is_file_database(url: str) -> bool:
+    """Whether `url` points to an aiosqlite database file several connections share."""
+    return (
+        url.startswith("sqlite+aiosqlite")
+        and ":memory:" not in url
+        and "mode=memory" not in url
+    )
+
+
+def apply_pragmas(dbapi_connection: Any, pragmas: dict[str, str | int]) -> None:
+    """Set `pragmas` on a new DBAPI connection, outside of any transaction."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+_bench_metadata = MetaData()
+_bench_table = Table(
+    "write_benchmark",
+    _bench_metadata,
+    Column("id", String(36), primary_key=True),
+    Column("email", String(255), unique=True, nullable=False),
+    Column("worker", Integer, nullable=False),
+)
+
+
+@dataclass
+class WriteBenchmark:
+    """Outcome of :func:`benchmark_writes`."""
+
+    transactions: int
+    failed: int
+    seconds: float
+
+    @property
+    def per_second(self) -> float:
+        return round(self.transactions / self.seconds, 1) if self.seconds else 0.0
+
+
+async def benchmark_transactions(
+    transaction: Callable[[int], Awaitable[Any]],
+    concurrency: int = 32,
+    transactions: int = 2000,
+    failures: tuple[type[Exception], ...] = (OperationalError, PoolTimeoutError),
+) -> WriteBenchmark:
+    """Run `transaction` from concurrent tasks.
+
+    Transactions raising one of `failures`, by default an operational error,
+    typically ``database is locked``, or a wait longer than ``pool_timeout``
+    for a connection, are counted and not retried.
+
+    Args:
+        transaction: Called with the index of the transaction.
+        concurrency: Number of concurrent tasks.
+        transactions: Total number of transactions.
+        failures: Exceptions counted as failed transactions.
+
+    Returns:
+        WriteBenchmark: Committed and failed transactions and the elapsed time.
+    """
+    failed = 0
+    remaining = iter(range(transactions))
+
+    async def _worker() -> None:
+        nonlocal failed
+        for index in remaining:
+            try:
+                await transaction(index)
+            except failures:
+                failed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - started
+    return WriteBenchmark(
+        transactions=transactions - failed, failed=failed, seconds=round(seconds, 3)
+    )
+
+
+async def benchmark_writes(
+    writer: AsyncEngine,
+    reader: AsyncEngine | None = None,
+    concurrency: int = 32,
+    transactions: int = 2000,
+) -> WriteBenchmark:
+    """Run signup shaped transactions from concurrent tasks.
+
+    Every transaction looks up an email, on `reader` when given, then inserts
+    it on `writer` and commits. See :func:`benchmark_transactions`.
+
+    Args:
+        writer: Engine running the inserts.
+        reader: Engine running the lookups, `writer` when omitted.
+        concurrency: Number of concurrent tasks.
+        transactions: Total number of transactions.
+
+    Returns:
+        WriteBenchmark: Committed and failed transactions and the elapsed time.
+    """
+    async with writer.begin() as conn:
+        await conn.run_sync(_bench_metadata.drop_all)
+        await conn.run_sync(_bench_metadata.create_all)
+
+    async def _transaction(index: int) -> None:
+        email = f"{uuid4().hex}@example.com"
+        lookup = select(_bench_table.c.id).where(_bench_table.c.email == email)
+        if reader is not None:
+            async with reader.connect() as conn:
+                await conn.scalar(lookup)
+        async with writer.begin() as conn:
+            if reader is None:
+                await conn.scalar(lookup)
+            # let the other tasks interleave with the open transaction
+            await asyncio.sleep(0)
+            await conn.execute(
+                insert(_bench_table).values(
+                    id=str(uuid4()), email=email, worker=index % concurrency
+                )
+            )
+
+    result = await benchmark_transactions(_transaction, concurrency, transactions)
+    async with writer.begin() as conn:
+        await conn.run_sync(_bench_metadata.drop_all)
+    return result
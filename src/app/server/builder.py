@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from functools import partial
+from pathlib import Path
 from typing import TYPE_CHECKING, TypeVar
 
 from advanced_alchemy.exceptions import RepositoryError
@@ -7,13 +9,24 @@ from litestar.config.response_cache import (
     ResponseCacheConfig,
     default_cache_key_builder,
 )
+from litestar.middleware import DefineMiddleware
 from litestar.plugins import CLIPluginProtocol, InitPluginProtocol
 from litestar.security.jwt import OAuth2Login, Token
 
-from src.app.cli.commands import user_management_app
+from src.app.cli.commands import openapi_app, user_management_app, worker_app
 from src.app.config import constants, get_settings
+from src.app.config.app import compression
 from src.app.db.models import User as UserModel
+from src.app.db.upgrades import ensure_schema_upgrades
+from src.app.domain.accounts.audit import audit_trail
+from src.app.domain.accounts.autocomplete import warm_user_index
+from src.app.domain.accounts.login_stats import login_stats
+from src.app.lib import crypt
 from src.app.lib.exceptions import ApplicationError, exception_to_http_response
+from src.app.lib.prebuilt_schema import PrebuiltSchemaMiddleware
+from src.app.lib.query_stats import QueryStatsMiddleware
+from src.app.lib.response_cache import build_cache_key, create_response_cache_store
+from src.app.lib.search import ensure_search_indexes
 
 if TYPE_CHECKING:
     from click import Group
@@ -40,6 +53,8 @@ class ApplicationConfigurator(InitPluginProtocol, CLIPluginProtocol):
         settings = get_settings()
         self.app_slug = settings.app.slug
         cli.add_command(user_management_app)
+        cli.add_command(openapi_app)
+        cli.add_command(worker_app)
 
     def on_app_init(self, app_config: AppConfig) -> AppConfig:
         """Configure application for use with SQLAlchemy.
@@ -55,7 +70,12 @@ class ApplicationConfigurator(InitPluginProtocol, CLIPluginProtocol):
         app_config.response_cache_config = ResponseCacheConfig(
             default_expiration=constants.CACHE_EXPIRATION,
             key_builder=self._cache_key_builder,
+            store=constants.RESPONSE_CACHE_STORE,
         )
+        app_config.stores = {
+            **(app_config.stores or {}),  # type: ignore[dict-item]
+            constants.RESPONSE_CACHE_STORE: create_response_cache_store(settings),
+        }
 
         app_config.signature_namespace.update(
             {
@@ -68,11 +88,48 @@ class ApplicationConfigurator(InitPluginProtocol, CLIPluginProtocol):
             ApplicationError: exception_to_http_response,
             RepositoryError: exception_to_http_response,
         }
+        # outermost, to count the lookup of the authenticated user
+        app_config.middleware.insert(
+            0, DefineMiddleware(QueryStatsMiddleware, expose_headers=settings.app.DEBUG)
+        )
+        # app level, outside of the response cache which would otherwise store
+        # a single encoding per key
+        app_config.middleware.append(
+            DefineMiddleware(compression.middleware_class, config=compression)
+        )
+        app_config.middleware.append(
+            DefineMiddleware(
+                PrebuiltSchemaMiddleware,
+                directory=Path(settings.app.OPENAPI_BUILD_DIR),
+            )
+        )
+        app_config.on_startup.extend(
+            [
+                partial(ensure_schema_upgrades, settings.db.get_engine()),
+                partial(ensure_search_indexes, settings.db.get_engine()),
+                crypt.hashing_pool.start,
+                crypt.bulk_hashing_pool.start,
+                warm_user_index,
+                login_stats.start,
+                audit_trail.start,
+            ]
+        )
+        app_config.on_shutdown.extend(
+            [
+                login_stats.shutdown,
+                audit_trail.shutdown,
+                crypt.hashing_pool.shutdown,
+                crypt.bulk_hashing_pool.shutdown,
+            ]
+        )
         return app_config
 
     def _cache_key_builder(self, request: Request) -> str:
         """App name prefixed cache key builder.
 
+        Tags listed in the route handler `opt` are embedded in the key, see
+        :func:`build_cache_key`.
+
         Args:
             request (Request): Current request instance.
 
@@ -80,4 +137,8 @@ class ApplicationConfigurator(InitPluginProtocol, CLIPluginProtocol):
             str: App slug prefixed cache key.
         """
 
-        return f"{self.app_slug}:{default_cache_key_builder(request)}"
+        return build_cache_key(
+            self.app_slug,
+            request.route_handler.opt.get(constants.CACHE_TAGS_OPT_KEY, ()),
+            default_cache_key_builder(request),
+        )
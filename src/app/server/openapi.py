@@ -1,7 +1,7 @@
 """OpenAPI config for app.  See OpenAPISettings for configuration."""
 
 from litestar.openapi.config import OpenAPIConfig
-from litestar.openapi.plugins import ScalarRenderPlugin
+from litestar.openapi.plugins import ScalarRenderPlugin, YamlRenderPlugin
 
 from src.app.__about__ import __version__ as current_version
 from src.app.config import get_settings
@@ -14,5 +14,5 @@ config = OpenAPIConfig(
     components=[auth.openapi_components],
     security=[auth.security_requirement],
     use_handler_docstrings=True,
-    render_plugins=[ScalarRenderPlugin()],
+    render_plugins=[ScalarRenderPlugin(), YamlRenderPlugin()],
 )
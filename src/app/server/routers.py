@@ -1,7 +1,12 @@
 from litestar import Router
 from litestar.types import ControllerRouterHandler
 
-from src.app.domain.accounts.controllers import AccessController, UserController
+from src.app.domain.accounts.controllers import (
+    AccessController,
+    AuditController,
+    UserController,
+    UserRoleController,
+)
 from src.app.domain.accounts.system.controllers import SystemController
 
 v1_router = Router(
@@ -10,6 +15,8 @@ v1_router = Router(
         SystemController,
         AccessController,
         UserController,
+        UserRoleController,
+        AuditController,
     ],
 )
 
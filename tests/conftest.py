@@ -1,5 +1,5 @@
-from collections.abc import AsyncGenerator, AsyncIterator
-from typing import Callable
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
 
 import pytest
 from httpx import AsyncClient
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from src.app.config import get_settings
 from src.app.config.base import Settings
+from src.app.lib.query_stats import QueryStats, track_queries
 
 pytestmark = pytest.mark.anyio
 
@@ -87,3 +88,43 @@ def get_endpoint_path() -> Callable[[str], str]:
         return f"/api/v1{endpoint_path}"
 
     return _wrapper
+
+
+@pytest.fixture
+def assert_queries() -> Callable[..., AbstractContextManager[QueryStats]]:
+    """Assert the number of statements executed in a block.
+
+    Transaction control statements are not counted. With `maximum=True` the
+    number is an upper bound, and the failure lists the statements executed
+    more than once.
+
+    ```python
+    with assert_queries(2) as stats:
+        await client.get(...)
+    with assert_queries(4, maximum=True):
+        await client.get(...)
+    ```
+    """
+
+    @contextmanager
+    def _assert_queries(
+        expected: int, *, maximum: bool = False
+    ) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        if maximum:
+            assert stats.count <= expected, (
+                f"{stats.count} statements executed, at most {expected} expected, "
+                "repeated:\n"
+                + "\n\n".join(
+                    f"{count} x {statement}"
+                    for statement, count in stats.repeated.items()
+                )
+            )
+        else:
+            assert stats.count == expected, (
+                f"{stats.count} statements executed, {expected} expected:\n"
+                + "\n\n".join(stats.statements)
+            )
+
+    return _assert_queries
@@ -0,0 +1,149 @@
+import gzip
+from collections.abc import AsyncIterator, Callable
+
+import brotli
+import pytest
+import zstandard
+from httpx import AsyncClient
+from litestar import Litestar, MediaType, Response, get
+from litestar.middleware import DefineMiddleware
+from litestar.response import Stream
+
+from src.app.lib.compression import (
+    NegotiatedCompressionConfig,
+    benchmark_compression,
+    negotiate,
+)
+
+pytestmark = pytest.mark.anyio
+
+BODY = b"".join(
+    b'{"email": "user%d@example.com", "isActive": true},' % i for i in range(200)
+)
+OFFERED = ("zstd", "br", "gzip")
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("", None),
+        ("gzip, deflate", "gzip"),
+        ("gzip, br, zstd", "zstd"),
+        ("gzip;q=1.0, br;q=0.8, zstd;q=0.5", "gzip"),
+        ("br;q=0.9, *;q=0.1", "br"),
+        ("*", "zstd"),
+        ("gzip;q=0, *", "zstd"),
+        ("identity", None),
+        ("GZIP;Q=0.5", "gzip"),
+    ],
+)
+def test_negotiate(accept_encoding: str, expected: str | None) -> None:
+    assert negotiate(accept_encoding, OFFERED) == expected
+
+
+@pytest.fixture(name="client")
+async def fx_client() -> AsyncIterator[AsyncClient]:
+    @get("/large", media_type=MediaType.TEXT)
+    async def large() -> bytes:
+        return BODY
+
+    @get("/small", media_type=MediaType.TEXT)
+    async def small() -> bytes:
+        return BODY[:100]
+
+    @get("/image")
+    async def image() -> Response[bytes]:
+        return Response(BODY, media_type="image/png")
+
+    @get("/tagged")
+    async def tagged() -> Response[bytes]:
+        return Response(BODY, media_type=MediaType.TEXT, headers={"etag": '"v1"'})
+
+    @get("/stream")
+    async def stream() -> Stream:
+        return Stream(iter([BODY, BODY]), media_type=MediaType.TEXT)
+
+    config = NegotiatedCompressionConfig(encodings=("gzip",))
+    app = Litestar(
+        route_handlers=[large, small, image, tagged, stream],
+        middleware=[DefineMiddleware(config.middleware_class, config=config)],
+    )
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        yield client
+
+
+async def test_compresses_negotiated_encoding(client: AsyncClient) -> None:
+    response = await client.get("/large", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+    response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == BODY
+
+
+@pytest.mark.parametrize(
+    ("encoding", "decompress"),
+    [
+        ("br", brotli.decompress),
+        ("zstd", zstandard.ZstdDecompressor().decompress),
+    ],
+)
+async def test_compresses_brotli_and_zstd(
+    encoding: str, decompress: Callable[[bytes], bytes]
+) -> None:
+    @get("/large", media_type=MediaType.TEXT)
+    async def large() -> bytes:
+        return BODY
+
+    config = NegotiatedCompressionConfig()
+    app = Litestar(
+        route_handlers=[large],
+        middleware=[DefineMiddleware(config.middleware_class, config=config)],
+    )
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        async with client.stream(
+            "GET", "/large", headers={"Accept-Encoding": f"gzip;q=0.5, {encoding}"}
+        ) as response:
+            assert response.headers["content-encoding"] == encoding
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    assert decompress(raw) == BODY
+
+
+@pytest.mark.parametrize("path", ["/small", "/image"])
+async def test_skips_small_and_compressed_responses(
+    client: AsyncClient, path: str
+) -> None:
+    response = await client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+async def test_weakens_strong_etag(client: AsyncClient) -> None:
+    response = await client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+
+
+async def test_compresses_streams(client: AsyncClient) -> None:
+    async with client.stream(
+        "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    assert gzip.decompress(raw) == BODY * 2
+
+
+def test_benchmark_compression() -> None:
+    results = benchmark_compression(
+        BODY, {"gzip": [1, 6], "br": [4], "zstd": [3], "unknown": [1]}, rounds=3
+    )
+    assert [(result.encoding, result.level) for result in results] == [
+        ("gzip", 1),
+        ("gzip", 6),
+        ("br", 4),
+        ("zstd", 3),
+    ]
+    assert all(result.ratio > 1 for result in results)
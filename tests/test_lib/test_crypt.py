@@ -0,0 +1,79 @@
+import threading
+import warnings
+
+import anyio
+import pytest
+
+from src.app.lib import crypt
+from src.app.lib.exceptions import ServiceUnavailableError
+
+pytestmark = pytest.mark.anyio
+
+
+def _blocking(event: threading.Event) -> str:
+    event.wait(5)
+    return "done"
+
+
+async def test_password_hash_roundtrip() -> None:
+    hashed = await crypt.get_password_hash("S3cret!")
+    assert await crypt.verify_password("S3cret!", hashed)
+    assert not await crypt.verify_password("wrong", hashed)
+
+
+async def test_hashing_pool_rejects_when_saturated() -> None:
+    pool = crypt.PasswordHashingPool(max_workers=1, max_queue=0, retry_after=3)
+    release = threading.Event()
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(pool.run, _blocking, release)
+            await anyio.sleep(0.05)
+            with pytest.raises(ServiceUnavailableError) as exc_info:
+                await pool.run(_blocking, release)
+            assert exc_info.value.retry_after == 3
+            release.set()
+    finally:
+        pool.shutdown()
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+
+
+async def test_hashing_pool_deadline() -> None:
+    pool = crypt.PasswordHashingPool(max_workers=1, max_queue=1, timeout=0.05)
+    release = threading.Event()
+    try:
+        with pytest.raises(ServiceUnavailableError):
+            await pool.run(_blocking, release)
+    finally:
+        release.set()
+        pool.shutdown()
+    assert pool.stats()["timed_out"] == 1
+
+
+async def test_process_pool_does_not_fork_the_server() -> None:
+    pool = crypt.PasswordHashingPool(kind="process", max_workers=1)
+    try:
+        with warnings.catch_warnings():
+            # raised by `os.fork` in a process running threads
+            warnings.simplefilter("error", DeprecationWarning)
+            pool.start()
+            (hashed,) = await crypt.get_password_hashes(["S3cret!"], pool=pool)
+    finally:
+        pool.shutdown()
+    assert await crypt.verify_password("S3cret!", hashed)
+
+
+def test_calibrate_argon2() -> None:
+    params = crypt.calibrate_argon2(
+        target_ms=1000,
+        max_memory_cost=1024,
+        min_memory_cost=64,
+        parallelism=1,
+        max_time_cost=2,
+        samples=1,
+    )
+    assert params.memory_cost == 1024
+    assert 1 <= params.time_cost <= 2
+    assert params.to_env()["PASSWORD_ARGON2_MEMORY_COST"] == "1024"
@@ -0,0 +1,143 @@
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.app.db.models import Job
+from src.app.lib.jobs import Worker, enqueue, task
+
+pytestmark = pytest.mark.anyio
+
+calls: list[dict[str, Any]] = []
+
+
+@task("test_record")
+async def record(**kwargs: Any) -> None:
+    calls.append(kwargs)
+
+
+@task("test_fail")
+async def fail() -> None:
+    raise ValueError("boom")
+
+
+running: list[None] = []
+peak: list[int] = [0]
+
+
+@task("test_slow")
+async def slow() -> None:
+    running.append(None)
+    peak[0] = max(peak[0], len(running))
+    await asyncio.sleep(0.02)
+    running.pop()
+
+
+@pytest.fixture(autouse=True)
+async def _job_table(engine: AsyncEngine) -> AsyncIterator[None]:
+    calls.clear()
+    async with engine.begin() as conn:
+        await conn.run_sync(Job.__table__.drop, checkfirst=True)
+        await conn.run_sync(Job.__table__.create)
+    yield
+
+
+async def _enqueue(sessionmaker: async_sessionmaker[AsyncSession], *jobs: Any) -> None:
+    async with sessionmaker() as session, session.begin():
+        for fn, kwargs in jobs:
+            enqueue(session, fn, **kwargs)
+
+
+async def _jobs(sessionmaker: async_sessionmaker[AsyncSession]) -> list[Job]:
+    async with sessionmaker() as session:
+        return list(await session.scalars(select(Job)))
+
+
+async def test_runs_job_with_payload(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    await _enqueue(sessionmaker, (record, {"user_id": 1, "when": datetime(2024, 1, 1)}))
+    worker = Worker(sessionmaker)
+    assert await worker.run_once() == 1
+    await worker.join()
+    assert calls == [{"user_id": 1, "when": "2024-01-01T00:00:00"}]
+    (job,) = await _jobs(sessionmaker)
+    assert (job.status, job.attempts) == ("complete", 1)
+    assert worker.stats()["completed"] == 1
+    assert await worker.run_once() == 0
+
+
+async def test_rolled_back_job_is_never_run(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session:
+        enqueue(session, record)
+        await session.rollback()
+    assert await Worker(sessionmaker).run_once() == 0
+
+
+async def test_retries_then_fails(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session, session.begin():
+        enqueue(session, fail, max_attempts=2)
+    worker = Worker(sessionmaker, retry_delay=0)
+    for status in ("queued", "failed"):
+        assert await worker.run_once() == 1
+        await worker.join()
+        (job,) = await _jobs(sessionmaker)
+        assert job.status == status
+        assert job.error == "ValueError: boom"
+    stats = worker.stats()
+    assert (stats["retried"], stats["failed"]) == (1, 1)
+
+
+async def test_retry_is_delayed(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    await _enqueue(sessionmaker, (fail, {}))
+    worker = Worker(sessionmaker, retry_delay=60)
+    await worker.run_once()
+    await worker.join()
+    assert await worker.run_once() == 0
+
+
+async def test_concurrency_limit(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    peak[0] = 0
+    await _enqueue(sessionmaker, *((slow, {}) for _ in range(5)))
+    worker = Worker(sessionmaker, concurrency=2, poll_interval=0.01)
+    assert await worker.run_once() == 2
+    assert await worker.run_once() == 0
+    stop = asyncio.Event()
+    runner = asyncio.create_task(worker.run(stop))
+    while worker.stats()["completed"] < 5:
+        await asyncio.sleep(0.01)
+    stop.set()
+    await runner
+    assert peak[0] == 2
+    assert worker.stats()["claimed"] == 5
+
+
+async def test_abandoned_job_is_claimed_again(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    await _enqueue(sessionmaker, (record, {}))
+    async with sessionmaker() as session, session.begin():
+        await session.execute(
+            update(Job).values(
+                status="active",
+                attempts=1,
+                locked_until=datetime.now(UTC) - timedelta(seconds=1),
+            )
+        )
+    worker = Worker(sessionmaker)
+    assert await worker.run_once() == 1
+    await worker.join()
+    (job,) = await _jobs(sessionmaker)
+    assert (job.status, job.attempts) == ("complete", 2)
@@ -0,0 +1,124 @@
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.app.db.models import Job, OutboxEvent
+from src.app.lib.jobs import enqueue, task
+from src.app.lib.outbox import OutboxRelay, listener, record_event
+
+pytestmark = pytest.mark.anyio
+
+calls: list[dict[str, Any]] = []
+
+
+@task("test_outbox_job")
+async def outbox_job() -> None:
+    pass
+
+
+@listener("test_recorded")
+async def on_recorded(session: AsyncSession, **payload: Any) -> None:
+    calls.append(payload)
+    enqueue(session, outbox_job)
+
+
+@listener("test_failing")
+async def on_failing(session: AsyncSession) -> None:
+    enqueue(session, outbox_job)
+    raise ValueError("boom")
+
+
+@pytest.fixture(autouse=True)
+async def _outbox_tables(engine: AsyncEngine) -> AsyncIterator[None]:
+    calls.clear()
+    async with engine.begin() as conn:
+        for table in (OutboxEvent.__table__, Job.__table__):
+            await conn.run_sync(table.drop, checkfirst=True)
+            await conn.run_sync(table.create)
+    yield
+
+
+async def _rows(
+    sessionmaker: async_sessionmaker[AsyncSession], model: type[Any]
+) -> list[Any]:
+    async with sessionmaker() as session:
+        return list(await session.scalars(select(model)))
+
+
+async def test_relays_events_in_order(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session, session.begin():
+        for i in range(3):
+            record_event(session, "test_recorded", index=i, when=datetime(2024, 1, 1))
+    relay = OutboxRelay(sessionmaker, batch_size=2)
+    assert await relay.relay_once() == 2
+    assert await relay.relay_once() == 1
+    assert await relay.relay_once() == 0
+    assert calls == [{"index": i, "when": "2024-01-01T00:00:00"} for i in range(3)]
+    assert await _rows(sessionmaker, OutboxEvent) == []
+    assert len(await _rows(sessionmaker, Job)) == 3
+    assert relay.stats()["relayed"] == 3
+
+
+async def test_rolled_back_event_is_never_relayed(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session:
+        record_event(session, "test_recorded")
+        await session.rollback()
+    assert await OutboxRelay(sessionmaker).relay_once() == 0
+
+
+async def test_failing_listener_is_rolled_back_alone(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session, session.begin():
+        record_event(session, "test_failing")
+        record_event(session, "test_recorded")
+    relay = OutboxRelay(sessionmaker, max_attempts=2, retry_delay=0)
+    assert await relay.relay_once() == 2
+    # the job of the failing listener went with its savepoint
+    assert len(await _rows(sessionmaker, Job)) == 1
+    (event,) = await _rows(sessionmaker, OutboxEvent)
+    assert (event.status, event.attempts) == ("pending", 1)
+    assert event.error == "ValueError: boom"
+
+    assert await relay.relay_once() == 1
+    (event,) = await _rows(sessionmaker, OutboxEvent)
+    assert (event.status, event.attempts) == ("failed", 2)
+    assert await relay.relay_once() == 0
+    stats = relay.stats()
+    assert (stats["relayed"], stats["retried"], stats["failed"]) == (1, 1, 1)
+
+
+async def test_retry_is_delayed(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session, session.begin():
+        record_event(session, "test_failing")
+    relay = OutboxRelay(sessionmaker, retry_delay=60)
+    assert await relay.relay_once() == 1
+    assert await relay.relay_once() == 0
+
+
+async def test_abandoned_event_is_claimed_again(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session, session.begin():
+        record_event(session, "test_recorded")
+    relay = OutboxRelay(sessionmaker)
+    await relay._claim()
+    assert await relay.relay_once() == 0
+    async with sessionmaker() as session, session.begin():
+        await session.execute(
+            update(OutboxEvent).values(
+                locked_until=datetime.now(UTC) - timedelta(seconds=1)
+            )
+        )
+    assert await relay.relay_once() == 1
+    assert calls == [{}]
@@ -0,0 +1,35 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.app.db.models import User
+from src.app.lib.pagination import (
+    CursorPagination,
+    _Explain,
+    decode_cursor,
+    encode_cursor,
+)
+from tests.test_server.raw_data import SUPER_USER
+
+
+def test_cursor_roundtrip() -> None:
+    cursor = encode_cursor("email", "user@example.com", 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("email", "user@example.com", 42)
+
+
+def test_cursor_pagination_statement() -> None:
+    cursor = encode_cursor("email", "user@example.com", SUPER_USER.id)
+    pagination = CursorPagination(limit=10, cursor=cursor, field_name="email")
+    sql = str(
+        pagination.append_to_statement(select(User), User).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "ORDER BY user_account.email DESC, user_account.id DESC" in sql
+    assert "OFFSET" not in sql
+    assert "LIMIT" in sql
+
+
+def test_explain_statement() -> None:
+    sql = str(_Explain(select(User.id)).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT user_account.id")
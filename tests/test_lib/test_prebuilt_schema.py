@@ -0,0 +1,86 @@
+import gzip
+from pathlib import Path
+
+import brotli
+import pytest
+from httpx import AsyncClient
+from litestar import Litestar, get
+
+from src.app.config.base import Settings
+from src.app.lib.prebuilt_schema import build_schema, route_fingerprint
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(name="schema_app")
+def fx_schema_app(
+    settings: Settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Litestar:
+    from main import create_app
+
+    monkeypatch.setattr(settings.app, "OPENAPI_BUILD_DIR", str(tmp_path))
+    return create_app()
+
+
+async def test_serves_build(schema_app: Litestar, tmp_path: Path) -> None:
+    manifest = build_schema(schema_app, tmp_path)
+    etag = manifest["files"]["openapi.json"]["etag"]
+    async with AsyncClient(app=schema_app, base_url="http://testserver") as client:
+        response = await client.get(
+            "/schema/openapi.json", headers={"Accept-Encoding": "identity"}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] == f'"{etag}"'
+        assert response.content == (tmp_path / "openapi.json").read_bytes()
+        assert response.json()["info"]["title"] == schema_app.openapi_config.title
+
+        response = await client.get(
+            "/schema/openapi.yaml", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"].endswith('-gzip"')
+        assert response.content == gzip.decompress(
+            (tmp_path / "openapi.yaml.gz").read_bytes()
+        )
+
+        response = await client.get(
+            "/schema/openapi.json", headers={"Accept-Encoding": "br, gzip"}
+        )
+        assert response.headers["content-encoding"] == "br"
+        assert response.content == brotli.decompress(
+            (tmp_path / "openapi.json.br").read_bytes()
+        )
+
+        response = await client.get(
+            "/schema/openapi.json",
+            headers={"Accept-Encoding": "identity", "If-None-Match": f'"{etag}"'},
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+
+
+async def test_build_matches_generated_schema(
+    schema_app: Litestar, tmp_path: Path
+) -> None:
+    async with AsyncClient(app=schema_app, base_url="http://testserver") as client:
+        generated = await client.get("/schema/openapi.json")
+    assert "etag" not in generated.headers
+    build_schema(schema_app, tmp_path / "build")
+    assert (tmp_path / "build" / "openapi.json").read_bytes() == generated.content
+
+
+async def test_stale_build_falls_back(schema_app: Litestar, tmp_path: Path) -> None:
+    build_schema(schema_app, tmp_path)
+
+    @get("/added", opt={"exclude_from_auth": True})
+    async def added() -> str:
+        return "added"
+
+    fingerprint = route_fingerprint(schema_app)
+    schema_app.register(added)
+    assert route_fingerprint(schema_app) != fingerprint
+    async with AsyncClient(app=schema_app, base_url="http://testserver") as client:
+        response = await client.get("/schema/openapi.json")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert "/added" in response.json()["paths"]
@@ -0,0 +1,33 @@
+from src.app.lib.prefix_index import PrefixIndex
+
+
+def test_prefix_index_search() -> None:
+    index: PrefixIndex[int, str] = PrefixIndex()
+    index.build(
+        [
+            (1, "alice", ["alice@example.com", "Alice Smith", "Smith"]),
+            (2, "bob", ["bob@example.com", "Bob Smithers", "Smithers"]),
+            (3, "carol", ["carol@test.com"]),
+        ]
+    )
+    assert index.built
+    assert index.search("SMITH", 10) == ["alice", "bob"]
+    assert index.search("smith", 1) == ["alice"]
+    assert index.search("a", 10) == ["alice"]
+    assert index.search("zed", 10) == []
+
+
+def test_prefix_index_incremental_updates() -> None:
+    index: PrefixIndex[int, str] = PrefixIndex()
+    index.build([(1, "alice", ["alice@example.com"])])
+    index.add(2, "bob", ["bob@example.com"])
+    index.add(1, "alice", ["alicia@example.com"])
+    assert index.search("ali", 10) == ["alice"]
+    assert index.search("alice", 10) == []
+    index.remove(2)
+    index.remove(2)
+    assert index.search("bob", 10) == []
+    stats = index.stats()
+    assert stats["documents"] == 1
+    assert stats["terms"] == 1
+    assert stats["memory_bytes"] > 0
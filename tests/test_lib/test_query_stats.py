@@ -0,0 +1,63 @@
+import pytest
+from litestar import Litestar, get
+from litestar.middleware import DefineMiddleware
+from litestar.testing import AsyncTestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.app.lib.query_stats import (
+    N_PLUS_ONE_THRESHOLD,
+    QueryStatsMiddleware,
+    fingerprint,
+    track_queries,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_fingerprint() -> None:
+    assert fingerprint("SELECT * FROM t WHERE id IN (?, ?,  ?) AND x = 'a''b'") == (
+        "SELECT * FROM t WHERE id IN (...) AND x = ?"
+    )
+    assert fingerprint("SELECT 1 FROM t WHERE id = $1") == fingerprint(
+        "SELECT 2 FROM t\n WHERE id = $1"
+    )
+
+
+async def test_track_queries_nests(engine: AsyncEngine) -> None:
+    with track_queries() as outer:
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT 1"))
+            with track_queries() as inner:
+                await conn.execute(text("SELECT 2"))
+                await conn.execute(text("SELECT 2"))
+    assert outer.count == 3
+    assert inner.count == 2
+    assert inner.repeated == {"SELECT ?": 2}
+    assert outer.duration >= inner.duration > 0
+
+
+@pytest.mark.parametrize("expose_headers", [True, False])
+async def test_middleware_headers(engine: AsyncEngine, expose_headers: bool) -> None:
+    @get("/", sync_to_thread=False)
+    async def handler() -> None:
+        async with engine.connect() as conn:
+            for _ in range(N_PLUS_ONE_THRESHOLD + 1):
+                await conn.execute(text("SELECT 1"))
+
+    app = Litestar(
+        route_handlers=[handler],
+        middleware=[
+            DefineMiddleware(QueryStatsMiddleware, expose_headers=expose_headers)
+        ],
+    )
+    async with AsyncTestClient(app) as client:
+        response = await client.get("/")
+    if expose_headers:
+        assert response.headers["x-db-statements"] == str(N_PLUS_ONE_THRESHOLD + 1)
+        assert response.headers["x-db-repeated-statements"] == str(
+            N_PLUS_ONE_THRESHOLD + 1
+        )
+        assert float(response.headers["x-db-duration-ms"]) > 0
+    else:
+        assert "x-db-statements" not in response.headers
@@ -0,0 +1,112 @@
+from collections.abc import AsyncIterator
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from src.app.lib import rate_limit
+from src.app.lib.exceptions import TooManyRequestsError
+from src.app.lib.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimiter,
+    RateLimitRule,
+    RedisRateLimitBackend,
+)
+
+pytestmark = pytest.mark.anyio
+
+RULES = [RateLimitRule("username", 3, 60), RateLimitRule("ip", 5, 60)]
+
+
+class Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def backend(request: pytest.FixtureRequest) -> AsyncIterator[RateLimitBackend]:
+    if request.param == "memory":
+        yield MemoryRateLimitBackend()
+        return
+    redis = FakeRedis()
+    yield RedisRateLimitBackend(redis)
+    await redis.aclose()
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock(6000.0)
+    monkeypatch.setattr(rate_limit.time, "time", clock)
+    return clock
+
+
+async def test_rejects_over_limit(backend: RateLimitBackend, clock: Clock) -> None:
+    limiter = RateLimiter(backend, RULES)
+    for _ in range(3):
+        await limiter.hit({"username": "alice", "ip": "10.0.0.1"})
+    with pytest.raises(TooManyRequestsError) as exc_info:
+        await limiter.hit({"username": "alice", "ip": "10.0.0.1"})
+    # 4 * (1 - t / 60) + 1 <= 3 from 30 seconds into the next window
+    assert exc_info.value.retry_after == 60 + 30
+
+    await limiter.hit({"username": "bob", "ip": "10.0.0.1"})
+    with pytest.raises(TooManyRequestsError):
+        await limiter.hit({"username": "carol", "ip": "10.0.0.1"})
+    await limiter.hit({"username": "carol", "ip": "10.0.0.2"})
+    assert limiter.stats() == {
+        "enabled": True,
+        "allowed": 5,
+        "rejected": 2,
+        "rejected_by_username": 1,
+        "rejected_by_ip": 1,
+    }
+
+
+async def test_previous_window_slides_out(
+    backend: RateLimitBackend, clock: Clock
+) -> None:
+    limiter = RateLimiter(backend, [RateLimitRule("username", 3, 60)])
+    for _ in range(3):
+        await limiter.hit({"username": "alice"})
+    clock.now += 60
+    with pytest.raises(TooManyRequestsError) as exc_info:
+        await limiter.hit({"username": "alice"})
+    # 3 * (1 - t / 60) + 1 + 1 <= 3 from t = 40
+    assert exc_info.value.retry_after == 40
+    clock.now += 45
+    await limiter.hit({"username": "alice"})
+    clock.now += 120
+    for _ in range(3):
+        await limiter.hit({"username": "alice"})
+
+
+async def test_rules_without_value_are_skipped(
+    backend: RateLimitBackend, clock: Clock
+) -> None:
+    limiter = RateLimiter(backend, RULES)
+    for _ in range(5):
+        await limiter.hit({"ip": "10.0.0.1", "username": None})
+    with pytest.raises(TooManyRequestsError):
+        await limiter.hit({"ip": "10.0.0.1"})
+
+
+async def test_disabled_and_cleared(backend: RateLimitBackend, clock: Clock) -> None:
+    limiter = RateLimiter(backend, RULES, enabled=False)
+    for _ in range(10):
+        await limiter.hit({"username": "alice"})
+    limiter.enabled = True
+    for _ in range(3):
+        await limiter.hit({"username": "alice"})
+    await limiter.clear()
+    await limiter.hit({"username": "alice"})
+
+
+async def test_memory_backend_is_bounded(clock: Clock) -> None:
+    backend = MemoryRateLimitBackend(maxsize=10)
+    limiter = RateLimiter(backend, [RateLimitRule("ip", 1, 60)])
+    for i in range(25):
+        await limiter.hit({"ip": f"10.0.0.{i}"})
+    assert len(backend._counters) <= 10
@@ -0,0 +1,42 @@
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from src.app.lib.response_cache import (
+    TaggedMemoryStore,
+    TaggedRedisStore,
+    build_cache_key,
+    get_key_tags,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_cache_key_tags() -> None:
+    key = build_cache_key("app", ["users", "roles"], "GET/api/v1/users")
+    assert key == "app:tags=roles,users:GET/api/v1/users"
+    assert get_key_tags(key) == ["roles", "users"]
+    assert get_key_tags(build_cache_key("app", [], "GET/api/v1/me")) == []
+
+
+@pytest.mark.parametrize(
+    "store_factory",
+    [TaggedMemoryStore, lambda: TaggedRedisStore(FakeRedis(), namespace="test")],
+)
+async def test_invalidate_tags(store_factory) -> None:  # type: ignore[no-untyped-def]
+    store = store_factory()
+    users_key = build_cache_key("app", ["users"], "GET/api/v1/users")
+    other_key = build_cache_key("app", [], "GET/api/v1/health")
+    await store.set(users_key, b"users" * 100, expires_in=60)
+    await store.set(other_key, b"health", expires_in=60)
+    assert await store.get(users_key) == b"users" * 100
+
+    assert await store.invalidate_tags("users") == 1
+    assert await store.get(users_key) is None
+    assert await store.get(other_key) == b"health"
+
+
+async def test_redis_store_compresses_values() -> None:
+    redis = FakeRedis()
+    store = TaggedRedisStore(redis, namespace="test")
+    await store.set("app:GET/api/v1/users", b"x" * 1000)
+    assert len(await redis.get("test:app:GET/api/v1/users")) < 100
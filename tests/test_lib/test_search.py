@@ -0,0 +1,51 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from advanced_alchemy.base import UUIDAuditBase
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.app.db.models import User
+from src.app.lib.search import RankedSearchFilter, ensure_search_indexes
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(name="legacy_engine")
+async def fx_legacy_engine(tmp_path: Path) -> AsyncIterator[AsyncEngine]:
+    """Database created before the search indexes existed."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.sqlite3'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(UUIDAuditBase.registry.metadata.create_all)
+        for trigger in ("ai", "ad", "au"):
+            await conn.execute(text(f"DROP TRIGGER user_account_fts_{trigger}"))
+        await conn.execute(text("DROP TABLE user_account_fts"))
+        await conn.execute(
+            insert(User.__table__).values(email="legacy@example.com", name="Legacy")
+        )
+    yield engine
+    await engine.dispose()
+
+
+async def _search(engine: AsyncEngine, value: str) -> list[str]:
+    statement = RankedSearchFilter(
+        field_name=set(), value=value, ignore_case=True
+    ).append_to_statement(select(User), User)
+    async with engine.connect() as conn:
+        return list(await conn.scalars(statement.with_only_columns(User.email)))
+
+
+async def test_ensure_search_indexes_on_existing_database(
+    legacy_engine: AsyncEngine,
+) -> None:
+    assert await ensure_search_indexes(legacy_engine) == ["user_account"]
+    # backfilled
+    assert await _search(legacy_engine, "legacy") == ["legacy@example.com"]
+    async with legacy_engine.begin() as conn:
+        await conn.execute(
+            insert(User.__table__).values(email="later@example.com", name="Later")
+        )
+    # kept in sync
+    assert await _search(legacy_engine, "later") == ["later@example.com"]
+    assert await ensure_search_indexes(legacy_engine) == []
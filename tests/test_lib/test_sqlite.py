@@ -0,0 +1,85 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, func, insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from src.app.config.db import DatabaseSettings
+from src.app.lib.read_replica import READ_UNTIL_WRITE, REPLICA_ENGINE, RoutingSession
+from src.app.lib.sqlite import benchmark_writes
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(name="engines")
+async def fx_engines(tmp_path: Path) -> AsyncIterator[tuple[AsyncEngine, AsyncEngine]]:
+    settings = DatabaseSettings(
+        URL=f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}",
+        READ_URL=None,
+        SQLITE_PROFILE="performance",
+    )
+    writer, reader = settings.get_engine(), settings.get_read_engine()
+    assert reader is not None
+    yield writer, reader
+    await writer.dispose()
+    await reader.dispose()
+
+
+async def test_default_profile_has_no_reader(tmp_path: Path) -> None:
+    settings = DatabaseSettings(
+        URL=f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}",
+        READ_URL=None,
+        SQLITE_PROFILE="default",
+    )
+    assert settings.get_read_engine() is None
+
+
+async def test_performance_profile_pragmas(
+    engines: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    writer, reader = engines
+    async with writer.begin() as conn:
+        assert await conn.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert await conn.scalar(text("PRAGMA synchronous")) == 1
+        assert await conn.scalar(text("PRAGMA busy_timeout")) == 5000
+        await conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+    assert writer.pool.size() == 1
+    async with reader.connect() as conn:
+        assert await conn.scalar(text("PRAGMA query_only")) == 1
+        assert await conn.scalar(text("SELECT count(*) FROM t")) == 0
+        with pytest.raises(OperationalError, match="readonly"):
+            await conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+
+
+async def test_concurrent_writes_do_not_collide(
+    engines: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    writer, reader = engines
+    result = await benchmark_writes(writer, reader, concurrency=16, transactions=200)
+    assert result.failed == 0
+    assert result.transactions == 200
+
+
+async def test_sessions_take_the_writer_at_their_first_write(
+    engines: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    writer, reader = engines
+    table = Table("t", MetaData(), Column("id", Integer, primary_key=True))
+    async with writer.begin() as conn:
+        await conn.run_sync(table.metadata.create_all)
+    session_maker = async_sessionmaker(
+        bind=writer,
+        sync_session_class=RoutingSession,
+        info={REPLICA_ENGINE: reader.sync_engine, READ_UNTIL_WRITE: True},
+    )
+    async with session_maker() as session:
+        assert await session.scalar(select(func.count()).select_from(table)) == 0
+        assert writer.pool.checkedout() == 0
+        await session.execute(insert(table).values(id=1))
+        assert writer.pool.checkedout() == 1
+        # reads its own write
+        assert await session.scalar(select(func.count()).select_from(table)) == 1
+        await session.commit()
+    assert writer.pool.checkedout() == 0
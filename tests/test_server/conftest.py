@@ -9,8 +9,15 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from src.app.config.base import Settings
 from src.app.db.models import User
+from src.app.domain.accounts.audit import audit_trail
+from src.app.domain.accounts.autocomplete import user_index
+from src.app.domain.accounts.cache import principal_cache
 from src.app.domain.accounts.guards import auth
+from src.app.domain.accounts.login_stats import login_stats
 from src.app.domain.accounts.services import UserService
+from src.app.domain.accounts.system.health import health_checker
+from src.app.domain.accounts.throttling import login_rate_limiter
+from src.app.lib.pagination import count_cache
 from src.app.server.plugins import alchemy
 from tests.test_server.raw_data import RAW_USERS, SUPER_USER_EMAIL, COMMON_USER_EMAIl
 
@@ -44,6 +51,18 @@ def fx_session_maker_factory(
     )
 
 
+@pytest.fixture(autouse=True)
+async def _clear_caches() -> None:
+    """Process local caches must not outlive the seeded database."""
+    principal_cache.clear()
+    count_cache.clear()
+    user_index.clear()
+    health_checker.clear()
+    login_stats.clear()
+    audit_trail.clear()
+    await login_rate_limiter.clear()
+
+
 @pytest.fixture(autouse=True)
 async def _seed_db(
     settings: Settings,
@@ -1,11 +1,29 @@
-from typing import Callable
+from typing import Any, Callable
 
 import pytest
 from httpx import AsyncClient
 from litestar import status_codes
+from litestar.security.jwt import Token
+from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.app.domain.accounts.urls import ACCOUNT_LOGIN, ACCOUNT_LOGOUT, ACCOUNT_PROFILE
-from tests.test_server.raw_data import RAW_USERS, RawUser
+from src.app.config.base import Settings
+from src.app.db.models import Job, OutboxEvent, User
+from src.app.domain.accounts import signals  # noqa: F401
+from src.app.domain.accounts.cache import principal_cache
+from src.app.domain.accounts.guards import auth
+from src.app.domain.accounts.throttling import login_rate_limiter
+from src.app.domain.accounts.urls import (
+    ACCOUNT_LIST,
+    ACCOUNT_LOGIN,
+    ACCOUNT_LOGOUT,
+    ACCOUNT_PROFILE,
+    ACCOUNT_REGISTER,
+)
+from src.app.lib import crypt
+from src.app.lib.outbox import OutboxRelay
+from tests.test_server.raw_data import COMMON_USER, RAW_USERS, SUPER_USER, RawUser
 
 pytestmark = pytest.mark.anyio
 
@@ -34,6 +52,44 @@ async def test_user_login(
     assert response.status_code == expected_status_code
 
 
+async def test_login_is_throttled(
+    client: AsyncClient,
+    settings: Settings,
+    get_endpoint_path: Callable[[str], str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    verified: list[str] = []
+    verify = crypt.verify_and_update_password
+
+    async def _verify(password: str | bytes, hashed_password: str) -> Any:
+        verified.append(hashed_password)
+        return await verify(password, hashed_password)
+
+    monkeypatch.setattr(crypt, "verify_and_update_password", _verify)
+    limit = settings.security.LOGIN_RATE_LIMIT_PER_USERNAME
+    rejected = login_rate_limiter.stats()["rejected_by_username"]
+    for _ in range(limit):
+        response = await client.post(
+            get_endpoint_path(ACCOUNT_LOGIN),
+            data={"username": COMMON_USER.email, "password": "Wrong_Password1!"},
+        )
+        assert response.status_code == status_codes.HTTP_403_FORBIDDEN
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_LOGIN),
+        data={"username": COMMON_USER.email.upper(), "password": COMMON_USER.password},
+    )
+    assert response.status_code == status_codes.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["retry-after"]) >= 1
+    assert len(verified) == limit
+    assert login_rate_limiter.stats()["rejected_by_username"] == rejected + 1
+
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_LOGIN),
+        data={"username": SUPER_USER.email, "password": SUPER_USER.password},
+    )
+    assert response.status_code == status_codes.HTTP_201_CREATED
+
+
 @pytest.mark.parametrize(
     "userdata",
     RAW_USERS,
@@ -79,3 +135,133 @@ async def test_user_logout(
         get_endpoint_path(ACCOUNT_PROFILE),
     )
     assert me_response.status_code == status_codes.HTTP_401_UNAUTHORIZED
+
+
+async def test_login_rehashes_outdated_password(
+    client: AsyncClient,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    get_endpoint_path: Callable[[str], str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        crypt,
+        "password_crypt_context",
+        CryptContext(
+            schemes=["argon2"],
+            deprecated="auto",
+            argon2__rounds=1,
+            argon2__memory_cost=1024,
+        ),
+    )
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_LOGIN),
+        data={"username": COMMON_USER.email, "password": COMMON_USER.password},
+    )
+    assert response.status_code == status_codes.HTTP_201_CREATED
+
+    async with sessionmaker() as session:
+        hashed_password = await session.scalar(
+            select(User.hashed_password).where(User.email == COMMON_USER.email)
+        )
+    assert hashed_password is not None
+    assert "m=1024,t=1" in hashed_password
+
+
+async def test_profile_uses_principal_cache(
+    client: AsyncClient,
+    user_token_headers: dict[str, str],
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    hits = principal_cache.hits
+    for _ in range(2):
+        response = await client.get(
+            get_endpoint_path(ACCOUNT_PROFILE), headers=user_token_headers
+        )
+        assert response.status_code == status_codes.HTTP_200_OK
+        assert response.json()["name"] == COMMON_USER.name
+    assert principal_cache.hits == hits + 1
+
+    response = await client.patch(
+        f"{get_endpoint_path(ACCOUNT_LIST)}/{COMMON_USER.id}",
+        json={"name": "Renamed"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_200_OK
+    assert principal_cache.get(COMMON_USER.email) is None
+
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_PROFILE), headers=user_token_headers
+    )
+    assert response.json()["name"] == "Renamed"
+
+
+async def test_stateless_auth(
+    client: AsyncClient,
+    settings: Settings,
+    get_endpoint_path: Callable[[str], str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings.security, "STATELESS_AUTH", True)
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_LOGIN),
+        data={"username": SUPER_USER.email, "password": SUPER_USER.password},
+    )
+    assert response.status_code == status_codes.HTTP_201_CREATED
+    token = Token.decode(
+        response.json()["access_token"],
+        secret=auth.token_secret,
+        algorithm=auth.algorithm,
+    )
+    assert token.extras["uid"] == SUPER_USER.id
+    assert token.extras["is_superuser"] is True
+    # only the claims the guards read are signed into the token
+    assert "roles" not in token.extras
+
+    # the profile of a token principal is loaded, the claims carry no name
+    response = await client.get(get_endpoint_path(ACCOUNT_PROFILE))
+    assert response.status_code == status_codes.HTTP_200_OK
+    assert response.json()["name"] == SUPER_USER.name
+
+    # claims alone authorize the request, the subject is not looked up
+    ghost_token = auth.create_token(
+        identifier="ghost@example.com",
+        token_extras={
+            "uid": "9e0d3f51-5a27-4c59-a1c8-3c1f1c3f6e10",
+            "is_active": True,
+            "is_superuser": True,
+            "is_verified": False,
+        },
+    )
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_LIST),
+        headers={"Authorization": f"Bearer {ghost_token}"},
+    )
+    assert response.status_code == status_codes.HTTP_200_OK
+
+
+async def test_signup_relays_post_signup_job(
+    client: AsyncClient,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_REGISTER),
+        json={"email": "new.user@example.com", "password": "Test_Password1!"},
+    )
+    assert response.status_code == status_codes.HTTP_201_CREATED
+    async with sessionmaker() as session:
+        (event,) = await session.scalars(select(OutboxEvent))
+        assert event.event_type == "user_created"
+        assert not list(await session.scalars(select(Job)))
+    assert await OutboxRelay(sessionmaker).relay_once() == 1
+    async with sessionmaker() as session:
+        assert not list(await session.scalars(select(OutboxEvent)))
+        (job,) = await session.scalars(select(Job))
+    assert job.function == "user_created"
+    assert job.status == "queued"
+    assert job.kwargs == {
+        "user_id": response.json()["id"],
+        "email": "new.user@example.com",
+        "name": None,
+    }
@@ -1,14 +1,35 @@
-from typing import Callable
+import csv
+import io
+import json
+from typing import Any, Callable
+from uuid import UUID
 
 import pytest
 from httpx import AsyncClient
 from litestar import status_codes
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.app.domain.accounts.urls import ACCOUNT_LIST
+from src.app.config.constants import DEFAULT_USER_ROLE
+from src.app.db.models import Role, User, UserRole
+from src.app.domain.accounts import autocomplete as autocomplete_module
+from src.app.domain.accounts.autocomplete import rebuild_user_index
+from src.app.domain.accounts.urls import (
+    ACCOUNT_AUTOCOMPLETE,
+    ACCOUNT_EXPORT,
+    ACCOUNT_IMPORT,
+    ACCOUNT_LIST,
+    ACCOUNT_LOGIN,
+    ACCOUNT_PROFILE,
+    ACCOUNT_REGISTER,
+)
+from src.app.lib.crypt import password_crypt_context
 from tests.test_server.raw_data import COMMON_USER, SUPER_USER
 
 pytestmark = pytest.mark.anyio
 
+USER_DETAIL = f"{ACCOUNT_LIST}/{COMMON_USER.id}"
+
 
 async def test_accounts_list(
     client: AsyncClient,
@@ -111,3 +132,421 @@ async def test_accounts_delete(
         headers=superuser_token_headers,
     )
     assert response.status_code == status_codes.HTTP_204_NO_CONTENT
+
+
+async def test_accounts_list_cache_invalidated_on_write(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_LIST),
+        headers=superuser_token_headers,
+    )
+    total = response.json()["total"]
+
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_LIST),
+        json={
+            "name": "A User",
+            "email": "new-user@example.com",
+            "password": "S3cret!",
+        },
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_201_CREATED
+
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_LIST),
+        headers=superuser_token_headers,
+    )
+    assert response.json()["total"] == total + 1
+
+
+@pytest.mark.parametrize("order_by", [None, "email"])
+async def test_accounts_list_cursor_pagination(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+    order_by: str | None,
+) -> None:
+    url = get_endpoint_path(ACCOUNT_LIST)
+    params = {"pageSize": "1", "sortOrder": "asc"}
+    if order_by:
+        params["orderBy"] = order_by
+    response = await client.get(url, params=params, headers=superuser_token_headers)
+    expected = [user["id"] for user in response.json()["items"]]
+    total = response.json()["total"]
+    while len(expected) < total:
+        params["currentPage"] = str(len(expected) + 1)
+        response = await client.get(url, params=params, headers=superuser_token_headers)
+        expected.extend(user["id"] for user in response.json()["items"])
+    del params["currentPage"]
+
+    seen: list[str] = []
+    cursor = ""
+    while cursor is not None:
+        response = await client.get(
+            url, params={**params, "cursor": cursor}, headers=superuser_token_headers
+        )
+        assert response.status_code == status_codes.HTTP_200_OK
+        page = response.json()
+        assert page["total"] == total
+        assert len(page["items"]) <= 1
+        seen.extend(user["id"] for user in page["items"])
+        cursor = page["nextCursor"]
+    assert len(seen) == total
+    assert set(seen) == set(expected)
+
+
+async def test_accounts_list_pagination_bounds(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    url = get_endpoint_path(ACCOUNT_LIST)
+    response = await client.get(
+        url, params={"pageSize": "1000"}, headers=superuser_token_headers
+    )
+    assert response.status_code == status_codes.HTTP_400_BAD_REQUEST
+    response = await client.get(
+        url, params={"cursor": "not-a-cursor"}, headers=superuser_token_headers
+    )
+    assert response.status_code == status_codes.HTTP_400_BAD_REQUEST
+    response = await client.get(
+        url, params={"cursor": "", "orderBy": "name"}, headers=superuser_token_headers
+    )
+    assert response.status_code == status_codes.HTTP_400_BAD_REQUEST
+
+
+async def test_accounts_list_count_modes(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    url = get_endpoint_path(ACCOUNT_LIST)
+    totals = {}
+    for count_mode in ("exact", "window", "cached", "estimated"):
+        response = await client.get(
+            url, params={"countMode": count_mode}, headers=superuser_token_headers
+        )
+        assert response.status_code == status_codes.HTTP_200_OK
+        totals[response.json()["totalMode"]] = response.json()["total"]
+    # planner estimates are only available on PostgreSQL
+    assert totals.keys() == {"exact", "window", "cached"}
+    assert len(set(totals.values())) == 1
+
+    response = await client.post(
+        url,
+        json={"name": "A User", "email": "counted@example.com", "password": "S3cret!"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_201_CREATED
+    response = await client.get(
+        url, params={"countMode": "cached"}, headers=superuser_token_headers
+    )
+    assert response.json()["total"] == totals["cached"]
+    response = await client.get(
+        url, params={"countMode": "exact"}, headers=superuser_token_headers
+    )
+    assert response.json()["total"] == totals["exact"] + 1
+
+
+async def test_accounts_list_search(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    async def search(**params: str) -> list[str]:
+        response = await client.get(
+            get_endpoint_path(ACCOUNT_LIST),
+            params=params,
+            headers=superuser_token_headers,
+        )
+        assert response.status_code == status_codes.HTTP_200_OK
+        return [item["email"] for item in response.json()["items"]]
+
+    # all searchable fields by default, case insensitive substring match
+    assert await search(searchString="example user") == [COMMON_USER.email]
+    assert set(await search(searchString="EXAMPLE.com")) == {
+        SUPER_USER.email,
+        COMMON_USER.email,
+        "another@example.com",
+        "inactive@example.com",
+    }
+    assert await search(searchField="name", searchString="test") == ["test@test.com"]
+    # best match first
+    assert await search(searchField="email", searchString="user@example") == [
+        COMMON_USER.email,
+        SUPER_USER.email,
+    ]
+    # shorter than a trigram, falls back to LIKE
+    assert await search(searchField="email", searchString="t@") == ["test@test.com"]
+    # case sensitive, through the index and the LIKE fallback
+    assert await search(searchString="example user", searchIgnoreCase="false") == []
+    assert await search(searchString="Example User", searchIgnoreCase="false") == [
+        COMMON_USER.email
+    ]
+    assert await search(searchString="T@", searchIgnoreCase="false") == []
+
+    # the index follows updates
+    response = await client.patch(
+        f"{get_endpoint_path(ACCOUNT_LIST)}/{COMMON_USER.id}",
+        json={"name": "Renamed Person"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_200_OK
+    assert await search(searchString="renamed") == [COMMON_USER.email]
+    assert await search(searchField="name", searchString="example user") == []
+
+
+async def test_accounts_list_search_whitelist(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_LIST),
+        params={"searchField": "hashed_password", "searchString": "argon"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_400_BAD_REQUEST
+
+
+async def test_accounts_autocomplete(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    async def autocomplete(prefix: str, limit: int = 10) -> list[str]:
+        response = await client.get(
+            get_endpoint_path(ACCOUNT_AUTOCOMPLETE),
+            params={"prefix": prefix, "limit": limit},
+            headers=superuser_token_headers,
+        )
+        assert response.status_code == status_codes.HTTP_200_OK
+        return [item["email"] for item in response.json()]
+
+    assert await autocomplete("SUPER") == [SUPER_USER.email]
+    assert await autocomplete("example u") == [COMMON_USER.email]
+    assert len(await autocomplete("user", limit=2)) == 2
+
+    # the index follows the writes of the user service
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_LIST),
+        json={"name": "Zoe Quux", "email": "zoe@example.com", "password": "S3cret!"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_201_CREATED
+    assert await autocomplete("quux") == ["zoe@example.com"]
+    response = await client.delete(
+        f"{get_endpoint_path(ACCOUNT_LIST)}/{response.json()['id']}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_204_NO_CONTENT
+    assert await autocomplete("zoe") == []
+
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_AUTOCOMPLETE),
+        params={"prefix": "a", "limit": 1000},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_400_BAD_REQUEST
+
+
+async def test_accounts_autocomplete_rebuild(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+    sessionmaker: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def autocomplete(prefix: str) -> list[str]:
+        response = await client.get(
+            get_endpoint_path(ACCOUNT_AUTOCOMPLETE),
+            params={"prefix": prefix},
+            headers=superuser_token_headers,
+        )
+        assert response.status_code == status_codes.HTTP_200_OK
+        return [item["email"] for item in response.json()]
+
+    assert await autocomplete("example u") == [COMMON_USER.email]
+
+    # deleted out of band, as by another worker or the CLI
+    async with sessionmaker() as db_session:
+        await db_session.execute(
+            delete(User.__table__).where(User.__table__.c.id == COMMON_USER.id)
+        )
+        await db_session.commit()
+    assert await autocomplete("example u") == [COMMON_USER.email]
+    await rebuild_user_index()
+    assert await autocomplete("example u") == []
+
+    # a lookup on an index older than the TTL rebuilds it in the background
+    async with sessionmaker() as db_session:
+        await db_session.execute(
+            delete(User.__table__).where(
+                User.__table__.c.email == "inactive@example.com"
+            )
+        )
+        await db_session.commit()
+    monkeypatch.setattr(autocomplete_module.settings.app, "USER_INDEX_TTL", 0)
+    assert await autocomplete("inactive") == ["inactive@example.com"]
+    assert autocomplete_module._rebuild_task is not None
+    await autocomplete_module._rebuild_task
+    monkeypatch.setattr(autocomplete_module.settings.app, "USER_INDEX_TTL", 300)
+    assert await autocomplete("inactive") == []
+
+
+async def test_accounts_export(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_LIST), headers=superuser_token_headers
+    )
+    total = response.json()["total"]
+    url = get_endpoint_path(ACCOUNT_EXPORT)
+
+    response = await client.get(
+        url, params={"includeRoles": "true"}, headers=superuser_token_headers
+    )
+    assert response.status_code == status_codes.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == total
+    superuser = next(r for r in records if r["email"] == SUPER_USER.email)
+    assert superuser["isSuperuser"] is True
+    assert isinstance(superuser["roles"], list)
+
+    response = await client.get(
+        url,
+        params={"format": "csv", "searchField": "email", "searchString": "superuser"},
+        headers=superuser_token_headers,
+    )
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["email"] for row in rows] == [SUPER_USER.email]
+
+
+async def test_accounts_export_requires_superuser(
+    client: AsyncClient,
+    user_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_EXPORT), headers=user_token_headers
+    )
+    assert response.status_code == status_codes.HTTP_403_FORBIDDEN
+
+
+async def test_accounts_import(
+    client: AsyncClient,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    async with sessionmaker() as session:
+        session.add(Role(name=DEFAULT_USER_ROLE, slug="application-access"))
+        await session.commit()
+    hashed_password = password_crypt_context.hash("Imp0rted!")
+    lines = [
+        {"email": "imported-1@example.com", "name": "One", "password": "Imp0rted!"},
+        {"email": "imported-2@example.com", "hashed_password": hashed_password},
+        {"email": "imported-1@example.com", "password": "Imp0rted!"},
+        {"email": SUPER_USER.email, "password": "Imp0rted!"},
+        {"email": "imported-3@example.com", "hashedPassword": "not-a-hash"},
+        {"email": "imported-4@example.com"},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_IMPORT),
+        content=body,
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_201_CREATED
+    report = response.json()
+    assert (report["total"], report["imported"], report["failed"]) == (7, 2, 5)
+    # line 3 is skipped by the insert of its batch, which goes through
+    assert [error["line"] for error in report["errors"]] == [5, 6, 7, 4, 3]
+
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_IMPORT),
+        params={"format": "csv"},
+        content="email,name,is_verified,password\nimported-5@example.com,,True,Imp0rted!\n",
+        headers=superuser_token_headers,
+    )
+    assert response.json()["imported"] == 1
+
+    for email in ("imported-1@example.com", "imported-2@example.com"):
+        response = await client.post(
+            get_endpoint_path(ACCOUNT_LOGIN),
+            data={"username": email, "password": "Imp0rted!"},
+        )
+        assert response.status_code == status_codes.HTTP_201_CREATED
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_LIST),
+        params={"searchField": "email", "searchString": "imported-5"},
+        headers=superuser_token_headers,
+    )
+    (user,) = response.json()["items"]
+    assert user["isVerified"] is True
+    assert [role["roleSlug"] for role in user["roles"]] == ["application-access"]
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_LIST),
+        params={"searchField": "email", "searchString": "imported-1"},
+        headers=superuser_token_headers,
+    )
+    (user,) = response.json()["items"]
+    assert user["name"] == "One"
+    assert len(user["roles"]) == 1
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "kwargs"),
+    [
+        (
+            "get",
+            ACCOUNT_LIST,
+            {"params": {"searchField": "email", "searchString": COMMON_USER.email}},
+        ),
+        ("get", USER_DETAIL, {}),
+        ("patch", USER_DETAIL, {"json": {"name": "Renamed"}}),
+        ("get", ACCOUNT_PROFILE, {}),
+        (
+            "post",
+            ACCOUNT_REGISTER,
+            {"json": {"email": "signup@example.com", "password": "S1gnup!!"}},
+        ),
+    ],
+)
+async def test_serialized_users_carry_roles(
+    client: AsyncClient,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    superuser_token_headers: dict[str, str],
+    user_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+    method: str,
+    path: str,
+    kwargs: dict[str, Any],
+) -> None:
+    async with sessionmaker() as session:
+        role = Role(name=DEFAULT_USER_ROLE, slug="application-access")
+        session.add(role)
+        await session.flush()
+        session.add(UserRole(user_id=UUID(COMMON_USER.id), role_id=role.id))
+        await session.commit()
+
+    headers = user_token_headers if path == ACCOUNT_PROFILE else superuser_token_headers
+    response = await client.request(
+        method, get_endpoint_path(path), headers=headers, **kwargs
+    )
+    assert response.status_code < 300
+    body = response.json()
+    (user,) = (
+        [user for user in body["items"] if user["id"] == COMMON_USER.id]
+        if "items" in body
+        else [body]
+    )
+    assert [role["roleSlug"] for role in user["roles"]] == ["application-access"]
@@ -1,11 +1,20 @@
+from pathlib import Path
 from typing import Callable
 
 import pytest
 from httpx import AsyncClient
-from litestar.status_codes import HTTP_200_OK
+from litestar import Litestar
+from litestar.status_codes import (
+    HTTP_200_OK,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
 
 from src.app.__about__ import __version__
-from src.app.domain.accounts.system.urls import LIVENESS, SYSTEM_HEALTH
+from src.app.config.base import Settings
+from src.app.config.db import DatabaseSettings
+from src.app.domain.accounts.system.urls import LIVENESS, SYSTEM_HEALTH, SYSTEM_METRICS
+from src.app.server.plugins import alchemy
 
 pytestmark = pytest.mark.anyio
 
@@ -19,13 +28,54 @@ async def test_health(
     )
     assert response.status_code == HTTP_200_OK
 
-    expected = {
-        "status": "online",
-        "app": "app",
-        "version": __version__,
-    }
+    health = response.json()
+    assert health["status"] == "online"
+    assert health["app"] == "app"
+    assert health["version"] == __version__
+    assert health["database"]["status"] == "online"
+    assert health["database"]["latency_ms"] is not None
+    assert health["replica"] is None
+    assert health["redis"] is None
 
-    assert response.json() == expected
+    # served from the cache
+    response = await client.get(get_endpoint_path(SYSTEM_HEALTH))
+    assert response.json()["checked_at"] == health["checked_at"]
+
+
+async def test_health_database_offline(
+    app: Litestar,
+    client: AsyncClient,
+    tmp_path: Path,
+    get_endpoint_path: Callable[[str], str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = DatabaseSettings(
+        URL=f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db.sqlite3'}",
+        SQLITE_PROFILE="default",
+    ).get_engine()
+    monkeypatch.setitem(app.state, alchemy._config.engine_app_state_key, engine)
+    response = await client.get(get_endpoint_path(SYSTEM_HEALTH))
+    assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    health = response.json()
+    assert health["status"] == "offline"
+    assert health["database"]["status"] == "offline"
+    assert health["database"]["error"] == "OperationalError"
+
+
+async def test_health_redis_offline(
+    client: AsyncClient,
+    settings: Settings,
+    get_endpoint_path: Callable[[str], str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings.redis, "ENABLED", True)
+    monkeypatch.setattr(settings.redis, "URL", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(settings.redis, "_redis_instance", None)
+    response = await client.get(get_endpoint_path(SYSTEM_HEALTH))
+    assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    health = response.json()
+    assert health["database"]["status"] == "online"
+    assert health["redis"]["status"] == "offline"
 
 
 async def test_liveness(
@@ -38,3 +88,19 @@ async def test_liveness(
     assert response.status_code == HTTP_200_OK
 
     assert response.text == "OK"
+
+
+async def test_metrics(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    response = await client.get(get_endpoint_path(SYSTEM_METRICS))
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+
+    response = await client.get(
+        get_endpoint_path(SYSTEM_METRICS),
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == HTTP_200_OK
+    assert "queue_depth" in response.json()["password_hashing"]
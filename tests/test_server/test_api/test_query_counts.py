@@ -0,0 +1,125 @@
+"""Statements executed per endpoint.
+
+The principal cache is empty at the start of every test, the counts include
+the lookup of the authenticated user.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from litestar import status_codes
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.db.models import Role, User, UserRole
+from src.app.domain.accounts.urls import (
+    ACCOUNT_LIST,
+    ACCOUNT_LOGIN,
+    ACCOUNT_PROFILE,
+)
+from tests.test_server.raw_data import COMMON_USER
+
+pytestmark = pytest.mark.anyio
+
+USER_DETAIL = f"{ACCOUNT_LIST}/{COMMON_USER.id}"
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "kwargs", "expected_status", "expected_queries"),
+    [
+        # principal, page with window count, roles, oauth accounts
+        ("get", ACCOUNT_LIST, {}, status_codes.HTTP_200_OK, 4),
+        # principal, user joined with its roles and oauth accounts
+        ("get", USER_DETAIL, {}, status_codes.HTTP_200_OK, 2),
+        # principal joined with its roles and oauth accounts, serialized as is
+        ("get", ACCOUNT_PROFILE, {}, status_codes.HTTP_200_OK, 1),
+        # principal, lookup, outbox event, roles and oauth accounts deleted by
+        # the cascade, delete
+        ("delete", USER_DETAIL, {}, status_codes.HTTP_204_NO_CONTENT, 6),
+        # user joined with its roles
+        (
+            "post",
+            ACCOUNT_LOGIN,
+            {
+                "data": {
+                    "username": COMMON_USER.email,
+                    "password": COMMON_USER.password,
+                }
+            },
+            status_codes.HTTP_201_CREATED,
+            1,
+        ),
+    ],
+)
+async def test_endpoint_query_count(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+    assert_queries: Callable[..., Any],
+    method: str,
+    path: str,
+    kwargs: dict[str, Any],
+    expected_status: int,
+    expected_queries: int,
+) -> None:
+    with assert_queries(expected_queries):
+        response = await client.request(
+            method,
+            get_endpoint_path(path),
+            headers=superuser_token_headers,
+            **kwargs,
+        )
+    assert response.status_code == expected_status
+
+
+async def test_cached_principal_profile_runs_no_query(
+    client: AsyncClient,
+    user_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+    assert_queries: Callable[..., Any],
+) -> None:
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_PROFILE), headers=user_token_headers
+    )
+    assert response.status_code == status_codes.HTTP_200_OK
+    with assert_queries(0):
+        cached = await client.get(
+            get_endpoint_path(ACCOUNT_PROFILE), headers=user_token_headers
+        )
+    assert cached.json() == response.json()
+
+
+async def test_list_query_budget_does_not_grow_with_users(
+    client: AsyncClient,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+    assert_queries: Callable[..., Any],
+) -> None:
+    async with sessionmaker() as session:
+        roles = [Role(name=f"Role {index}", slug=f"role-{index}") for index in range(3)]
+        users = [
+            User(email=f"user-{index}@example.com", name=f"User {index}")
+            for index in range(20)
+        ]
+        session.add_all(
+            [
+                *roles,
+                *users,
+                *(UserRole(user=user, role=role) for user in users for role in roles),
+            ]
+        )
+        await session.commit()
+
+    with assert_queries(4, maximum=True) as stats:
+        response = await client.get(
+            get_endpoint_path(ACCOUNT_LIST), headers=superuser_token_headers
+        )
+    assert response.status_code == status_codes.HTTP_200_OK
+    seeded = [
+        user for user in response.json()["items"] if user["email"].startswith("user-")
+    ]
+    assert seeded
+    assert all(len(user["roles"]) == 3 for user in seeded)
+    assert not stats.repeated
@@ -0,0 +1,151 @@
+"""Routing of the reads to a replica, a second SQLite file here.
+
+The replica is seeded apart from the primary: it holds a user missing from
+the primary and the common user under another name.
+"""
+
+from collections.abc import AsyncIterator
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from advanced_alchemy.base import UUIDAuditBase
+from httpx import AsyncClient
+from litestar import Litestar, status_codes
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.app.config.db import DatabaseSettings
+from src.app.db.models import User
+from src.app.domain.accounts.guards import auth
+from src.app.domain.accounts.services import UserService
+from src.app.domain.accounts.urls import ACCOUNT_LIST, ACCOUNT_PROFILE
+from src.app.lib.read_replica import REPLICA_ENGINE, USE_REPLICA, RoutingSession
+from src.app.server.plugins import alchemy
+from tests.test_server.raw_data import COMMON_USER, RAW_USERS, SUPER_USER
+
+pytestmark = pytest.mark.anyio
+
+REPLICA_ONLY_USER = replace(
+    SUPER_USER,
+    id="0ef29f3c-3560-4d15-ba6b-a2e5c721e4d0",
+    email="replica@example.com",
+    name="Replica Admin",
+)
+
+
+@pytest.fixture(name="replica_engine")
+async def fx_replica_engine(tmp_path: Path) -> AsyncIterator[AsyncEngine]:
+    engine = DatabaseSettings(
+        URL=f"sqlite+aiosqlite:///{tmp_path / 'replica.sqlite3'}"
+    ).get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(UUIDAuditBase.registry.metadata.create_all)
+    users = [
+        replace(user, name="Replica User") if user == COMMON_USER else user
+        for user in RAW_USERS
+    ]
+    async with UserService.new(
+        async_sessionmaker(bind=engine, expire_on_commit=False)()
+    ) as users_service:
+        await users_service.create_many(
+            [asdict(user) for user in [*users, REPLICA_ONLY_USER]],
+            auto_commit=True,
+        )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def _route_to_replica(
+    app: Litestar,
+    engine: AsyncEngine,
+    replica_engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session_maker = async_sessionmaker(
+        bind=engine,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        info={REPLICA_ENGINE: replica_engine.sync_engine},
+    )
+    monkeypatch.setattr(alchemy._config, "session_maker", session_maker)
+    monkeypatch.setitem(
+        app.state, alchemy._config.session_maker_app_state_key, session_maker
+    )
+
+
+async def _get_name(
+    sessionmaker: async_sessionmaker[AsyncSession], email: str
+) -> str | None:
+    async with sessionmaker() as session:
+        return await session.scalar(select(User.name).where(User.email == email))
+
+
+async def test_read_url_defaults_to_primary() -> None:
+    settings = DatabaseSettings(READ_URL=None, SQLITE_PROFILE="default")
+    assert settings.get_read_engine() is None
+
+
+async def test_safe_request_reads_replica(
+    client: AsyncClient,
+    user_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_PROFILE), headers=user_token_headers
+    )
+    assert response.status_code == status_codes.HTTP_200_OK
+    assert response.json()["name"] == "Replica User"
+
+
+async def test_writes_stay_on_primary(
+    client: AsyncClient,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    replica_engine: AsyncEngine,
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    # the principal is only found on the replica
+    headers = {"Authorization": f"Bearer {auth.create_token(REPLICA_ONLY_USER.email)}"}
+    response = await client.patch(
+        f"{get_endpoint_path(ACCOUNT_LIST)}/{COMMON_USER.id}",
+        json={"name": "Updated User"},
+        headers=headers,
+    )
+    assert response.status_code == status_codes.HTTP_200_OK
+    # read back from the primary in the same request
+    assert response.json()["name"] == "Updated User"
+    assert await _get_name(sessionmaker, COMMON_USER.email) == "Updated User"
+    replica_sessionmaker = async_sessionmaker(bind=replica_engine)
+    assert await _get_name(replica_sessionmaker, COMMON_USER.email) == "Replica User"
+
+    response = await client.post(
+        get_endpoint_path(ACCOUNT_LIST),
+        json={"name": "A User", "email": "new-user@example.com", "password": "S3cret!"},
+        headers=headers,
+    )
+    assert response.status_code == status_codes.HTTP_201_CREATED
+    assert await _get_name(sessionmaker, "new-user@example.com") == "A User"
+    assert await _get_name(replica_sessionmaker, "new-user@example.com") is None
+
+
+async def test_unmarked_session_uses_primary(
+    engine: AsyncEngine,
+    replica_engine: AsyncEngine,
+) -> None:
+    async with async_sessionmaker(
+        bind=engine,
+        sync_session_class=RoutingSession,
+        info={REPLICA_ENGINE: replica_engine.sync_engine},
+    )() as session:
+        name = await session.scalar(
+            select(User.name).where(User.email == COMMON_USER.email)
+        )
+        assert name == COMMON_USER.name
+        replica_name = await session.scalar(
+            select(User.name)
+            .where(User.email == COMMON_USER.email)
+            .execution_options(**{USE_REPLICA: True})
+        )
+        assert replica_name == "Replica User"
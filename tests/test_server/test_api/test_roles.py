@@ -0,0 +1,102 @@
+from typing import Callable
+
+import pytest
+from httpx import AsyncClient
+from litestar import status_codes
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.db.models import Role
+from src.app.domain.accounts.urls import (
+    ACCOUNT_ASSIGN_ROLE,
+    ACCOUNT_PROFILE,
+    ACCOUNT_REVOKE_ROLE,
+)
+from tests.test_server.raw_data import COMMON_USER, SUPER_USER
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+async def _editor_role(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    async with sessionmaker() as session:
+        session.add(Role(name="Editor", slug="editor"))
+        await session.commit()
+
+
+async def test_assign_and_revoke_role(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    user_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    assign_url = get_endpoint_path(ACCOUNT_ASSIGN_ROLE).replace(
+        "{role_slug:str}", "editor"
+    )
+    revoke_url = get_endpoint_path(ACCOUNT_REVOKE_ROLE).replace(
+        "{role_slug:str}", "editor"
+    )
+
+    response = await client.post(
+        assign_url,
+        json={"userName": COMMON_USER.email},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_200_OK
+    assert response.json() == {"roleSlug": "editor", "matched": 1, "affected": 1}
+
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_PROFILE), headers=user_token_headers
+    )
+    assert [role["roleSlug"] for role in response.json()["roles"]] == ["editor"]
+
+    response = await client.post(
+        assign_url,
+        json={"userNames": [COMMON_USER.email, SUPER_USER.email, "nobody@example.com"]},
+        headers=superuser_token_headers,
+    )
+    assert response.json() == {"roleSlug": "editor", "matched": 2, "affected": 1}
+
+    response = await client.post(
+        revoke_url,
+        json={"userNames": [COMMON_USER.email, SUPER_USER.email]},
+        headers=superuser_token_headers,
+    )
+    assert response.json() == {"roleSlug": "editor", "matched": 2, "affected": 2}
+    response = await client.post(
+        revoke_url,
+        json={"userName": COMMON_USER.email},
+        headers=superuser_token_headers,
+    )
+    assert response.json() == {"roleSlug": "editor", "matched": 1, "affected": 0}
+
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_PROFILE), headers=user_token_headers
+    )
+    assert response.json()["roles"] == []
+
+
+async def test_role_assignment_errors(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    user_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    assign_url = get_endpoint_path(ACCOUNT_ASSIGN_ROLE).replace("{role_slug:str}", "{}")
+    response = await client.post(
+        assign_url.format("editor"),
+        json={"userName": COMMON_USER.email},
+        headers=user_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_403_FORBIDDEN
+    response = await client.post(
+        assign_url.format("missing"),
+        json={"userName": COMMON_USER.email},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_404_NOT_FOUND
+    response = await client.post(
+        assign_url.format("editor"),
+        json={},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_400_BAD_REQUEST
@@ -1,9 +1,12 @@
+from collections.abc import Callable
+
 import pytest
 from httpx import AsyncClient
 from litestar import Litestar, get
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from src.app.config import app as config
+from src.app.domain.accounts.urls import ACCOUNT_LIST
 
 pytestmark = pytest.mark.anyio
 
@@ -31,3 +34,22 @@ async def test_db_session_dependency(
     ) as client:
         response = await client.get("/db-session-test")
         assert response.json()["result"] == "db_session.bind is engine = True"
+
+
+async def test_cached_response_negotiates_encoding(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    """The response cache holds identity bytes, encoded for every client."""
+    response = await client.get(
+        get_endpoint_path(ACCOUNT_LIST),
+        headers={**superuser_token_headers, "Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    cached = await client.get(
+        get_endpoint_path(ACCOUNT_LIST),
+        headers={**superuser_token_headers, "Accept-Encoding": "identity"},
+    )
+    assert "content-encoding" not in cached.headers
+    assert cached.json() == response.json()
@@ -0,0 +1,219 @@
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+from litestar import status_codes
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.db.models import AuditLog, Role
+from src.app.domain.accounts.audit import AuditTrail, audit_trail, audit_user_change
+from src.app.domain.accounts.urls import (
+    ACCOUNT_ASSIGN_ROLE,
+    ACCOUNT_AUDIT,
+    ACCOUNT_LIST,
+    ACCOUNT_REVOKE_ROLE,
+)
+from tests.test_server.raw_data import COMMON_USER, SUPER_USER
+
+pytestmark = pytest.mark.anyio
+
+
+def _entry(**values: Any) -> dict[str, Any]:
+    return {
+        "actor_id": None,
+        "target_id": uuid4(),
+        "action": "update",
+        "changed": [],
+        "created_at": datetime.now(UTC),
+        **values,
+    }
+
+
+async def _audit_log(sessionmaker: async_sessionmaker[AsyncSession]) -> list[AuditLog]:
+    async with sessionmaker() as session:
+        return list(
+            await session.scalars(select(AuditLog).order_by(AuditLog.created_at))
+        )
+
+
+async def test_changes_are_audited_once_committed(
+    client: AsyncClient,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    response = await client.patch(
+        f"{get_endpoint_path(ACCOUNT_LIST)}/{COMMON_USER.id}",
+        json={"isSuperuser": True, "name": "Promoted"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_200_OK
+    response = await client.delete(
+        f"{get_endpoint_path(ACCOUNT_LIST)}/{COMMON_USER.id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == status_codes.HTTP_204_NO_CONTENT
+    assert await _audit_log(sessionmaker) == []
+    assert len(audit_trail) == 2
+
+    assert await audit_trail.flush() == 2
+    update, delete = await _audit_log(sessionmaker)
+    assert (update.action, update.changed) == ("update", ["is_superuser", "name"])
+    assert (delete.action, delete.changed) == ("delete", [])
+    for entry in (update, delete):
+        assert entry.actor_id == UUID(SUPER_USER.id)
+        assert entry.target_id == UUID(COMMON_USER.id)
+
+
+async def test_role_changes_are_audited(
+    client: AsyncClient,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    superuser_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    async with sessionmaker() as session:
+        role = Role(name="Editor", slug="editor")
+        session.add(role)
+        await session.commit()
+    for url in (ACCOUNT_ASSIGN_ROLE, ACCOUNT_REVOKE_ROLE):
+        response = await client.post(
+            get_endpoint_path(url).replace("{role_slug:str}", "editor"),
+            json={"userNames": [COMMON_USER.email, SUPER_USER.email]},
+            headers=superuser_token_headers,
+        )
+        assert response.status_code == status_codes.HTTP_200_OK
+        assert response.json()["affected"] == 2
+
+    assert await audit_trail.flush() == 4
+    entries = await _audit_log(sessionmaker)
+    role_link = {"role_id": str(role.id)}
+    assert sorted(
+        (entry.action, str(entry.target_id), entry.before, entry.after)
+        for entry in entries
+    ) == sorted(
+        [
+            *(
+                ("assign_role", user.id, None, role_link)
+                for user in (COMMON_USER, SUPER_USER)
+            ),
+            *(
+                ("revoke_role", user.id, role_link, None)
+                for user in (COMMON_USER, SUPER_USER)
+            ),
+        ]
+    )
+    for entry in entries:
+        assert entry.actor_id == UUID(SUPER_USER.id)
+        assert entry.changed == ["roles"]
+
+
+async def test_rolled_back_change_is_not_audited(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session:
+        audit_user_change(session, "delete", target_id=uuid4(), actor_id=None)
+        await session.rollback()
+    async with sessionmaker() as session, session.begin():
+        pass
+    assert len(audit_trail) == 0
+
+
+async def test_overflow_drops_and_signals(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    trail = AuditTrail(sessionmaker, maxsize=3, flush_size=10)
+    trail.extend(_entry() for _ in range(5))
+    assert trail.stats()["dropped"] == 2
+    assert trail.stats()["overflowing"] is True
+    assert await trail.flush() == 3
+    assert trail.stats()["overflowing"] is False
+    assert len(await _audit_log(sessionmaker)) == 3
+
+
+async def test_failed_flush_keeps_entries(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    failing = True
+
+    @asynccontextmanager
+    async def session_factory() -> AsyncIterator[AsyncSession]:
+        if failing:
+            raise ConnectionError("database unavailable")
+        async with sessionmaker() as session:
+            yield session
+
+    trail = AuditTrail(session_factory, flush_size=2)
+    entries = [_entry(action=str(i)) for i in range(3)]
+    trail.extend(entries[:1])
+    assert await trail.flush() == 0
+    trail.extend(entries[1:])
+    failing = False
+    # the full buffer started a flush of its own
+    await trail.shutdown()
+    assert [entry.action for entry in await _audit_log(sessionmaker)] == [
+        "0",
+        "1",
+        "2",
+    ]
+    assert trail.stats()["failed_flushes"] == 1
+
+
+async def test_audit_log_is_append_only(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    trail = AuditTrail(sessionmaker)
+    trail.extend([_entry()])
+    await trail.flush()
+    async with sessionmaker() as session:
+        (entry,) = await session.scalars(select(AuditLog))
+        entry.action = "forged"
+        with pytest.raises(TypeError):
+            await session.flush()
+
+
+async def test_list_audit_entries(
+    client: AsyncClient,
+    superuser_token_headers: dict[str, str],
+    user_token_headers: dict[str, str],
+    get_endpoint_path: Callable[[str], str],
+) -> None:
+    target_id = uuid4()
+    audit_trail.extend(
+        _entry(
+            target_id=target_id if i % 2 else uuid4(),
+            action=f"action-{i}",
+            created_at=datetime(2024, 1, 1, tzinfo=UTC) + timedelta(minutes=i),
+        )
+        for i in range(5)
+    )
+    await audit_trail.flush()
+    path = get_endpoint_path(ACCOUNT_AUDIT)
+    response = await client.get(path, headers=user_token_headers)
+    assert response.status_code == status_codes.HTTP_403_FORBIDDEN
+
+    actions, cursor = [], ""
+    while cursor is not None:
+        response = await client.get(
+            path,
+            params={"pageSize": 2, "cursor": cursor},
+            headers=superuser_token_headers,
+        )
+        assert response.status_code == status_codes.HTTP_200_OK
+        page = response.json()
+        assert page["total"] == 5
+        actions.extend(item["action"] for item in page["items"])
+        cursor = page["nextCursor"]
+    assert actions == [f"action-{i}" for i in reversed(range(5))]
+
+    response = await client.get(
+        path, params={"targetId": str(target_id)}, headers=superuser_token_headers
+    )
+    assert [item["action"] for item in response.json()["items"]] == [
+        "action-3",
+        "action-1",
+    ]
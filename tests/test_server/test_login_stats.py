@@ -0,0 +1,115 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.db.models import User
+from src.app.domain.accounts.login_stats import LoginStatsRecorder, login_stats
+from src.app.domain.accounts.services import UserService
+from tests.test_server.raw_data import COMMON_USER, SUPER_USER
+
+pytestmark = pytest.mark.anyio
+
+SUPER_USER_ID = UUID(SUPER_USER.id)
+COMMON_USER_ID = UUID(COMMON_USER.id)
+
+
+async def _stats(
+    sessionmaker: async_sessionmaker[AsyncSession], user_id: UUID
+) -> tuple[int, datetime | None]:
+    async with sessionmaker() as session:
+        user = await session.get_one(User, user_id)
+        return user.login_count, user.last_login_at
+
+
+async def test_authenticate_records_login(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session:
+        service = UserService(session=session)
+        await service.authenticate(COMMON_USER.email, COMMON_USER.password)
+        await service.authenticate(COMMON_USER.email, COMMON_USER.password)
+    assert login_stats.stats()["pending_logins"] == 2
+    assert login_stats.stats()["pending_users"] == 1
+    assert await _stats(sessionmaker, COMMON_USER_ID) == (0, None)
+
+
+async def test_flush_coalesces_logins(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    recorder = LoginStatsRecorder(sessionmaker)
+    first = datetime(2024, 1, 1, tzinfo=UTC)
+    recorder.record(SUPER_USER_ID, at=first + timedelta(minutes=1))
+    recorder.record(SUPER_USER_ID, at=first)
+    recorder.record(COMMON_USER_ID, at=first)
+    assert await recorder.flush() == 2
+    assert await _stats(sessionmaker, SUPER_USER_ID) == (
+        2,
+        first + timedelta(minutes=1),
+    )
+    assert await _stats(sessionmaker, COMMON_USER_ID) == (1, first)
+
+    recorder.record(SUPER_USER_ID, at=first + timedelta(minutes=2))
+    assert await recorder.flush() == 1
+    assert await recorder.flush() == 0
+    assert await _stats(sessionmaker, SUPER_USER_ID) == (
+        3,
+        first + timedelta(minutes=2),
+    )
+    assert recorder.stats()["written"] == 4
+
+
+async def test_failed_flush_keeps_logins(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    failing = True
+
+    @asynccontextmanager
+    async def session_factory() -> AsyncIterator[AsyncSession]:
+        if failing:
+            raise ConnectionError("database unavailable")
+        async with sessionmaker() as session:
+            yield session
+
+    recorder = LoginStatsRecorder(session_factory)
+    recorder.record(SUPER_USER_ID)
+    assert await recorder.flush() == 0
+    recorder.record(SUPER_USER_ID)
+    assert recorder.stats()["pending_logins"] == 2
+    failing = False
+    assert await recorder.flush() == 1
+    assert (await _stats(sessionmaker, SUPER_USER_ID))[0] == 2
+    assert recorder.stats()["failed_flushes"] == 1
+
+
+async def test_flushes_periodically_when_full_and_on_shutdown(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    recorder = LoginStatsRecorder(sessionmaker, flush_interval=0.01, flush_size=3)
+    await recorder.start()
+    recorder.record(SUPER_USER_ID)
+    while recorder.stats()["flushes"] < 1:
+        await asyncio.sleep(0.01)
+    await recorder.shutdown()
+
+    recorder = LoginStatsRecorder(sessionmaker, flush_interval=60, flush_size=3)
+    await recorder.start()
+    for _ in range(3):
+        recorder.record(SUPER_USER_ID)
+    while recorder.stats()["flushes"] < 1:
+        await asyncio.sleep(0.01)
+    recorder.record(SUPER_USER_ID)
+    await recorder.shutdown()
+    assert recorder.stats()["flushes"] == 2
+    async with sessionmaker() as session:
+        assert (
+            await session.scalar(
+                select(User.login_count).where(User.id == SUPER_USER_ID)
+            )
+            == 5
+        )
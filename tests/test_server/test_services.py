@@ -0,0 +1,124 @@
+from uuid import UUID
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.db.models import OutboxEvent, Role, User, UserRole
+from src.app.domain.accounts.dependencies import UserLoadProfile, users_service_for
+from src.app.domain.accounts.services import UserRoleService, UserService
+from tests.test_server.raw_data import SUPER_USER
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_assign_role_to_all(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session:
+        role = Role(name="Application Access", slug="application-access")
+        session.add(role)
+        await session.commit()
+        active_users = await session.scalar(
+            select(func.count()).select_from(User).where(User.is_active)
+        )
+        service = UserRoleService(session=session)
+
+        assert await service.count_missing_role(role.id) == active_users
+        # assigned by another run after the count
+        super_user_id = await session.scalar(
+            select(User.id).where(User.email == SUPER_USER.email)
+        )
+        session.add(UserRole(user_id=super_user_id, role_id=role.id))
+        await session.commit()
+        progress: list[int] = []
+        assigned = await service.assign_role_to_all(
+            role.id, batch_size=2, on_progress=progress.append
+        )
+        assert assigned == active_users - 1
+        assert progress[-1] == active_users - 1
+        assert len(progress) >= active_users // 2
+        assert await service.count_missing_role(role.id) == 0
+        assert await service.count_missing_role(role.id, only_active=False) == 1
+        assert await service.assign_role_to_all(role.id) == 0
+
+        user_roles = (await session.scalars(select(UserRole))).all()
+        assert len({user_role.id for user_role in user_roles}) == active_users
+        assert {user_role.role_id for user_role in user_roles} == {role.id}
+
+
+async def test_insert_user_roles_skips_existing_links(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session:
+        role = Role(name="Editor", slug="editor")
+        session.add(role)
+        await session.commit()
+        service = UserRoleService(session=session)
+        users = User.__table__.c.email == SUPER_USER.email
+        super_user_id = await session.scalar(
+            select(User.id).where(User.email == SUPER_USER.email)
+        )
+
+        assert await service._insert_user_roles(role.id, users) == [super_user_id]
+        # a concurrent run which did not see the first link yet
+        assert await service._insert_user_roles(role.id, users) == []
+        await session.commit()
+        assert (
+            await session.scalar(
+                select(func.count())
+                .select_from(UserRole)
+                .where(UserRole.role_id == role.id)
+            )
+            == 1
+        )
+
+
+@pytest.mark.parametrize(
+    ("load_profile", "has_roles"),
+    [("minimal", False), ("auth", True), ("profile", True), ("full", True)],
+)
+async def test_user_load_profiles(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    load_profile: UserLoadProfile,
+    has_roles: bool,
+) -> None:
+    async with sessionmaker() as session:
+        role = Role(name="Application Access", slug="application-access")
+        session.add(role)
+        await session.flush()
+        session.add(UserRole(user_id=UUID(SUPER_USER.id), role_id=role.id))
+        await session.commit()
+
+    async with (
+        sessionmaker() as session,
+        users_service_for(session, load_profile) as service,
+    ):
+        user = await service.get(SUPER_USER.id)
+        if not has_roles:
+            with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+                _ = user.roles
+            return
+        assert [r.role_slug for r in user.roles] == ["application-access"]
+
+
+async def test_user_changes_record_events(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessionmaker() as session:
+        service = UserService(session=session)
+        await service.update({"name": "Renamed"}, item_id=SUPER_USER.id)
+        await service.delete(SUPER_USER.id)
+        await session.rollback()
+        assert not (await session.scalars(select(OutboxEvent))).all()
+
+        await service.update({"name": "Renamed"}, item_id=SUPER_USER.id)
+        await service.delete(SUPER_USER.id, auto_commit=True)
+        events = (
+            await session.scalars(select(OutboxEvent).order_by(OutboxEvent.created_at))
+        ).all()
+    assert [(event.event_type, event.payload) for event in events] == [
+        ("user_updated", {"user_id": SUPER_USER.id, "changed": ["name"]}),
+        ("user_deleted", {"user_id": SUPER_USER.id}),
+    ]
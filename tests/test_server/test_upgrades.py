@@ -0,0 +1,92 @@
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from advanced_alchemy.base import UUIDAuditBase
+from sqlalchemy import (
+    MetaData,
+    UniqueConstraint,
+    func,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.app.db.models import Role, User, UserRole
+from src.app.db.upgrades import USER_ROLE_UNIQUE_INDEX, ensure_schema_upgrades
+
+pytestmark = pytest.mark.anyio
+
+USER_ID = uuid4()
+ROLE_ID = uuid4()
+
+
+@pytest.fixture(name="legacy_engine")
+async def fx_legacy_engine(tmp_path: Path) -> AsyncIterator[AsyncEngine]:
+    """Database created before the added columns and the unique user roles."""
+    metadata = MetaData()
+    for model_table in UUIDAuditBase.registry.metadata.sorted_tables:
+        model_table.to_metadata(metadata)
+    links = metadata.tables[UserRole.__tablename__]
+    for constraint in list(links.constraints):
+        if isinstance(constraint, UniqueConstraint):
+            links.constraints.remove(constraint)
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.sqlite3'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(
+            insert(User.__table__).values(id=USER_ID, email="legacy@example.com")
+        )
+        await conn.execute(
+            insert(Role.__table__).values(id=ROLE_ID, name="Legacy", slug="legacy")
+        )
+        for _ in range(2):
+            await conn.execute(
+                insert(UserRole.__table__).values(user_id=USER_ID, role_id=ROLE_ID)
+            )
+        for table_name, column_name in (
+            ("user_account", "last_login_at"),
+            ("audit_log", "before"),
+            ("audit_log", "after"),
+        ):
+            await conn.execute(
+                text(f"ALTER TABLE {table_name} DROP COLUMN {column_name}")
+            )
+    yield engine
+    await engine.dispose()
+
+
+async def test_ensure_schema_upgrades_on_existing_database(
+    legacy_engine: AsyncEngine,
+) -> None:
+    assert await ensure_schema_upgrades(legacy_engine) == [
+        "user_account.last_login_at",
+        "audit_log.before",
+        "audit_log.after",
+        USER_ROLE_UNIQUE_INDEX,
+    ]
+    count_links = select(func.count()).select_from(UserRole.__table__)
+    async with legacy_engine.begin() as conn:
+        # the duplicate link was dropped
+        assert await conn.scalar(count_links) == 1
+        # the role assignments can target the unique index
+        await conn.execute(
+            sqlite_insert(UserRole.__table__)
+            .values(user_id=USER_ID, role_id=ROLE_ID)
+            .on_conflict_do_nothing(index_elements=["user_id", "role_id"])
+        )
+        assert await conn.scalar(count_links) == 1
+        # the login statistics can be written
+        await conn.execute(
+            update(User.__table__)
+            .where(User.__table__.c.id == USER_ID)
+            .values(last_login_at=datetime.now(UTC))
+        )
+        assert await conn.scalar(select(User.__table__.c.last_login_at)) is not None
+    assert await ensure_schema_upgrades(legacy_engine) == []